@@ -20,6 +20,7 @@ Last Updated:
 
 from ._format_date import get_todays_date
 from ._timeframe_utils import timeframe_search, deploy_timestamp_index
-from ._time_averaging import sensor_averaging, interval_averaging
+from ._time_averaging import (sensor_averaging, interval_averaging,
+                              multi_interval_averaging)
 from ._get_timestamp_interval import get_timestamp_interval
 from ._set_datetime_index import set_datetime_index
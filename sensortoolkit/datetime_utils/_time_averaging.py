@@ -37,6 +37,8 @@ Last Updated:
   Tue Jul 13 16:32:44 2021
 """
 import os
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 from sensortoolkit.qc._duplicate_removal import remove_duplicates
@@ -70,6 +72,37 @@ def sensor_averaging(full_df_list, sensor_serials=None, name='',
     :param float threshold:
         The completeness threshold for averaging datasets to 1-hour or
         24-hour intervals. Defaults to 75% (``0.75``).
+    :param str processed_format:
+        The file format for datasets written to the processed data directory,
+        either ``'csv'``, ``'parquet'``, or ``'feather'``. Parquet and feather
+        files preserve column data types, load faster than csv files, and
+        require the ``pyarrow`` package. Defaults to ``'csv'``.
+    :param bool partition_processed:
+        If True, processed datasets are split into monthly files written to a
+        directory for each sensor and averaging interval (e.g.,
+        ``[name]_[serial]_full/[name]_[serial]_full_YYYYMM.csv``) alongside an
+        index file listing the period spanned by each file. Loading processed
+        data for a portion of the deployment only reads the overlapping files.
+        Defaults to False.
+    :param bool lazy_full_data:
+        If True, the first and last timestamps of rows with at least one
+        non-null value in datasets at the original recorded sampling frequency
+        are saved alongside the written files, so that the deployment period
+        can be determined without reading these datasets when they are
+        subsequently loaded lazily (see ``sensortoolkit.ingest.LazyFrames``).
+        Defaults to False.
+    :param int n_workers:
+        If greater than 1, datasets for each sensor unit are averaged (and
+        written to file) in parallel across a pool of ``n_workers``
+        processes. Defaults to None (units are averaged sequentially).
+    :param bool compact:
+        If True, full, hourly, and daily datasets are converted to a
+        memory-compact representation by
+        ``sensortoolkit.lib_utils.compact_dataset()`` (text metadata columns
+        are stored as categoricals). Defaults to False.
+    :param bool float32_values:
+        If True and ``compact`` is True, parameter value columns are stored as
+        32-bit floats. Defaults to False.
 
     Returns:
         (tuple): Two-element tuple containing:
@@ -85,6 +118,7 @@ def sensor_averaging(full_df_list, sensor_serials=None, name='',
 
     """
     print('Averaging datasets to 1-hour and 24-hour intervals:')
+    n_workers = kwargs.get('n_workers', None)
     data_dict = {'full': {},
                  '1-hour': {},
                  '24-hour': {}}
@@ -94,103 +128,155 @@ def sensor_averaging(full_df_list, sensor_serials=None, name='',
         sensor_serials = {i: 'Sensor '+str(i) for i in
                           np.linspace(1, n_sensors, n_sensors, dtype=int)}
 
-    # Loop over each recorded sensor dataset and compute hourly, daily averages
-    for i, (full_df, sensor_n) in enumerate(zip(full_df_list, sensor_serials)):
-        serial_id = sensor_serials[sensor_n]
+    serial_ids = [sensor_serials[sensor_n] for sensor_n, full_df
+                  in zip(sensor_serials, full_df_list)]
 
-        for interval in data_dict:
-            data_dict[interval][serial_id] = None
+    average_serial = partial(average_sensor_data, name=name,
+                             write_to_file=write_to_file, path=path, **kwargs)
 
-        full_df = remove_duplicates(full_df,
-                                    agg_numeric_by='mean',
-                                    agg_object_by='first',
-                                    print_indent=2)
-
-        # Compute timedelta between successive timestamps
-        delta = (full_df.index[1:] - full_df.index[0:-1]).to_frame()
-        if delta.index.name is None:
-            delta.index.name = 'DateTime'
-        idx_name = delta.index.name
-
-        # Use mode of timedelta to extrapolate # of datapoints recorded per hr
-        time_delta = delta[idx_name].mode()[0]
-        hr_count = pd.to_timedelta(1, unit='H') / time_delta
-        day_count = pd.to_timedelta(1, unit='D') / time_delta
-
-        # Use a 75% threshold
-        hr_thres = kwargs.get('threshold', 0.75)
-        day_thres = kwargs.get('threshold', 0.75)
+    # Datasets for each sensor unit are independent, average units in
+    # parallel across a pool of worker processes if requested
+    if n_workers is not None and n_workers > 1 and len(serial_ids) > 1:
+        print(f'..averaging {len(serial_ids)} sensor datasets across '
+              f'{n_workers} worker processes')
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(average_serial, full_df_list,
+                                        serial_ids))
+    else:
+        results = map(average_serial, full_df_list, serial_ids)
 
-        # Print the mode of the sampling interval for recorded sensor data and
-        # the number of counts within each hour interval.
-        print('..{0:s} recording interval mode: {1:s}, '
-              '{2:4.1f} counts per hour'.format(serial_id,
-                                                str(time_delta),
-                                                hr_count,))
+    for serial_id, (full_df, hourly_df, daily_df) in zip(serial_ids, results):
+        data_dict['full'][serial_id] = full_df
+        data_dict['1-hour'][serial_id] = hourly_df
+        data_dict['24-hour'][serial_id] = daily_df
 
-        hourly_df = interval_averaging(full_df,
-                                       freq='H',
-                                       interval_count=hr_count,
-                                       thres=hr_thres)
+    return data_dict
 
-        if full_df.attrs != {} and hourly_df.attrs == {}:
-            hourly_df.attrs = full_df.attrs
 
-        daily_df = interval_averaging(full_df,
-                                      freq='D',
-                                      interval_count=day_count,
-                                      thres=day_thres)
+def average_sensor_data(full_df, serial_id, name='', write_to_file=True,
+                        path=None, **kwargs):
+    """Compute hourly and daily averages for the dataset recorded by a single
+    sensor unit and write full, hourly, and daily datasets to file.
 
-        if full_df.attrs != {} and daily_df.attrs == {}:
-            daily_df.attrs = full_df.attrs
+    Args:
+        full_df (pandas DataFrame):
+            Sensor DataFrame at original recorded sampling frequency.
+        serial_id (str):
+            The unique serial identifier for the sensor unit.
+        name (str):
+            The make and model of the sensor being evaluated.
+        write_to_file (bool):
+            If true, datasets will be written to the processed data directory.
+        path (str):
+            The full directory path to processed sensor data for a given sensor
+            make and model.
+        **kwargs (dict):
+            Keyword arguments passed to ``sensor_averaging()``.
 
-        data_dict['full'][serial_id] = full_df
-        data_dict['1-hour'][serial_id] = hourly_df
-        data_dict['24-hour'][serial_id] = daily_df
+    Returns:
+        (tuple): Three-element tuple containing:
 
-        # If both PM10 and PM2.5 data available, calculate the ratio PM2.5/PM10 and
-        # store it in the data_dict as the last column titled ratio_value.
-        from sensortoolkit.calculate import calculate_ratio, ratio_count
-        data_dict = calculate_ratio(data_dict, serial_id, **kwargs)
-
-        # Also, count the number of times the ratio value is <= 0.4 for at least an hour.
-        # ratios_count for sensors is currently not be displayed anywhere.
-        ratios_count = ratio_count(data_dict, serial_id, **kwargs)
-        
-        full_df = data_dict['full'][serial_id]
-        hourly_df = data_dict['1-hour'][serial_id]
-        daily_df = data_dict['24-hour'][serial_id]
-
-        if write_to_file is True:
-            print('....writing full, hourly, and daily datasets to .csv files')
-
-            # check if sensor-specific subfolder exists
-            if not os.path.exists(path):
-                os.makedirs(path)
-
-            # Add ISO8601 formatting. Not sure if copy of datasets are needed,
-            # but applying in case applying directly to original versions would
-            # modify datasets in place (converting to ISO8601 changes the
-            # data type of the index from datetime64 to object, so modifying
-            # original may cause issues when trying to utilize index in
-            # date/time fashion).
-            full_cp = full_df.copy()
-            full_cp.index = full_cp.index.to_series().apply(
-                                        pd.Timestamp.isoformat)
-
-            hourly_cp = hourly_df.copy()
-            hourly_cp.index = hourly_cp.index.to_series().apply(
-                                            pd.Timestamp.isoformat)
-
-            daily_cp = daily_df.copy()
-            daily_cp.index = daily_cp.index.to_series().apply(
-                                            pd.Timestamp.isoformat)
-
-            full_cp.to_csv(path + name + '_' + serial_id + '_full.csv')
-            hourly_cp.to_csv(path + name + '_' + serial_id + '_hourly.csv')
-            daily_cp.to_csv(path + name + '_' + serial_id + '_daily.csv')
+            - **full_df** (*pandas DataFrame*): Sensor dataset at original
+              recorded sampling frequency with duplicate timestamps removed.
+            - **hourly_df** (*pandas DataFrame*): Sensor dataset at 1-hour
+              averaged sampling frequency.
+            - **daily_df** (*pandas DataFrame*): Sensor dataset at 24-hour
+              averaged sampling frequency.
 
-    return data_dict
+    """
+    processed_format = kwargs.get('processed_format', 'csv')
+    partition = kwargs.get('partition_processed', False)
+    compact = kwargs.get('compact', False)
+    lazy_full = kwargs.get('lazy_full_data', False)
+
+    full_df = remove_duplicates(full_df,
+                                agg_numeric_by='mean',
+                                agg_object_by='first',
+                                print_indent=2)
+
+    # Compute timedelta between successive timestamps
+    delta = (full_df.index[1:] - full_df.index[0:-1]).to_frame()
+    if delta.index.name is None:
+        delta.index.name = 'DateTime'
+    idx_name = delta.index.name
+
+    # Use mode of timedelta to extrapolate # of datapoints recorded per hr
+    time_delta = delta[idx_name].mode()[0]
+    hr_count = pd.to_timedelta(1, unit='H') / time_delta
+    day_count = pd.to_timedelta(1, unit='D') / time_delta
+
+    # Use a 75% threshold
+    hr_thres = kwargs.get('threshold', 0.75)
+    day_thres = kwargs.get('threshold', 0.75)
+
+    # Print the mode of the sampling interval for recorded sensor data and
+    # the number of counts within each hour interval.
+    print('..{0:s} recording interval mode: {1:s}, '
+          '{2:4.1f} counts per hour'.format(serial_id,
+                                            str(time_delta),
+                                            hr_count,))
+
+    # Daily averages are derived from hourly sums and counts
+    avg_dfs = multi_interval_averaging(full_df,
+                                       intervals={'H': hr_count,
+                                                  'D': day_count},
+                                       thres={'H': hr_thres,
+                                              'D': day_thres})
+    hourly_df = avg_dfs['H']
+    daily_df = avg_dfs['D']
+
+    if full_df.attrs != {} and hourly_df.attrs == {}:
+        hourly_df.attrs = full_df.attrs
+
+    if full_df.attrs != {} and daily_df.attrs == {}:
+        daily_df.attrs = full_df.attrs
+
+    data_dict = {'full': {serial_id: full_df},
+                 '1-hour': {serial_id: hourly_df},
+                 '24-hour': {serial_id: daily_df}}
+
+    # If both PM10 and PM2.5 data available, calculate the ratio PM2.5/PM10 and
+    # store it in the data_dict as the last column titled ratio_value.
+    from sensortoolkit.calculate import calculate_ratio, ratio_count
+    data_dict = calculate_ratio(data_dict, serial_id, **kwargs)
+
+    # Also, count the number of times the ratio value is <= 0.4 for at least an hour.
+    # ratios_count for sensors is currently not be displayed anywhere.
+    ratios_count = ratio_count(data_dict, serial_id, **kwargs)
+
+    full_df = data_dict['full'][serial_id]
+    hourly_df = data_dict['1-hour'][serial_id]
+    daily_df = data_dict['24-hour'][serial_id]
+
+    if compact is True:
+        from sensortoolkit.lib_utils import compact_dataset
+        float32 = kwargs.get('float32_values', False)
+        full_df = compact_dataset(full_df, float32)
+        hourly_df = compact_dataset(hourly_df, float32)
+        daily_df = compact_dataset(daily_df, float32)
+
+    if write_to_file is True:
+        print('....writing full, hourly, and daily datasets to '
+              f'.{processed_format} files')
+
+        # check if sensor-specific subfolder exists (may be created by
+        # another worker process when averaging in parallel)
+        os.makedirs(path, exist_ok=True)
+
+        from sensortoolkit.ingest import write_processed_data
+
+        write_processed_data(full_df,
+                             path + name + '_' + serial_id + '_full',
+                             processed_format, partition,
+                             save_period=lazy_full)
+        write_processed_data(hourly_df,
+                             path + name + '_' + serial_id + '_hourly',
+                             processed_format, partition)
+        write_processed_data(daily_df,
+                             path + name + '_' + serial_id + '_daily',
+                             processed_format, partition)
+
+    return full_df, hourly_df, daily_df
 
 
 def interval_averaging(df, freq='H', interval_count=60, thres=0.75):
@@ -226,7 +312,52 @@ def interval_averaging(df, freq='H', interval_count=60, thres=0.75):
             Dataframe averaged to datetimeindex interval specified by 'freq'.
 
     """
-    n_thres = interval_count*thres
+    avg_dfs = multi_interval_averaging(df,
+                                       intervals={freq: interval_count},
+                                       thres=thres)
+
+    return avg_dfs[freq]
+
+
+def multi_interval_averaging(df, intervals, thres=0.75):
+    """Average DataFrame to several sampling frequencies in a single pass.
+
+    Sums and counts of numeric columns and counts of unique values in object
+    columns are computed once for the shortest averaging interval. Longer
+    averaging intervals that are whole multiples of the shortest interval
+    (e.g., 24-hour intervals from 1-hour intervals) are derived from these
+    statistics instead of regrouping the passed DataFrame. Intervals that do
+    not nest within a shorter interval (e.g., calendar months) are computed
+    from the passed DataFrame.
+
+    The completeness threshold is applied separately for each averaging
+    interval, so results are equivalent to calling ``interval_averaging()``
+    for each interval.
+
+    Args:
+        df (pandas DataFrame or pandas Series):
+            Dataframe or Series for which averages will be computed.
+        intervals (dict):
+            Dictionary with averaging intervals (pandas offset aliases, e.g.
+            ``'H'``, ``'D'``) as keys and the number of datapoints expected
+            within each averaging interval as values, e.g., for a sensor
+            recording measurements at 1-minute sampling frequency,
+            ``{'H': 60, 'D': 1440}``.
+        thres (float or dict):
+            Threshold (ranging from 0 to 1) for ratio of the number of
+            data points recorded within a given averaging interval vs. the
+            number of expected data points. Either a single value applied to
+            all intervals or a dictionary with a threshold for each interval.
+            Defaults to ``0.75`` (i.e., 75%).
+
+    Return:
+        avg_dfs (dict):
+            Dictionary with averaging intervals as keys and DataFrames
+            averaged to each interval as values.
+
+    """
+    if not isinstance(thres, dict):
+        thres = {freq: thres for freq in intervals}
 
     # If Series object passed, convert to DataFrame
     data_type = type(df)
@@ -237,8 +368,9 @@ def interval_averaging(df, freq='H', interval_count=60, thres=0.75):
     col_list = list(dict.fromkeys(df.columns))
 
     # Split DataFrame in to object-like columns and numeric-like columns
-    obj_df = df.select_dtypes(include=['object', 'datetime'])
-    num_df = df.select_dtypes(exclude=['object', 'datetime'])
+    # (categorical columns in compact datasets are object-like)
+    obj_df = df.select_dtypes(include=['object', 'category', 'datetime'])
+    num_df = df.select_dtypes(exclude=['object', 'category', 'datetime'])
 
     # Merge object columns by using the instance in the first non-null instance
     obj_df = column_merger(obj_df, by='first')
@@ -249,109 +381,362 @@ def interval_averaging(df, freq='H', interval_count=60, thres=0.75):
     obj_df_cols = list(obj_df.columns)
 
     num_df = num_df.dropna(axis=1, how='all')
+    obj_df = obj_df.dropna(how='all', axis=1)
+    obj_df = fill_categories(obj_df).fillna('')
+
+    # Compute interval statistics, starting with the shortest interval so
+    # that longer intervals may be derived from shorter intervals
+    stats = {}
+    for freq in sorted(intervals, key=interval_length):
+        source = next((src for src in stats if nests_within(src, freq)), None)
+
+        if source is None:
+            stats[freq] = (numeric_sums(num_df, freq),
+                           object_counts(obj_df, freq))
+        else:
+            (sum_df, count_df), obj_stats = stats[source]
+            stats[freq] = (numeric_sums(sum_df, freq, count_df),
+                           object_counts(obj_df, freq, obj_stats))
+
+    avg_dfs = {}
+    for freq, interval_count in intervals.items():
+        n_thres = interval_count*thres[freq]
+        (sum_df, count_df), obj_stats = stats[freq]
+
+        # index at specified interval for empty DataFrames (all NaNs)
+        nan_df_idx = pd.date_range(start=df.index[0],
+                                   end=df.index[-1],
+                                   freq=freq, normalize=True)
+
+        # Sample object-like data at specified interval by the mode
+        if obj_df.empty:
+            avg_obj_df = pd.DataFrame(np.nan, index=nan_df_idx,
+                                      columns=obj_df_cols)
+        else:
+            avg_obj_df = object_modes(obj_stats, n_thres)
 
-    # index at specified interval for empty DataFrames (all NaNs)
-    nan_df_idx = pd.date_range(start=obj_df.index[0],
-                               end=obj_df.index[-1],
-                               freq=freq, normalize=True)
+        dropped_objcols = [col for col in obj_df_cols
+                           if col not in avg_obj_df]
+        for col in dropped_objcols:
+            avg_obj_df[col] = np.nan
 
-    # Sample object-like data at specified interval by the mode
-    obj_df = obj_df.dropna(how='all', axis=1).fillna('')
+        if num_df.empty:
+            avg_num_df = pd.DataFrame(np.nan, index=nan_df_idx,
+                                      columns=num_df_cols)
+        else:
+            # Mean param values for each averaging interval, set null param
+            # vals for averaging intervals below completeness thres
+            avg_num_df = (sum_df / count_df).where(count_df > n_thres, np.nan)
 
-    if obj_df.empty:
-        avg_obj_df = pd.DataFrame(np.nan, index=nan_df_idx,
-                                  columns=obj_df_cols)
-    else:
-        avg_obj_df = obj_df.groupby([pd.Grouper(freq=freq)]
-                            ).agg(lambda x: object_grouper(x, n_thres))
+        # Rejoin non-numeric columns on averaging interval
+        avg_df = avg_num_df.join(avg_obj_df)
+
+        # Ensure that any columns with all NaNs in passed df are in avg_df
+        # (Numeric type columns that were dropped)
+        dropped_numcols = [col for col in col_list
+                           if col not in avg_df.columns]
+        for col in dropped_numcols:
+            avg_df[col] = np.nan
+
+        # reorder columns before return
+        avg_dfs[freq] = avg_df[col_list]
+
+    return avg_dfs
+
+
+def fill_categories(obj_df, fill_value=''):
+    """Add the fill value to the categories of categorical columns so that
+    null entries can be filled.
 
-    dropped_objcols = [col for col in obj_df_cols if col not in avg_obj_df]
-    for col in dropped_objcols:
-        avg_obj_df[col] = np.nan
+    Args:
+        obj_df (pandas DataFrame):
+            Dataset containing object-like columns.
+        fill_value (str, optional):
+            The value used to fill null entries. Defaults to ``''``.
+
+    Returns:
+        obj_df (pandas DataFrame):
+            Dataset with the fill value added to the categories of categorical
+            columns. The passed dataset is not modified.
+
+    """
+    cat_cols = [col for col in obj_df.columns
+                if isinstance(obj_df[col].dtype, pd.CategoricalDtype)
+                and fill_value not in obj_df[col].cat.categories]
+    if cat_cols:
+        obj_df = obj_df.copy(deep=False)
+        for col in cat_cols:
+            obj_df[col] = obj_df[col].cat.add_categories(fill_value)
+
+    return obj_df
+
+
+def interval_length(freq):
+    """Sort key for averaging intervals by the length of the interval.
 
+    Args:
+        freq (str):
+            The averaging interval (pandas offset alias).
+
+    Returns:
+        (int or float): The length of the interval in nanoseconds, or infinity
+        for intervals without a fixed length (e.g., calendar months).
+
+    """
+    try:
+        return pd.tseries.frequencies.to_offset(freq).nanos
+    except ValueError:
+        return np.inf
+
+
+def nests_within(short_freq, long_freq):
+    """Determine whether each interval at the longer averaging interval is
+    composed of whole intervals at the shorter averaging interval.
+
+    Args:
+        short_freq (str):
+            The shorter averaging interval (pandas offset alias).
+        long_freq (str):
+            The longer averaging interval (pandas offset alias).
+
+    Returns:
+        (bool): True if the longer interval is a whole multiple of the
+        shorter interval, otherwise False.
+
+    """
+    short_len = interval_length(short_freq)
+    long_len = interval_length(long_freq)
+    if np.inf in (short_len, long_len):
+        return False
+
+    return long_len % short_len == 0
+
+
+def interval_codes(index, freq):
+    """Assign each timestamp the integer code of its averaging interval.
+
+    Args:
+        index (pandas DatetimeIndex):
+            Timestamps to group into averaging intervals.
+        freq (str):
+            The averaging interval (pandas offset alias).
+
+    Returns:
+        (tuple): Two-element tuple containing:
+
+            - **interval_idx** (*pandas DatetimeIndex*): Index of averaging
+              intervals spanning the passed timestamps, including intervals
+              without any timestamps.
+            - **group_codes** (*numpy array*): Position of the averaging
+              interval in ``interval_idx`` for each timestamp.
+
+    """
+    grouped = pd.DataFrame(index=index).groupby(pd.Grouper(freq=freq))
+    interval_idx = grouped.size().index
+    group_codes = grouped.ngroup().values.astype(np.int64)
+
+    return interval_idx, group_codes
+
+
+def numeric_sums(num_df, freq, count_df=None):
+    """Compute the sum and number of values for numeric columns within each
+    averaging interval.
+
+    Args:
+        num_df (pandas DataFrame):
+            Dataset containing numeric columns. If ``count_df`` is passed,
+            the sums of each column within a shorter averaging interval.
+        freq (str):
+            The averaging interval (pandas offset alias).
+        count_df (pandas DataFrame, optional):
+            The number of values within each interval of a shorter averaging
+            interval that nests within ``freq``. Defaults to None (``num_df``
+            contains recorded values).
+
+    Returns:
+        (tuple): Two-element tuple containing:
+
+            - **sum_df** (*pandas DataFrame*): Sum of values for each column
+              within each averaging interval.
+            - **count_df** (*pandas DataFrame*): Number of non-null values for
+              each column within each averaging interval.
+
+    """
     if num_df.empty:
-        avg_num_df = pd.DataFrame(np.nan, index=nan_df_idx,
-                                  columns=num_df_cols)
+        return num_df, num_df
+
+    grouped = num_df.groupby(pd.Grouper(freq=freq))
+    sum_df = grouped.sum()
+
+    if count_df is None:
+        count_df = grouped.count()
     else:
+        count_df = count_df.groupby(pd.Grouper(freq=freq)).sum()
+
+    return sum_df, count_df
+
+
+def object_counts(obj_df, freq, obj_stats=None):
+    """Count the occurrences of each unique value for object columns within
+    each averaging interval.
+
+    Each timestamp is assigned the integer code of its averaging interval and
+    the values in each column are factorized into integer codes, so that the
+    number of occurrences of each value within each interval is found with a
+    single count over (interval, value) code pairs. For QAQC flag columns
+    (column names containing 'QAQC_Code'), only the number of non-empty flags
+    is counted.
+
+    Args:
+        obj_df (pandas DataFrame):
+            Dataset containing columns with type object (typically textual
+            information) alongside an associated datetime index. Null values
+            should be filled with empty strings.
+        freq (str):
+            The averaging interval (pandas offset alias).
+        obj_stats (tuple, optional):
+            Counts for a shorter averaging interval that nests within
+            ``freq``, as returned by this function. If passed, counts are
+            summed across the shorter intervals instead of regrouping
+            ``obj_df``. Defaults to None.
+
+    Returns:
+        obj_stats (tuple or None):
+            Two-element tuple containing the index of averaging intervals and
+            a dictionary with column names as keys and tuples of (interval
+            codes, value codes, counts, unique values) as values. None if
+            ``obj_df`` is empty.
+
+    """
+    if obj_df.empty:
+        return None
+
+    if obj_stats is not None:
+        short_idx, short_counts = obj_stats
+        interval_idx, short_codes = interval_codes(short_idx, freq)
+
+        col_counts = {}
+        for col, (groups, values, counts, uniques) in short_counts.items():
+            groups, values, counts = count_pairs(short_codes[groups], values,
+                                                 len(uniques), counts)
+            col_counts[col] = (groups, values, counts, uniques)
 
-        # Mean param values for each averaging interval
-        mean_df = num_df[:].groupby(
-                            [pd.Grouper(freq=freq)]).mean()
+        return interval_idx, col_counts
 
-        # Counts for each param and each averaging interval
-        counts_df = num_df[:].groupby(
-                            [pd.Grouper(freq=freq)]).count().add_suffix(
-                                                            '_count' + freq)
+    interval_idx, group_codes = interval_codes(obj_df.index, freq)
 
-        avg_num_df = mean_df.join(counts_df).sort_index(axis=1)
+    col_counts = {}
+    for col in obj_df.columns:
+        values = obj_df[col].values
 
-        # List of columns containing count for each averaging interval
-        count_list = list(avg_num_df.columns[[col.endswith('count' + freq)
-                                              for col in avg_num_df.columns]])
+        if 'QAQC_Code' in col:
+            # Only count non-empty flags, which are all assigned 1
+            flagged = values != ''
+            groups = group_codes[flagged]
+            value_codes = np.zeros(len(groups), dtype=np.int64)
+            uniques = np.array([1], dtype=object)
+        else:
+            groups = group_codes
+            value_codes, uniques = pd.factorize(values)
+            uniques = np.asarray(uniques, dtype=object)
 
-        # Set null param vals for averaging intervals below completeness thres
-        for col in count_list:
-            mean_col = col.replace('_count' + freq, '')
+        groups, values, counts = count_pairs(groups, value_codes,
+                                             len(uniques))
+        col_counts[col] = (groups, values, counts, uniques)
 
-            avg_num_df[mean_col] = avg_num_df[mean_col].where(
-                                        avg_num_df[col] > n_thres, np.nan)
+    return interval_idx, col_counts
 
-    # Rejoin non-numeric columns on averaging interval
-    avg_df = avg_num_df.join(avg_obj_df)
 
-    # Ensure that any columns with all NaNs in passed df are in avg_df
-    # (Numeric type columns that were dropped)
-    dropped_numcols = [col for col in col_list if col not in avg_df.columns]
-    for col in dropped_numcols:
-        avg_df[col] = np.nan
+def count_pairs(groups, values, n_uniques, weights=None):
+    """Count the occurrences of each unique (interval, value) code pair.
 
-    # reorder columns before return
-    avg_df = avg_df[col_list]
+    Args:
+        groups (numpy array):
+            Averaging interval code for each entry.
+        values (numpy array):
+            Value code for each entry.
+        n_uniques (int):
+            The number of unique values.
+        weights (numpy array, optional):
+            The number of occurrences represented by each entry. Defaults to
+            None (each entry is one occurrence).
 
-    return avg_df
+    Returns:
+        (tuple): Three-element tuple containing the interval codes, value
+        codes, and number of occurrences for each unique pair.
 
+    """
+    n_uniques = max(n_uniques, 1)
+    pair_codes = groups.astype(np.int64)*n_uniques + values
 
-def object_grouper(series, number_threshold):
+    pairs, inverse, counts = np.unique(pair_codes, return_inverse=True,
+                                       return_counts=True)
+    if weights is not None:
+        counts = np.bincount(inverse.ravel(), weights=weights,
+                             minlength=len(pairs)).astype(np.int64)
+
+    return pairs // n_uniques, pairs % n_uniques, counts
+
+
+def object_modes(obj_stats, number_threshold):
     """Group columns of type `object` by the mode of values within each
     averaging interval.
 
     Args:
-        series (pandas Series):
-            An array of values with type object (typically textual information)
-            alongside an associated datetime index.
+        obj_stats (tuple):
+            Counts of unique values within each averaging interval, as
+            returned by ``object_counts()``.
         number_threshold (int or float):
             The number of counts for the modal value within a given averaging
             interval required to assign the modal value to the averaging
-            interval. This can be expressed as a completeness threshold
-            (typically 70%) multiplied by the number of expected counts
-            within a given averaging interval.
+            interval. Typically 70% of the expected number of counts within
+            the interval (e.g., 70% x 60 = 42 counts for 1-minute recorded data
+            within a 1-hour averaging interval).
 
     Returns:
-        val (str or numpy.nan):
-            The mode of the object-type series within the specified averaging
-            interval. If the number of counts for the modal value is less than
-            the number threshold (70% x expected counts within an averaging
-            interval), return numpy.nan (null).
+        avg_obj_df (pandas DataFrame):
+            The mode of each object-type column within each averaging interval.
+            If the number of counts for the modal value is less than the number
+            threshold (70% x expected counts within an averaging interval), the
+            interval is null (numpy.nan). If multiple values share the highest
+            count, the value occurring first in the dataset is selected.
+            QAQC flag columns (column names containing 'QAQC_Code') are
+            assigned 1 if ANY non-empty values are recorded within the
+            interval, otherwise null.
 
     """
-    try:
-        # If the column is a QAQC data flag column, return '1' if ANY non-null
-        # values recorded in passed dataframe, otherwise return '0'
-        if 'QAQC_Code' in series.name:
-            unique_flags = list(series.replace('', np.nan).dropna().unique())
-            if unique_flags != []:
-                val = 1
-            else:
-                val = np.nan
+    interval_idx, col_counts = obj_stats
+    n_groups = len(interval_idx)
+
+    avg_obj_df = pd.DataFrame(index=interval_idx)
+
+    for col, (groups, values, counts, uniques) in col_counts.items():
+        # Order by interval, then count (descending), then value code (order
+        # of first occurrence) and keep the first entry for each interval
+        order = np.lexsort((values, -counts, groups))
+        groups = groups[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = groups[1:] != groups[:-1]
+
+        mode_groups = groups[first]
+        mode_values = values[order][first]
+        mode_counts = counts[order][first]
+
+        # Return 1 if ANY non-null values recorded for QAQC flag columns
+        if 'QAQC_Code' in col:
+            valid = mode_counts > 0
         else:
-            counts = series.value_counts().values[0]
-            if counts >= number_threshold:
-                val = series.value_counts().index[0]
-            else:
-                val = np.nan
-    except IndexError:
-        val = np.nan
-    return val
+            valid = mode_counts >= number_threshold
+
+        col_modes = np.full(n_groups, np.nan, dtype=object)
+        col_modes[mode_groups[valid]] = uniques[mode_values[valid]]
+        avg_obj_df[col] = col_modes
+
+    # Infer column types in the same fashion as groupby aggregation (e.g.,
+    # columns with all null intervals are converted to float type)
+    avg_obj_df = avg_obj_df.infer_objects()
+
+    return avg_obj_df
 
 
 def column_merger(df, by='first'):
@@ -76,7 +76,8 @@ class SensorEvaluation:
         full_df_list (list of pandas DataFrames): List of sensor data frames
             of length N (where N is the number of sensor units in a testing
             group). DataFrames indexed by ``DateTime`` at recorded sampling
-            frequency.
+            frequency. Datasets are loaded when this attribute is accessed
+            if not already loaded.
         hourly_df_list (list of pandas DataFrames): List of sensor data frames
             of length N (where N is the number of sensor units in a testing
             group). DataFrames indexed by ``DateTime`` at 1-hour averaged
@@ -198,19 +199,26 @@ class SensorEvaluation:
                                        'eval_stats', self.name, '')
 
         rec_int = self.sensor.recording_interval
-        self.full_df_list = list(self.sensor.data[rec_int].values())
         self.hourly_df_list = list(self.sensor.data['1-hour'].values())
         self.daily_df_list = list(self.sensor.data['24-hour'].values())
 
+        # The deployment period and recording interval only depend on the
+        # timestamps of datasets at recorded sampling frequency, datasets that
+        # are loaded when accessed are not retained. The deployment period
+        # excludes rows where all values are null (for datasets loaded when
+        # accessed, the period saved when the dataset was written is used).
+        full_index_list = list(self.sensor.index_frames(rec_int).values())
+        full_valid_list = list(self.sensor.period_frames(rec_int).values())
+
         # Compute sensor deployment period and concurrent deployment groups
         self.deploy_period_df = sensortoolkit.deploy.deployment_period(
-                                                        self.full_df_list,
+                                                        full_valid_list,
                                                         self.name,
                                                         self.serials)
 
         self.deploy_dict = sensortoolkit.deploy.construct_deploy_dict(
                                                         self.deploy_period_df,
-                                                        self.full_df_list,
+                                                        full_index_list,
                                                         self.hourly_df_list,
                                                         self.daily_df_list,
                                                         self.name,
@@ -254,6 +262,16 @@ class SensorEvaluation:
         self.stats_df = pd.DataFrame()
         self.avg_stats_df = pd.DataFrame()
 
+    @property
+    def full_df_list(self):
+        """List of sensor datasets at recorded sampling frequency.
+
+        Datasets that are loaded when accessed (see
+        ``sensortoolkit.ingest.LazyFrames``) are loaded by this property.
+        """
+        rec_int = self.sensor.recording_interval
+        return list(self.sensor.data[rec_int].values())
+
     def _assign_refdata_objs(self):
         # Retrieve reference data
         self.ref_dict = self.reference.data
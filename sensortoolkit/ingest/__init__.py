@@ -16,6 +16,12 @@ Last Updated:
   Wed Sep  8 11:40:27 2021
 """
 
+from ._processed_data_writer import (write_processed_data,
+                                     read_processed_data)
+from ._lazy_datasets import LazyFrames
 from ._processed_data_loader import processed_data_search
+from ._ingest_plan import IngestPlan
 from ._standard_ingest import standard_ingest
+from ._raw_data_manifest import raw_data_manifest
+from ._ingest_cache import IngestCache
 from ._sensor_import import sensor_import
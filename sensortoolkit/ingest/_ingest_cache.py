@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains the ``IngestCache`` class, which stores SDFS formatted
+datasets for each recorded sensor data file so that subsequent runs of
+``sensor_import()`` only need to ingest files that are new or have changed
+since the previous run.
+
+Cached datasets are saved in the ``..//data//sensor_data//[sensor_name]//ingest_cache``
+directory (next to the ``raw_data`` directory). Each recorded data file is
+tracked by its path relative to ``raw_data``, its size, and its modification
+time (or optionally a hash of the file contents). Cached datasets are discarded
+if the ``setup.json`` configuration, the ingestion method used to import
+sensor data, or the version of the ingestion code (``INGEST_CACHE_VERSION``)
+changes.
+
+================================================================================
+
+Created:
+  Sun Oct 18 10:41:08 2026
+Last Updated:
+  Sun Oct 18 10:41:08 2026
+"""
+import os
+import json
+import hashlib
+import pandas as pd
+
+# Increment when changes to the ingestion code alter the datasets returned by
+# standard_ingest() (e.g., timestamp parsing or column dtypes) so that datasets
+# cached by earlier versions are not reused.
+INGEST_CACHE_VERSION = 1
+
+
+class IngestCache:
+    """Cache of SDFS formatted datasets for recorded sensor data files.
+
+    Args:
+        data_path (str):
+            The full directory path to raw sensor data for a given sensor make
+            and model.
+        setup_path (str, optional):
+            Full path to the sensor ``setup.json`` file. If the contents of the
+            setup file change, all cached datasets are invalidated. Defaults
+            to None.
+        ingest_method (function object, optional):
+            Custom ingestion method used to import sensor data. Cached datasets
+            are invalidated if a different ingestion method is used. Defaults
+            to None (``standard_ingest()``).
+        validate_by (str, optional):
+            How changes to recorded data files are detected. Either ``'mtime'``
+            (file size and modification time) or ``'hash'`` (file size and
+            SHA-1 hash of file contents). Defaults to ``'mtime'``.
+
+    """
+    index_name = 'cache_index.json'
+
+    def __init__(self, data_path, setup_path=None, ingest_method=None,
+                 validate_by='mtime'):
+
+        if validate_by not in ('mtime', 'hash'):
+            raise ValueError(f'Invalid value for validate_by: {validate_by}. '
+                             'Accepted values include "mtime" and "hash"')
+
+        self.data_path = os.path.normpath(data_path)
+        self.cache_path = os.path.join(os.path.dirname(self.data_path),
+                                       'ingest_cache')
+        self.validate_by = validate_by
+        self.config = {'version': INGEST_CACHE_VERSION,
+                       'pandas': pd.__version__,
+                       'setup': self._setup_signature(setup_path),
+                       'ingest_method': self._method_signature(ingest_method)}
+        self.n_loaded = 0
+        self.n_stored = 0
+
+        self.index = {}
+        index_path = os.path.join(self.cache_path, self.index_name)
+        if os.path.isfile(index_path):
+            try:
+                with open(index_path) as file:
+                    saved = json.load(file)
+                if saved.get('config') == self.config:
+                    self.index = saved.get('files', {})
+                else:
+                    print('..ingestion configuration changed, clearing '
+                          'ingest cache')
+                    for entry in saved.get('files', {}).values():
+                        self._remove(entry['cache_file'])
+            except (OSError, ValueError):
+                self.index = {}
+
+    def load(self, path):
+        """Load the cached dataset for a recorded data file.
+
+        Args:
+            path (str):
+                Full path to the recorded sensor data file.
+
+        Returns:
+            df (pandas DataFrame or None):
+                The cached SDFS formatted dataset, or None if the file has not
+                been cached or has changed since it was cached.
+
+        """
+        key = self._key(path)
+        entry = self.index.get(key)
+        if entry is None or entry['signature'] != self._file_signature(path):
+            return None
+
+        try:
+            df = pd.read_pickle(os.path.join(self.cache_path,
+                                             entry['cache_file']))
+        except Exception:
+            # Cached file missing or unreadable, ingest the file again
+            self.index.pop(key)
+            return None
+
+        self.n_loaded += 1
+        return df
+
+    def store(self, path, df):
+        """Add the dataset ingested from a recorded data file to the cache.
+
+        Empty datasets (e.g., files that could not be read) are not cached.
+
+        Args:
+            path (str):
+                Full path to the recorded sensor data file.
+            df (pandas DataFrame):
+                SDFS formatted dataset ingested from the file.
+
+        Returns:
+            None.
+
+        """
+        if df is None or df.empty:
+            return
+
+        if not os.path.exists(self.cache_path):
+            os.makedirs(self.cache_path)
+
+        key = self._key(path)
+        cache_file = hashlib.sha1(key.encode('utf-8')).hexdigest() + '.pkl'
+        df.to_pickle(os.path.join(self.cache_path, cache_file))
+
+        self.index[key] = {'signature': self._file_signature(path),
+                           'cache_file': cache_file}
+        self.n_stored += 1
+
+    def save(self):
+        """Write the cache index to file.
+
+        Entries for recorded data files that no longer exist are removed.
+
+        Returns:
+            None.
+
+        """
+        for key, entry in self.index.copy().items():
+            if not os.path.isfile(os.path.join(self.data_path, key)):
+                self._remove(entry['cache_file'])
+                self.index.pop(key)
+
+        if not os.path.exists(self.cache_path):
+            os.makedirs(self.cache_path)
+
+        with open(os.path.join(self.cache_path, self.index_name), 'w') as file:
+            json.dump({'config': self.config, 'files': self.index}, file,
+                      indent=2)
+
+        print(f'..ingest cache: {self.n_loaded} files loaded from cache, '
+              f'{self.n_stored} files ingested')
+
+    def _key(self, path):
+        return os.path.relpath(os.path.normpath(path), self.data_path)
+
+    def _file_signature(self, path):
+        stat = os.stat(path)
+        if self.validate_by == 'hash':
+            sha1 = hashlib.sha1()
+            with open(path, 'rb') as file:
+                for block in iter(lambda: file.read(1 << 20), b''):
+                    sha1.update(block)
+            return [stat.st_size, sha1.hexdigest()]
+
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _remove(self, cache_file):
+        try:
+            os.remove(os.path.join(self.cache_path, cache_file))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _setup_signature(setup_path):
+        if setup_path is None or not os.path.isfile(setup_path):
+            return None
+        with open(setup_path, 'rb') as file:
+            return hashlib.sha1(file.read()).hexdigest()
+
+    @staticmethod
+    def _method_signature(ingest_method):
+        if ingest_method is None:
+            return None
+        return '.'.join([getattr(ingest_method, '__module__', ''),
+                         getattr(ingest_method, '__qualname__',
+                                 repr(ingest_method))])
@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains the ``IngestPlan`` class, which compiles the ingestion
+configuration in a ``setup.json`` file into the file-specific settings used by
+``standard_ingest()`` to convert recorded datasets into SDFS format.
+
+The setup file is read once and the settings for each unique combination of
+column headers (which is typically shared by all files for a sensor) are
+compiled once, including the timestamp columns, format, and time zone, the
+parameter renaming and unit scaling, and the columns and data types passed to
+the file reader. Plans are cached in memory for each setup file and are
+rebuilt if the setup file is modified.
+
+If a recorded dataset cannot be decoded with the encoding listed in the
+setup file (``'utf-8'`` by default) and the encoding is subsequently detected,
+the detected encoding is stored in the plan and used first for the remaining
+files that do not have an encoding listed in the setup file, so that encoding
+detection only runs when a file fails to decode.
+
+================================================================================
+
+Created:
+  Sun Oct 18 16:20:51 2026
+Last Updated:
+  Sun Oct 18 16:20:51 2026
+"""
+import os
+import json
+
+
+class IngestPlan:
+    """Compiled ingestion configuration for a ``setup.json`` file.
+
+    Plans should be constructed via ``IngestPlan.load()``, which returns the
+    cached plan for the setup file unless the file has been modified since the
+    plan was compiled.
+
+    Args:
+        setup_path (str):
+            Path to the setup.json file for ingesting datasets into SDFS format.
+
+    """
+    _plans = {}
+
+    def __init__(self, setup_path):
+        self.setup_path = os.path.abspath(setup_path)
+        self.signature = self._file_signature(self.setup_path)
+
+        with open(self.setup_path) as file:
+            self.setup = json.load(file)
+
+        self.file_list = [os.path.normpath(file) for file
+                          in self.setup['file_list']]
+        self.file_idx = {}
+        for i, path in enumerate(self.file_list):
+            self.file_idx.setdefault(path, i)
+
+        # Column headers within each data file
+        self.file_headers = {path: [] for path in self.file_idx}
+        for col_idx, col_idx_config in self.setup['col_headers'].items():
+            for header, header_config in col_idx_config.items():
+                header_files = set(self.file_list[i] for i
+                                   in header_config['in_file_list_idx'])
+                for path in header_files:
+                    self.file_headers[path].append((col_idx, header))
+
+        self.compiled = {}
+        self.detected_encoding = None
+
+    @classmethod
+    def load(cls, setup_path):
+        """Load the ingest plan for a setup file.
+
+        Args:
+            setup_path (str):
+                Path to the setup.json file.
+
+        Returns:
+            plan (IngestPlan):
+                The cached plan for the setup file, or a newly compiled plan
+                if the setup file has not been loaded or has been modified.
+
+        """
+        setup_path = os.path.abspath(setup_path)
+        plan = cls._plans.get(setup_path)
+
+        if plan is None or plan.signature != cls._file_signature(setup_path):
+            plan = cls(setup_path)
+            cls._plans[setup_path] = plan
+
+        return plan
+
+    def file_setup(self, data_path):
+        """Construct the file-specific setup configuration for a data file.
+
+        Args:
+            data_path (str):
+                Full path to the recorded dataset.
+
+        Raises:
+            ValueError: If the data file is not listed in the setup file.
+
+        Returns:
+            file_setup (dict):
+                Data structure containing file-specific formatting
+                configuration. Passed to ``standard_ingest()`` for ingestion
+                of the dataset corresponding to the file into SDFS format.
+
+        """
+        data_path = os.path.normpath(data_path)
+        if data_path not in self.file_idx:
+            raise ValueError(f'{data_path} is not listed in the setup file '
+                             f'{self.setup_path}')
+
+        headers = tuple(self.file_headers[data_path])
+        if headers not in self.compiled:
+            self.compiled[headers] = self.compile(headers)
+
+        file_setup = dict(self.compiled[headers])
+        file_setup['encoding_prediction'] = self.encoding_prediction(data_path)
+
+        return file_setup
+
+    def compile(self, headers):
+        """Compile the setup configuration for a combination of column
+        headers.
+
+        Args:
+            headers (tuple):
+                Tuple of (column index, header name) pairs for the columns in
+                a data file.
+
+        Returns:
+            file_setup (dict):
+                File-specific formatting configuration (excluding the encoding
+                prediction for the file).
+
+        """
+        setup = self.setup
+
+        file_col_list = []
+        file_drop_cols = []
+        file_dt_headers = {}
+        file_col_renaming = {}
+        file_sdfs_headers = []
+        file_unit_scaling = {}
+
+        for col_idx, header in headers:
+            file_col_list.append(header)
+
+            header_config = setup['col_headers'][col_idx][header]
+
+            if header_config['drop'] is True:
+                file_drop_cols.append(header)
+                continue
+
+            # Add datetime index column info
+            if header_config['header_class'] == 'datetime':
+                file_dt_headers[header] = header_config
+            # Add parameter column info
+            if header_config['header_class'] == 'parameter':
+                sdfs_param = header_config['sdfs_param']
+
+                file_col_renaming[header] = sdfs_param + '_Value'
+
+                file_sdfs_headers.append(sdfs_param)
+
+                if ('unit_transform' in header_config and
+                        header_config['unit_transform'] is not None):
+                    file_unit_scaling[header] = header_config['unit_transform']
+
+        col_list = ['name', 'path', 'file_extension', 'header_iloc']
+        file_setup = {col: setup[col] for col in col_list if col in setup}
+        file_setup['all_col_headers'] = file_col_list
+        file_setup['col_rename_dict'] = file_col_renaming
+        file_setup['drop_cols'] = file_drop_cols
+        file_setup['time_format_dict'] = file_dt_headers
+        file_setup['sdfs_header_names'] = file_sdfs_headers
+        file_setup['file_unit_scaling'] = file_unit_scaling
+
+        # Reference only: add parameter metadata columns
+        for param in file_sdfs_headers:
+            param_cols = ['_Unit', '_Param_Code', '_Method_Code', '_Method',
+                          '_Method_POC']
+
+            for col in param_cols:
+                header = param + col
+                if header in setup:
+                    file_setup[header] = setup[header]
+
+        # Reference only: add site metadata columns
+        site_cols = ['site_name', 'agency', 'site_aqs', 'site_lat', 'site_lon']
+        for col in site_cols:
+            if col in setup:
+                file_setup[col] = setup[col]
+
+        file_setup['data_row_idx'] = setup.get('data_row_idx', None)
+
+        try:
+            file_setup['data_source'] = setup['dataset_kwargs']['ref_data_source']
+        except KeyError:
+            pass
+
+        # Timestamp format and time zone
+        file_setup['time_format'] = ''.join(
+                        config['dt_format'] for config in file_dt_headers.values())
+        file_setup['time_zone'] = get_time_zone(file_setup)
+
+        # Arguments passed to the file reader
+        names, row_idx = get_read_args(file_setup)
+        usecols, columns = get_read_columns(file_setup)
+        file_setup['read_names'] = names
+        file_setup['read_skiprows'] = row_idx
+        file_setup['read_usecols'] = usecols
+        file_setup['read_columns'] = columns
+        file_setup['read_dtypes'] = get_read_dtypes(file_setup)
+
+        return file_setup
+
+    def encoding_prediction(self, data_path):
+        """Look up the predicted encoding for a data file.
+
+        Args:
+            data_path (str):
+                Normalized full path to the recorded dataset.
+
+        Returns:
+            encoding (str):
+                The encoding prediction listed in the setup file. If not
+                listed, the encoding detected for a previous file (if any),
+                otherwise ``'utf-8'``.
+
+        """
+        # default encoding prediction
+        encoding = 'utf-8'
+        if self.detected_encoding is not None:
+            encoding = self.detected_encoding
+        # pass on any predictions indicated by chardet in setup
+        predictions = self.setup.get('encoding_predictions', {})
+        file_idx = str(self.file_idx[data_path])
+        if file_idx in predictions:
+            encoding = predictions[file_idx]
+
+        return encoding
+
+    @staticmethod
+    def _file_signature(setup_path):
+        stat = os.stat(setup_path)
+        return (stat.st_size, stat.st_mtime_ns)
+
+
+def get_time_zone(setup):
+    """Determine the time zone of recorded timestamps.
+
+    Args:
+        setup (dict):
+            File-specific formatting configuration.
+
+    Raises:
+        ValueError: If multiple time-like columns are specified with differing
+            time zones.
+
+    Returns:
+        time_zone (str or None):
+            The time zone of recorded timestamps, None if not specified.
+
+    """
+    time_fmt = setup['time_format_dict']
+    time_zone_list = [time_fmt[col]['dt_timezone'] for col in time_fmt if
+                      time_fmt[col]['dt_timezone'] is not None]
+
+    if len(time_fmt) > 1 and len(set(time_zone_list)) > 1:
+        # Multiple time-like columns but the specified time zone for each does
+        # not match
+        raise ValueError(f'Too many time zones specified for datetime index:'
+                         f' {", ".join(time_zone_list)}. Only one time zone '
+                         'should be specified.')
+
+    if len(time_zone_list) == 0:
+        return None
+
+    return time_zone_list[0]
+
+
+def get_read_args(setup):
+    """Determine column names and rows to skip when reading recorded datasets.
+
+    Args:
+        setup (dict):
+            File-specific formatting configuration.
+
+    Returns:
+        (tuple): Two-element tuple containing:
+
+            - **names** (*list or None*): Column names passed to the reader if
+              datasets do not contain a header row.
+            - **row_idx** (*int, list, or None*): Rows skipped by the reader.
+
+    """
+    names = None
+    row_idx = None
+    if setup['header_iloc'] is None:
+        names = setup['all_col_headers']
+    if setup['data_row_idx'] is not None:
+        row_idx = setup['data_row_idx']
+
+    return names, row_idx
+
+
+def get_read_columns(setup):
+    """Determine which columns are read from recorded datasets.
+
+    Columns flagged to be dropped in the setup configuration are not read.
+    Columns are selected by position, so that the selection is unaffected by
+    header rows that are inconsistent with the setup configuration.
+
+    Args:
+        setup (dict):
+            File-specific formatting configuration.
+
+    Returns:
+        (tuple): Two-element tuple containing:
+
+            - **usecols** (*list or None*): Positions of columns passed to the
+              reader, None if all columns are read.
+            - **columns** (*list*): The setup configuration header names for
+              the columns that are read.
+
+    """
+    all_cols = setup['all_col_headers']
+    drop_cols = set(setup['drop_cols'])
+
+    usecols = [i for i, col in enumerate(all_cols) if col not in drop_cols]
+    columns = [all_cols[i] for i in usecols]
+    if len(usecols) == len(all_cols):
+        usecols = None
+
+    return usecols, columns
+
+
+def get_read_dtypes(setup, numeric=True):
+    """Construct the mapping of column positions to data types passed to the
+    reader for recorded datasets.
+
+    Timestamp columns are read as text and parameter columns are read as
+    floats, so that values are not type inferred and then converted.
+
+    Args:
+        setup (dict):
+            File-specific formatting configuration.
+        numeric (bool, optional):
+            If True, parameter columns are read as floats. Defaults to True.
+
+    Returns:
+        dtype (dict):
+            Dictionary with column positions as keys and data types as values.
+
+    """
+    dtype = {}
+    for i, col in enumerate(setup['all_col_headers']):
+        if col in setup['drop_cols']:
+            continue
+        if col in setup['time_format_dict']:
+            dtype[i] = str
+        elif numeric and col in setup['col_rename_dict']:
+            dtype[i] = 'float64'
+
+    return dtype
@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains the ``LazyFrames`` class, a dictionary-like container of
+datasets that are loaded from file when first accessed.
+
+When previously processed sensor datasets are loaded, datasets at the
+original recorded sampling frequency are typically much larger than the
+1-hour and 24-hour averaged datasets but are only used by a few evaluation
+steps (e.g., plotting the distribution of recording intervals). Processed
+full time-resolution datasets are therefore held by ``LazyFrames`` entries
+that read the dataset from file the first time the entry is accessed. Loaded
+datasets may be evicted (released from memory) and are reloaded if accessed
+again.
+
+The timestamps of unloaded datasets (used to determine the recording interval
+of each sensor) can be read without loading parameter data via
+``LazyFrames.index()``. The first and last timestamps of rows with at least
+one recorded value (the deployment period of each sensor) are returned by
+``LazyFrames.valid_period()``, which uses the period saved when the dataset was
+written if available and otherwise computes the period from the dataset values
+(read from file without retaining the dataset).
+
+================================================================================
+
+Created:
+  Sun Oct 18 17:41:09 2026
+Last Updated:
+  Sun Oct 18 17:41:09 2026
+"""
+from collections.abc import MutableMapping
+import pandas as pd
+
+
+class LazyFrames(MutableMapping):
+    """Dictionary of datasets that are loaded from file when first accessed.
+
+    Args:
+        loaders (dict, optional):
+            Dictionary with keys (e.g., sensor serial identifiers) and
+            functions that load the dataset for each key as values. Loaders
+            are called without arguments to load the dataset and with
+            ``columns=[]`` to only load the timestamp index, e.g.,
+            ``functools.partial()`` objects for
+            ``sensortoolkit.ingest.read_processed_data()``. Defaults to None.
+        keep_loaded (bool, optional):
+            If True, datasets are kept in memory after they are loaded. If
+            False, datasets are read from file each time they are accessed
+            and are not retained. Defaults to True.
+        period_loaders (dict, optional):
+            Dictionary with keys and functions that return the first and last
+            timestamps of rows with at least one non-null value for each
+            dataset without loading the dataset (or None if the period is
+            not available), e.g., ``functools.partial()`` objects for
+            ``sensortoolkit.ingest._processed_data_writer.read_valid_period()``.
+            Defaults to None.
+
+    """
+
+    def __init__(self, loaders=None, keep_loaded=True, period_loaders=None):
+        self._loaders = dict(loaders or {})
+        self._period_loaders = dict(period_loaders or {})
+        self._frames = {}
+        self._indexes = {}
+        self._valid_indexes = {}
+        self._keys = dict.fromkeys(self._loaders)
+        self._transforms = []
+        self._bounds = []
+        self.keep_loaded = keep_loaded
+
+    def __getitem__(self, key):
+        if key in self._frames:
+            return self._frames[key]
+        if key not in self._loaders:
+            raise KeyError(key)
+
+        df = self._load(key)
+        if self.keep_loaded:
+            self._frames[key] = df
+
+        return df
+
+    def _load(self, key):
+        df = self._loaders[key]()
+        for start, end in self._bounds:
+            df = clip_dataset(df, start, end)
+        for func, args, kwargs in self._transforms:
+            if not df.empty:
+                df = func(df, *args, **kwargs)
+
+        return df
+
+    def __setitem__(self, key, df):
+        # Assigned datasets cannot be reloaded from file
+        self._frames[key] = df
+        self._loaders.pop(key, None)
+        self._period_loaders.pop(key, None)
+        self._indexes.pop(key, None)
+        self._valid_indexes.pop(key, None)
+        self._keys[key] = None
+
+    def __delitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        del self._keys[key]
+        self._frames.pop(key, None)
+        self._loaders.pop(key, None)
+        self._period_loaders.pop(key, None)
+        self._indexes.pop(key, None)
+        self._valid_indexes.pop(key, None)
+
+    def __iter__(self):
+        return iter(list(self._keys))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        entries = ', '.join(f'{key!r}: ' + ('<loaded>' if self.is_loaded(key)
+                                             else '<not loaded>')
+                            for key in self._keys)
+        return f'{type(self).__name__}({{{entries}}})'
+
+    def copy(self):
+        """Return a shallow copy (loaded datasets are not copied)."""
+        new = type(self)(self._loaders, self.keep_loaded,
+                         self._period_loaders)
+        new._frames = dict(self._frames)
+        new._indexes = dict(self._indexes)
+        new._valid_indexes = dict(self._valid_indexes)
+        new._keys = dict(self._keys)
+        new._transforms = list(self._transforms)
+        new._bounds = list(self._bounds)
+        return new
+
+    def add_loader(self, key, loader, period_loader=None):
+        """Add (or replace) the dataset for a key with a dataset loaded from
+        file when first accessed.
+
+        Args:
+            key:
+                The dataset key.
+            loader (function object):
+                Function that loads the dataset.
+            period_loader (function object, optional):
+                Function that returns the first and last timestamps of rows
+                with at least one non-null value without loading the dataset
+                (or None if not available). Defaults to None.
+
+        Returns:
+            None.
+
+        """
+        self._loaders[key] = loader
+        self._period_loaders.pop(key, None)
+        if period_loader is not None:
+            self._period_loaders[key] = period_loader
+        self._frames.pop(key, None)
+        self._indexes.pop(key, None)
+        self._valid_indexes.pop(key, None)
+        self._keys[key] = None
+
+    def is_loaded(self, key):
+        """Whether the dataset for a key is currently held in memory.
+
+        Args:
+            key:
+                The dataset key.
+
+        Returns:
+            bool: True if the dataset is loaded.
+
+        """
+        return key in self._frames
+
+    def loaded(self):
+        """Return the datasets that are currently held in memory.
+
+        Returns:
+            frames (dict):
+                Dictionary of loaded datasets.
+
+        """
+        return {key: self._frames[key] for key in self._keys
+                if key in self._frames}
+
+    def evict(self, key=None):
+        """Release loaded datasets from memory.
+
+        Evicted datasets are reloaded from file if accessed again. Datasets
+        that were assigned to the container (rather than loaded from file)
+        are not evicted.
+
+        Args:
+            key (optional):
+                The dataset key to evict. Defaults to None (all datasets that
+                can be reloaded are evicted).
+
+        Returns:
+            None.
+
+        """
+        keys = list(self._frames) if key is None else [key]
+        for key in keys:
+            if key in self._loaders:
+                self._frames.pop(key, None)
+
+    def index(self, key, dropna=False):
+        """Return the timestamp index of a dataset without retaining the
+        dataset.
+
+        Args:
+            key:
+                The dataset key.
+            dropna (bool, optional):
+                If True, only the timestamps of rows with at least one
+                non-null value are returned. Computing these timestamps
+                requires reading the dataset values from file (the dataset is
+                not retained). Defaults to False (the timestamps are read
+                without loading parameter data).
+
+        Returns:
+            index (pandas DatetimeIndex):
+                The timestamps of the dataset.
+
+        """
+        if key in self._frames:
+            df = self._frames[key]
+            if dropna:
+                return df.dropna(how='all', axis=0).index
+            return df.index
+        if key not in self._loaders:
+            raise KeyError(key)
+
+        if dropna:
+            if key not in self._valid_indexes:
+                df = self._load(key)
+                self._indexes[key] = df.index
+                self._valid_indexes[key] = df.dropna(how='all', axis=0).index
+            return self._valid_indexes[key]
+
+        if key not in self._indexes:
+            df = self._loaders[key](columns=[])
+            for start, end in self._bounds:
+                df = clip_dataset(df, start, end)
+            self._indexes[key] = df.index
+
+        return self._indexes[key]
+
+    def valid_period(self, key):
+        """Return the first and last timestamps of rows in a dataset with at
+        least one non-null value.
+
+        For datasets that are not loaded, the period saved when the dataset
+        was written is used if available. Otherwise, the dataset values are
+        read from file to determine the period (the dataset is not retained).
+
+        Args:
+            key:
+                The dataset key.
+
+        Returns:
+            period (tuple or None):
+                The first and last timestamps, or None if all rows are null.
+
+        """
+        if key in self._loaders and key not in self._frames:
+            period = self._saved_period(key)
+            if period is not None:
+                return period
+
+        index = self.index(key, dropna=True)
+        if index.empty:
+            return None
+
+        return index[0], index[-1]
+
+    def _saved_period(self, key):
+        if key in self._valid_indexes or key not in self._period_loaders:
+            return None
+
+        period = self._period_loaders[key]()
+        if period is None:
+            return None
+
+        # The saved period must not extend beyond the bounds of the dataset
+        bounds = pd.DataFrame(index=pd.DatetimeIndex(period))
+        for start, end in self._bounds:
+            bounds = clip_dataset(bounds, start, end)
+        if bounds.shape[0] != 2:
+            return None
+
+        # Match the time zone of the timestamps loaded from file
+        tz = self.index(key).tz
+        if bounds.index.tz is None:
+            if tz is not None:
+                bounds = bounds.tz_localize(tz)
+        else:
+            bounds = bounds.tz_convert(tz)
+
+        return bounds.index[0], bounds.index[1]
+
+    def index_frame(self, key, dropna=False):
+        """Return the dataset if loaded, otherwise a dataset containing only
+        the timestamps of the dataset.
+
+        Used to compute summaries that only depend on the timestamps of
+        datasets (e.g., the recording interval or the deployment period)
+        without retaining datasets.
+
+        Args:
+            key:
+                The dataset key.
+            dropna (bool, optional):
+                If True, only rows with at least one non-null value are
+                returned (see ``LazyFrames.index()``). Defaults to False.
+
+        Returns:
+            df (pandas DataFrame):
+                The loaded dataset, or a dataset with the timestamp index and
+                a single column containing the timestamps.
+
+        """
+        if key in self._frames:
+            df = self._frames[key]
+            return df.dropna(how='all', axis=0) if dropna else df
+
+        index = self.index(key, dropna=dropna)
+        return pd.DataFrame({index.name or 'DateTime': index}, index=index)
+
+    def clip(self, start=None, end=None):
+        """Restrict datasets to the period between ``start`` and ``end``.
+
+        Applied to loaded datasets immediately and to the remaining datasets
+        (and their timestamp indexes) when they are loaded.
+
+        Args:
+            start (str, optional):
+                The beginning timestamp. Defaults to None.
+            end (str, optional):
+                The ending timestamp. Defaults to None.
+
+        Returns:
+            self (LazyFrames): The modified container.
+
+        """
+        if start is None and end is None:
+            return self
+
+        self._bounds.append((start, end))
+        self._indexes = {key: clip_dataset(pd.DataFrame(index=index),
+                                           start, end).index
+                         for key, index in self._indexes.items()}
+        self._valid_indexes = {key: clip_dataset(pd.DataFrame(index=index),
+                                                 start, end).index
+                               for key, index in self._valid_indexes.items()}
+        for key, df in self._frames.items():
+            self._frames[key] = clip_dataset(df, start, end)
+
+        return self
+
+    def pipe(self, func, *args, **kwargs):
+        """Apply a function to each dataset.
+
+        Applied to loaded datasets immediately and to the remaining datasets
+        when they are loaded. Functions are not applied to empty datasets and
+        must not modify the timestamp index (use ``clip()`` to restrict the
+        period of datasets).
+
+        Args:
+            func (function object):
+                Function accepting a dataset as the first argument and
+                returning the modified dataset.
+            *args:
+                Additional positional arguments passed to ``func``.
+            **kwargs:
+                Keyword arguments passed to ``func``.
+
+        Returns:
+            self (LazyFrames): The modified container.
+
+        """
+        self._transforms.append((func, args, kwargs))
+        for key, df in self._frames.items():
+            if not df.empty:
+                self._frames[key] = func(df, *args, **kwargs)
+
+        return self
+
+
+def clip_dataset(df, start=None, end=None):
+    """Restrict a dataset with a DatetimeIndex to the period between
+    ``start`` and ``end``.
+
+    Args:
+        df (pandas DataFrame):
+            Dataset with a DatetimeIndex.
+        start (str, optional):
+            The beginning timestamp. Defaults to None.
+        end (str, optional):
+            The ending timestamp. Defaults to None.
+
+    Returns:
+        df (pandas DataFrame):
+            The dataset for the specified period.
+
+    """
+    if df.index.empty:
+        return df
+    if start is not None:
+        df = df.loc[start:, :]
+    if end is not None:
+        df = df.loc[:end, :]
+    return df
@@ -5,6 +5,18 @@ are imported for three time intervals, including data at the originally recorded
 sampling frequency, datasets that have been averaged to 1-hour intervals, and
 datasets that have been averaged to 24-hour intervals.
 
+Processed datasets may be stored as csv, parquet, or feather files, and may be
+partitioned into monthly files (see
+``sensortoolkit.datetime_utils.sensor_averaging()``). For partitioned datasets,
+only files overlapping with the deployment period are loaded.
+
+Datasets at the originally recorded sampling frequency may optionally be loaded
+lazily (see ``sensortoolkit.ingest.LazyFrames``), so that these datasets are
+only read from file if accessed. The deployment period of lazily loaded
+datasets is determined from the period saved when the datasets were written
+(if available, see ``sensortoolkit.ingest.write_processed_data()``), otherwise
+from the dataset values the first time the period is needed.
+
 ================================================================================
 
 @Author:
@@ -18,7 +30,13 @@ Last Updated:
 """
 import os
 import sys
+from functools import partial
 import pandas as pd
+from sensortoolkit.ingest._lazy_datasets import LazyFrames
+from sensortoolkit.ingest._processed_data_writer import (processed_extensions,
+                                                        read_processed_data,
+                                                        read_valid_period,
+                                                        PARTITION_INDEX)
 
 
 def processed_data_search(processed_path, sensor_serials, **kwargs):
@@ -46,6 +64,18 @@ def processed_data_search(processed_path, sensor_serials, **kwargs):
         The timestamp (date) marking the end of the sensor testing period,
         formatted as ``'YYYY-MM-DD HH:MM:SS'``. Sensor datasets will be
         concatenated to end at this timestamp.
+    :param list processed_columns:
+        The names of columns to load from processed datasets. Defaults to None
+        (all columns are loaded).
+    :param bool lazy_full_data:
+        If True, datasets at the originally recorded sampling frequency are
+        returned in a ``sensortoolkit.ingest.LazyFrames`` container and are
+        only read from file when first accessed. Defaults to False.
+    :param bool keep_full_data:
+        If True, lazily loaded datasets at the originally recorded sampling
+        frequency are kept in memory after they are first accessed. If False,
+        datasets are read from file each time they are accessed. Defaults to
+        True.
 
     Returns:
         (tuple): Three-element tuple containing:
@@ -63,10 +93,19 @@ def processed_data_search(processed_path, sensor_serials, **kwargs):
     """
     start = kwargs.get('deploy_bdate', None)
     end = kwargs.get('deploy_edate', None)
+    columns = kwargs.get('processed_columns', None)
+    lazy_full = kwargs.get('lazy_full_data', False)
+    keep_full = kwargs.get('keep_full_data', True)
 
     data_dict = {'full': {},
                  '1-hour': {},
                  '24-hour': {}}
+    if lazy_full:
+        data_dict['full'] = LazyFrames(keep_loaded=keep_full)
+
+    file_suffixes = {'full': '_full',
+                     '1-hour': '_hourly',
+                     '24-hour': '_daily'}
 
     # Check if files in processed file directory
     if len(os.listdir(processed_path)) == 0:
@@ -75,43 +114,49 @@ def processed_data_search(processed_path, sensor_serials, **kwargs):
 
     else:
         print('Loading processed sensor data')
+        file_list = os.listdir(processed_path)
         for serial_id in list(sensor_serials.values()):
             for interval in data_dict:
                 data_dict[interval][serial_id] = pd.DataFrame()
 
-            for filename in os.listdir(processed_path):
-
-                if filename.endswith(serial_id + '_full.csv'):
-                    print('..' + filename)
-                    # Assert index formatting is ISO8601
-                    df = pd.read_csv(processed_path+filename,
-                                     index_col=0, parse_dates=True)
-                    if start is not None:
-                        df = df.loc[start:, :]
-                    if end is not None:
-                        df = df.loc[:end, :]
-                    data_dict['full'][serial_id] = df
-
-                if filename.endswith(serial_id + '_hourly.csv'):
-                    print('..' + filename)
-                    # Assert index formatting is ISO8601
-                    df = pd.read_csv(processed_path+filename,
-                                     index_col=0, parse_dates=True)
-                    if start is not None:
-                        df = df.loc[start:, :]
-                    if end is not None:
-                        df = df.loc[:end, :]
-                    data_dict['1-hour'][serial_id] = df
-
-                if filename.endswith(serial_id + '_daily.csv'):
-                    print('..' + filename)
-                    # Assert index formatting is ISO8601
-                    df = pd.read_csv(processed_path+filename,
-                                     index_col=0, parse_dates=True)
-                    if start is not None:
-                        df = df.loc[start:, :]
-                    if end is not None:
-                        df = df.loc[:end, :]
-                    data_dict['24-hour'][serial_id] = df
+                # Locate processed files in any of the supported formats
+                # (including directories of monthly partitioned files). If the
+                # dataset has been written in multiple formats, load the most
+                # recently written file
+                file_endings = [serial_id + file_suffixes[interval] + ext
+                                for ext in processed_extensions.values()]
+                partition_ending = serial_id + file_suffixes[interval]
+
+                matches = {}
+                for filename in file_list:
+                    file_path = os.path.join(processed_path, filename)
+                    index_path = os.path.join(file_path, PARTITION_INDEX)
+                    if filename.endswith(tuple(file_endings)):
+                        matches[filename] = os.path.getmtime(file_path)
+                    elif (filename.endswith(partition_ending) and
+                          os.path.isfile(index_path)):
+                        matches[filename] = os.path.getmtime(index_path)
+
+                if matches == {}:
+                    continue
+                filename = max(matches, key=matches.get)
+
+                loader = partial(read_processed_data,
+                                 os.path.join(processed_path, filename),
+                                 start=start, end=end, columns=columns)
+
+                if isinstance(data_dict[interval], LazyFrames):
+                    print('..' + filename + ' (loaded when accessed)')
+                    period_loader = partial(read_valid_period,
+                                            os.path.join(processed_path,
+                                                         filename),
+                                            start=start, end=end,
+                                            columns=columns)
+                    data_dict[interval].add_loader(serial_id, loader,
+                                                   period_loader)
+                    continue
+
+                print('..' + filename)
+                data_dict[interval][serial_id] = loader()
 
         return data_dict
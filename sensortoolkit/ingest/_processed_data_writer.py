@@ -0,0 +1,582 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains methods for writing and reading processed (SDFS
+formatted) sensor datasets. Datasets may be stored as comma-separated value
+files (``'csv'``, the default), or in columnar formats (``'parquet'`` or
+``'feather'``) that preserve column data types and load considerably faster
+than csv files for large datasets. Columnar formats require the ``pyarrow``
+package.
+
+Parquet files are written in row groups of consecutive timestamps, so
+datasets loaded for a specified time period only read row groups that
+overlap with the period.
+
+Datasets may also be partitioned into monthly files. Partitioned datasets are
+written to a directory (named in the same fashion as the unpartitioned file,
+excluding the file extension) containing one file per month and an index file
+(``partition_index.json``) that lists the period spanned by each file. When
+partitioned datasets are loaded for a specified time period, only files that
+overlap with the period are read.
+
+The first and last timestamps of rows with at least one recorded value (the
+deployment period of the sensor) are saved in the partition index of
+partitioned datasets. For unpartitioned datasets that will be loaded lazily
+(see ``sensortoolkit.ingest.LazyFrames``), the period may be saved to a small
+file named after the dataset file (``[file name].period.json``). The
+deployment period can then be determined without reading the dataset.
+
+================================================================================
+
+Created:
+  Sun Oct 18 13:05:22 2026
+Last Updated:
+  Sun Oct 18 13:05:22 2026
+"""
+import os
+import json
+import numpy as np
+import pandas as pd
+
+# File extension for each of the supported processed data formats
+processed_extensions = {'csv': '.csv',
+                        'parquet': '.parquet',
+                        'feather': '.feather'}
+
+# Number of rows per parquet row group
+ROW_GROUP_SIZE = 50000
+
+# Name of the index file for partitioned datasets
+PARTITION_INDEX = 'partition_index.json'
+
+# Suffix of the file listing the valid period of unpartitioned datasets
+PERIOD_SUFFIX = '.period.json'
+
+
+def write_processed_data(df, file_path, processed_format='csv',
+                         partition=False, save_period=False):
+    """Write an SDFS formatted dataset to file.
+
+    Args:
+        df (pandas DataFrame):
+            SDFS formatted dataset with a DatetimeIndex.
+        file_path (str):
+            Full path to the output file, excluding the file extension.
+        processed_format (str, optional):
+            The file format, either ``'csv'``, ``'parquet'``, or
+            ``'feather'``. Defaults to ``'csv'``.
+        partition (bool, optional):
+            If True, the dataset is split into monthly files written to the
+            directory at ``file_path``. Defaults to False.
+        save_period (bool, optional):
+            If True and the dataset is not partitioned, the first and last
+            timestamps of rows with at least one non-null value are saved to
+            ``[file name].period.json`` so that the deployment period of
+            lazily loaded datasets can be determined without reading the
+            dataset. The period of partitioned datasets is always saved to
+            the partition index. Defaults to False.
+
+    Returns:
+        None.
+
+    """
+    if processed_format not in processed_extensions:
+        raise ValueError(f'Invalid processed data format: {processed_format}.'
+                         ' Accepted formats include "csv", "parquet", and '
+                         '"feather"')
+
+    if partition:
+        write_partitions(df, file_path, processed_format)
+        return
+
+    file_path += processed_extensions[processed_format]
+    write_dataset_file(df, file_path, processed_format)
+
+    if not save_period:
+        # Remove the period saved for a previously written dataset
+        try:
+            os.remove(file_path + PERIOD_SUFFIX)
+        except OSError:
+            pass
+        return
+
+    # Save the valid period alongside the file. The size and modification
+    # time of the dataset file are recorded so that the period is ignored if
+    # the file is subsequently modified.
+    stat = os.stat(file_path)
+    period = valid_period(df)
+    period['signature'] = [stat.st_size, stat.st_mtime_ns]
+    with open(file_path + PERIOD_SUFFIX, 'w') as file:
+        json.dump(period, file, indent=2)
+
+
+def write_dataset_file(df, file_path, processed_format):
+    """Write an SDFS formatted dataset to a single file.
+
+    Args:
+        df (pandas DataFrame):
+            SDFS formatted dataset with a DatetimeIndex.
+        file_path (str):
+            Full path to the output file, including the file extension.
+        processed_format (str):
+            The file format, either ``'csv'``, ``'parquet'``, or
+            ``'feather'``.
+
+    Returns:
+        None.
+
+    """
+    if processed_format == 'csv':
+        # Add ISO8601 formatting. The index is replaced on a shallow copy so
+        # that the DatetimeIndex of the passed dataset is not modified
+        # (converting to ISO8601 changes the data type of the index from
+        # datetime64 to object) and column data are not copied.
+        df_iso = df.copy(deep=False)
+        df_iso.index = iso8601_index(df.index)
+        df_iso.to_csv(file_path)
+        return
+
+    if df.index.name is None:
+        df = df.rename_axis('DateTime')
+    df = conform_object_columns(df)
+
+    if processed_format == 'parquet':
+        df.to_parquet(file_path, engine='pyarrow',
+                      row_group_size=ROW_GROUP_SIZE)
+
+    if processed_format == 'feather':
+        df.reset_index().to_feather(file_path)
+
+
+def iso8601_index(index):
+    """Format a DatetimeIndex as ISO8601 timestamp strings.
+
+    Timestamps are formatted identically to ``pandas.Timestamp.isoformat()``
+    (e.g., ``'2021-01-01T00:00:00-05:00'``), but the entire index is formatted
+    at once by ``DatetimeIndex.strftime()`` and the UTC offset of each
+    timestamp is appended from the set of unique offsets. Timestamps with
+    fractional seconds (which ``isoformat()`` writes with microsecond or
+    nanosecond precision depending on the value) are formatted individually.
+
+    Args:
+        index (pandas DatetimeIndex):
+            The timestamp index of an SDFS formatted dataset.
+
+    Returns:
+        iso_index (pandas Index):
+            Index of ISO8601 formatted timestamp strings with the same name
+            as the passed index.
+
+    """
+    if not isinstance(index, pd.DatetimeIndex) or index.hasnans:
+        return pd.Index(index.to_series().apply(pd.Timestamp.isoformat),
+                        name=index.name)
+
+    # pandas formats timestamps much faster with the 'YYYY-MM-DD HH:MM:SS'
+    # format than with other formats (such as the ISO8601 'T' separator or a
+    # UTC offset), the separator is replaced afterwards
+    local = index.tz_localize(None)
+    iso = local.strftime('%Y-%m-%d %H:%M:%S').str.replace(' ', 'T',
+                                                          regex=False)
+    iso = np.asarray(iso, dtype=object)
+
+    if index.tz is not None:
+        # Append the UTC offset (+HH:MM) of each timestamp, formatted once
+        # for each unique offset
+        offsets = local - index.tz_convert('UTC').tz_localize(None)
+        codes, unique_offsets = pd.factorize(offsets)
+        suffixes = np.array([offset_string(offset)
+                             for offset in unique_offsets], dtype=object)
+        iso = iso + suffixes[codes]
+
+    # Fractional seconds are written with varying precision by isoformat()
+    fractional = index.microsecond + index.nanosecond != 0
+    if fractional.any():
+        iso[fractional] = [timestamp.isoformat()
+                           for timestamp in index[fractional]]
+
+    return pd.Index(iso, dtype=object, name=index.name)
+
+
+def offset_string(offset):
+    """Format a UTC offset as used in ISO8601 timestamps.
+
+    Args:
+        offset (pandas Timedelta):
+            The UTC offset.
+
+    Returns:
+        offset (str):
+            The offset formatted as ``'+HH:MM'`` (or ``'-HH:MM'``).
+
+    """
+    minutes = int(offset.total_seconds() // 60)
+    sign = '-' if minutes < 0 else '+'
+    return f'{sign}{abs(minutes) // 60:02d}:{abs(minutes) % 60:02d}'
+
+
+def read_processed_data(file_path, start=None, end=None, columns=None):
+    """Load an SDFS formatted dataset from file.
+
+    The file format is determined from the file extension. If ``file_path``
+    is a directory, the dataset is loaded from monthly partitions.
+
+    Args:
+        file_path (str):
+            Full path to the processed data file or partition directory.
+        start (str, optional):
+            Timestamp marking the beginning of the period to load. Defaults
+            to None (load from the beginning of the dataset).
+        end (str, optional):
+            Timestamp marking the end of the period to load. Defaults to None
+            (load through the end of the dataset).
+        columns (list, optional):
+            The names of columns to load. Defaults to None (all columns are
+            loaded).
+
+    Returns:
+        df (pandas DataFrame):
+            SDFS formatted dataset.
+
+    """
+    if os.path.isdir(file_path):
+        return read_partitions(file_path, start, end, columns)
+
+    if file_path.endswith(processed_extensions['parquet']):
+        filters = parquet_date_filters(file_path, start, end)
+        df = pd.read_parquet(file_path, engine='pyarrow', columns=columns,
+                             filters=filters)
+
+    elif file_path.endswith(processed_extensions['feather']):
+        if columns is not None:
+            columns = ['DateTime'] + [col for col in columns
+                                      if col != 'DateTime']
+        df = pd.read_feather(file_path, columns=columns)
+        df = df.set_index('DateTime')
+
+    else:
+        usecols = None
+        if columns is not None:
+            # The index is the first column (named 'DateTime' unless the
+            # dataset index was unnamed when written)
+            header = pd.read_csv(file_path, nrows=0).columns
+            usecols = [header[0]] + [col for col in header[1:]
+                                     if col in columns]
+        # Assert index formatting is ISO8601
+        df = pd.read_csv(file_path, index_col=0, parse_dates=True,
+                         usecols=usecols)
+
+    if start is not None:
+        df = df.loc[start:, :]
+    if end is not None:
+        df = df.loc[:end, :]
+
+    return df
+
+
+def write_partitions(df, dir_path, processed_format='csv'):
+    """Write an SDFS formatted dataset to monthly partition files.
+
+    Partition files are named ``[directory name]_YYYYMM`` followed by the
+    file extension for the indicated format. Partition files from previous
+    runs that are listed in the partition index are removed before writing.
+
+    Args:
+        df (pandas DataFrame):
+            SDFS formatted dataset with a DatetimeIndex.
+        dir_path (str):
+            Full path to the partition directory.
+        processed_format (str, optional):
+            The file format, either ``'csv'``, ``'parquet'``, or
+            ``'feather'``. Defaults to ``'csv'``.
+
+    Returns:
+        None.
+
+    """
+    dir_path = os.path.normpath(dir_path)
+    dir_name = os.path.basename(dir_path)
+    index_path = os.path.join(dir_path, PARTITION_INDEX)
+
+    if not os.path.exists(dir_path):
+        os.makedirs(dir_path)
+
+    # Remove partitions from previous runs
+    if os.path.isfile(index_path):
+        with open(index_path) as file:
+            old_index = json.load(file)
+        for partition in old_index['partitions']:
+            try:
+                os.remove(os.path.join(dir_path, partition['file']))
+            except OSError:
+                pass
+
+    partitions = []
+    for month, month_df in df.groupby(pd.Grouper(freq='MS')):
+        if month_df.empty:
+            continue
+        partition_name = (f'{dir_name}_{month.strftime("%Y%m")}' +
+                          processed_extensions[processed_format])
+        write_dataset_file(month_df, os.path.join(dir_path, partition_name),
+                           processed_format)
+        partitions.append({'file': partition_name,
+                           'start': month_df.index.min().isoformat(),
+                           'end': month_df.index.max().isoformat(),
+                           'rows': month_df.shape[0]})
+
+    index = {'format': processed_format,
+             'columns': list(df.columns),
+             'partitions': partitions,
+             **valid_period(df)}
+
+    with open(index_path, 'w') as file:
+        json.dump(index, file, indent=2)
+
+
+def valid_period(df):
+    """Determine the first and last timestamps of rows in a dataset with at
+    least one non-null value.
+
+    Args:
+        df (pandas DataFrame):
+            SDFS formatted dataset with a DatetimeIndex.
+
+    Returns:
+        period (dict):
+            Dictionary with the ISO8601 formatted first (``'valid_start'``)
+            and last (``'valid_end'``) timestamps. Values are None if all
+            rows are null.
+
+    """
+    valid_idx = df.index[df.notna().any(axis=1).values]
+    if valid_idx.empty:
+        return {'valid_start': None, 'valid_end': None}
+
+    return {'valid_start': valid_idx.min().isoformat(),
+            'valid_end': valid_idx.max().isoformat()}
+
+
+def read_valid_period(file_path, start=None, end=None, columns=None):
+    """Load the first and last timestamps of rows with at least one non-null
+    value in a processed dataset, without reading the dataset.
+
+    Accepts the same arguments as ``read_processed_data()`` and returns the
+    period for the dataset that would be loaded with these arguments. The
+    period can only be determined from the saved period if the full set of
+    columns is loaded and the dataset is not restricted to a period that
+    begins after or ends before the saved period.
+
+    Args:
+        file_path (str):
+            Full path to the processed data file or partition directory.
+        start (str, optional):
+            Timestamp marking the beginning of the period to load. Defaults
+            to None (load from the beginning of the dataset).
+        end (str, optional):
+            Timestamp marking the end of the period to load. Defaults to None
+            (load through the end of the dataset).
+        columns (list, optional):
+            The names of columns to load. Defaults to None (all columns are
+            loaded).
+
+    Returns:
+        period (tuple or None):
+            The first and last timestamps (pandas Timestamps) of rows with at
+            least one non-null value, or None if the period was not saved
+            when the dataset was written (or the dataset has been modified
+            since), all rows are null, or the period cannot be determined
+            without reading the dataset.
+
+    """
+    if columns is not None:
+        return None
+
+    if os.path.isdir(file_path):
+        period_path = os.path.join(file_path, PARTITION_INDEX)
+    else:
+        period_path = file_path + PERIOD_SUFFIX
+
+    try:
+        with open(period_path) as file:
+            period = json.load(file)
+        if not os.path.isdir(file_path):
+            stat = os.stat(file_path)
+            if period['signature'] != [stat.st_size, stat.st_mtime_ns]:
+                return None
+        valid_start = period['valid_start']
+        valid_end = period['valid_end']
+    except (OSError, ValueError, KeyError):
+        return None
+
+    if valid_start is None or valid_end is None:
+        return None
+
+    bounds = pd.DataFrame(index=pd.DatetimeIndex([valid_start, valid_end]))
+    if start is not None:
+        bounds = bounds.loc[start:, :]
+    if end is not None:
+        bounds = bounds.loc[:end, :]
+    if bounds.shape[0] != 2:
+        return None
+
+    return bounds.index[0], bounds.index[1]
+
+
+def read_partitions(dir_path, start=None, end=None, columns=None):
+    """Load an SDFS formatted dataset from monthly partition files.
+
+    Only partitions overlapping with the period between ``start`` and ``end``
+    are read.
+
+    Args:
+        dir_path (str):
+            Full path to the partition directory.
+        start (str, optional):
+            Timestamp marking the beginning of the period to load. Defaults
+            to None (load from the beginning of the dataset).
+        end (str, optional):
+            Timestamp marking the end of the period to load. Defaults to None
+            (load through the end of the dataset).
+        columns (list, optional):
+            The names of columns to load. Defaults to None (all columns are
+            loaded).
+
+    Returns:
+        df (pandas DataFrame):
+            SDFS formatted dataset.
+
+    """
+    with open(os.path.join(dir_path, PARTITION_INDEX)) as file:
+        index = json.load(file)
+
+    df_list = []
+    for partition in index['partitions']:
+        p_start = pd.Timestamp(partition['start'])
+        p_end = pd.Timestamp(partition['end'])
+
+        # Extend the end of the period by one day so that dates without a
+        # time component (e.g., '2021-01-31') include the full day
+        if (start is not None and
+                p_end < match_tz(pd.Timestamp(start), p_end.tz)):
+            continue
+        if (end is not None and
+                p_start >= match_tz(pd.Timestamp(end) + pd.Timedelta('1D'),
+                                    p_start.tz)):
+            continue
+
+        df_list.append(read_processed_data(os.path.join(dir_path,
+                                                        partition['file']),
+                                           start=start, end=end,
+                                           columns=columns))
+
+    if df_list == []:
+        if columns is None:
+            columns = index['columns']
+        return pd.DataFrame(columns=columns,
+                            index=pd.DatetimeIndex([], name='DateTime'))
+
+    # Keep categorical columns categorical across partitions
+    from sensortoolkit.lib_utils import unify_categories
+
+    return pd.concat(unify_categories(df_list))
+
+
+def match_tz(date, tz):
+    """Localize or convert a timestamp to match the indicated time zone.
+
+    Args:
+        date (pandas Timestamp):
+            A timestamp.
+        tz (tzinfo or None):
+            The time zone to match. If None, a tz-naive timestamp is returned.
+
+    Returns:
+        date (pandas Timestamp):
+            Timestamp with time zone matching ``tz``.
+
+    """
+    if tz is not None and date.tzinfo is None:
+        date = date.tz_localize(tz)
+    elif tz is None and date.tzinfo is not None:
+        date = date.tz_convert(None)
+    return date
+
+
+def parquet_date_filters(file_path, start=None, end=None):
+    """Construct row group filters for loading data within a time period.
+
+    Filters are constructed so that the loaded data include at least the
+    indicated period (the end timestamp is extended by one day so that
+    dates without a time component, e.g. ``'2021-01-31'``, include the full
+    day). Datasets are subsequently sliced to the exact period.
+
+    Args:
+        file_path (str):
+            Full path to the parquet file.
+        start (str, optional):
+            Timestamp marking the beginning of the period. Defaults to None.
+        end (str, optional):
+            Timestamp marking the end of the period. Defaults to None.
+
+    Returns:
+        filters (list or None):
+            List of filters passed to ``pandas.read_parquet()``, or None if no
+            period specified.
+
+    """
+    if start is None and end is None:
+        return None
+
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(file_path)
+    if 'DateTime' not in schema.names:
+        return None
+    tz = getattr(schema.field('DateTime').type, 'tz', None)
+
+    filters = []
+    for operator, date, offset in [('>=', start, pd.Timedelta(0)),
+                                   ('<', end, pd.Timedelta('1D'))]:
+        if date is None:
+            continue
+        date = match_tz(pd.Timestamp(date) + offset, tz)
+        filters.append(('DateTime', operator, date))
+
+    return filters
+
+
+def conform_object_columns(df):
+    """Convert object columns containing mixed data types to strings.
+
+    Columnar file formats require a single data type for each column. Object
+    columns containing a mix of text and numeric values (e.g., QAQC flag
+    columns) are converted to strings, null values are preserved. Categorical
+    columns (in compact datasets) with mixed type categories are converted
+    to categoricals of strings.
+
+    Args:
+        df (pandas DataFrame):
+            SDFS formatted dataset.
+
+    Returns:
+        df (pandas DataFrame):
+            Dataset with mixed type object columns converted to strings.
+
+    """
+    mixed_types = ('mixed', 'mixed-integer', 'mixed-integer-float')
+    mixed_cols = [col for col in df.select_dtypes(include='object').columns
+                  if pd.api.types.infer_dtype(df[col], skipna=True)
+                  in mixed_types]
+    mixed_cat_cols = [col for col in df.select_dtypes(include='category').columns
+                      if pd.api.types.infer_dtype(df[col].cat.categories,
+                                                  skipna=True) in mixed_types]
+
+    if mixed_cols or mixed_cat_cols:
+        df = df.copy()
+        for col in mixed_cols:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        for col in mixed_cat_cols:
+            values = df[col].astype(object)
+            values = values.where(values.isna(), values.astype(str))
+            df[col] = values.astype('category')
+
+    return df
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains methods for locating recorded sensor datasets within the
+``..//data//sensor_data//[sensor_name]//raw_data`` directory and sorting files
+by the serial identifier of the sensor unit that recorded each file.
+
+The raw data directory is walked once and each file is assigned to the serial
+identifier found in its file name (if multiple serial identifiers are found,
+e.g., ``'SN1'`` and ``'SN10'`` for the file ``'Sensor_SN10_20210101.csv'``,
+the longest matching identifier is used). The resulting manifest is saved as
+``raw_data_manifest.json`` next to the ``raw_data`` folder and is reused by
+subsequent runs as long as the modification times of the directories within
+``raw_data`` are unchanged.
+
+================================================================================
+
+Created:
+  Sun Oct 18 09:12:40 2026
+Last Updated:
+  Sun Oct 18 09:12:40 2026
+"""
+import os
+import re
+import json
+
+
+def raw_data_manifest(data_path, sensor_serials,
+                      valid_extensions=('.csv', '.txt', '.xlsx')):
+    """Locate recorded data files for each sensor unit in a testing group.
+
+    Args:
+        data_path (str):
+            The full directory path to raw sensor data for a given sensor make
+            and model.
+        sensor_serials (dict):
+            A dictionary of sensor serial identifiers for each unit in a
+            testing group.
+        valid_extensions (tuple, optional):
+            File extensions for recorded sensor datasets. Defaults to
+            ``('.csv', '.txt', '.xlsx')``.
+
+    Returns:
+        (tuple): Two-element tuple containing:
+
+            - **serial_files** (*dict*): Dictionary with sensor serial
+              identifiers as keys and chronologically sorted lists of full
+              paths to the recorded data files for each unit as values.
+            - **file_list** (*list*): The names of all files located within
+              the raw data directory.
+
+    """
+    data_path = os.path.normpath(data_path)
+    manifest_path = os.path.join(os.path.dirname(data_path),
+                                 'raw_data_manifest.json')
+    serials = list(sensor_serials.values())
+    valid_extensions = [ext.lower() for ext in valid_extensions]
+
+    manifest = load_manifest(manifest_path, data_path, serials,
+                             valid_extensions)
+
+    if manifest is None:
+        manifest = build_manifest(data_path, serials, valid_extensions)
+        try:
+            with open(manifest_path, 'w') as file:
+                json.dump(manifest, file, indent=2)
+        except OSError as e:
+            print(f'..unable to save raw data manifest: {e}')
+
+    serial_files = {serial: [os.path.join(data_path, rel_path) for rel_path
+                             in manifest['serial_files'][serial]]
+                    for serial in serials}
+    file_list = [os.path.basename(rel_path) for rel_path
+                 in manifest['file_list']]
+
+    return serial_files, file_list
+
+
+def build_manifest(data_path, serials, valid_extensions):
+    """Walk the raw data directory and construct the serial to file manifest.
+
+    Args:
+        data_path (str):
+            The full directory path to raw sensor data.
+        serials (list):
+            List of sensor serial identifiers.
+        valid_extensions (list):
+            List of lower-cased file extensions for recorded sensor datasets.
+
+    Returns:
+        manifest (dict):
+            Manifest of recorded data files, including the modification time
+            of each directory within the raw data directory (used for
+            determining whether the manifest is stale), the relative path of
+            each file in the raw data directory, and the relative paths of
+            data files assigned to each serial identifier.
+
+    """
+    print('..indexing recorded sensor data files')
+    dir_mtimes = {}
+    file_list = []
+    serial_files = {serial: [] for serial in serials}
+
+    # Check longer serial identifiers first so that files are assigned to the
+    # longest matching identifier
+    match_order = sorted(serials, key=len, reverse=True)
+
+    for path, folders, files in os.walk(data_path):
+        rel_dir = os.path.relpath(path, data_path)
+        dir_mtimes[rel_dir] = os.stat(path).st_mtime_ns
+
+        for filename in files:
+            rel_path = os.path.normpath(os.path.join(rel_dir, filename))
+            file_list.append(rel_path)
+
+            # check the file has one of the listed valid extensions
+            filename_l = filename.lower()
+            if not any(filename_l.endswith(extension) for
+                       extension in valid_extensions):
+                continue
+
+            for serial in match_order:
+                if serial in filename:
+                    serial_files[serial].append(rel_path)
+                    break
+
+    for serial in serial_files:
+        serial_files[serial] = sorted(serial_files[serial], key=natural_key)
+
+    manifest = {'serials': sorted(serials),
+                'valid_extensions': valid_extensions,
+                'dir_mtimes': dir_mtimes,
+                'file_list': file_list,
+                'serial_files': serial_files}
+
+    return manifest
+
+
+def load_manifest(manifest_path, data_path, serials, valid_extensions):
+    """Load a previously saved manifest if it is consistent with the current
+    state of the raw data directory.
+
+    Args:
+        manifest_path (str):
+            Full path to the ``raw_data_manifest.json`` file.
+        data_path (str):
+            The full directory path to raw sensor data.
+        serials (list):
+            List of sensor serial identifiers.
+        valid_extensions (list):
+            List of lower-cased file extensions for recorded sensor datasets.
+
+    Returns:
+        manifest (dict or None):
+            The saved manifest, or None if the manifest does not exist or is
+            out of date (a directory was added, removed, or modified, or the
+            serial identifiers or file extensions differ).
+
+    """
+    if not os.path.isfile(manifest_path):
+        return None
+
+    try:
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if (manifest.get('serials') != sorted(serials) or
+            manifest.get('valid_extensions') != valid_extensions):
+        return None
+
+    # Adding or removing files or folders changes the modification time of the
+    # parent directory
+    for rel_dir, mtime in manifest.get('dir_mtimes', {}).items():
+        try:
+            if os.stat(os.path.join(data_path, rel_dir)).st_mtime_ns != mtime:
+                return None
+        except OSError:
+            return None
+
+    return manifest
+
+
+def natural_key(rel_path):
+    """Sort key that orders integer components of file paths numerically.
+
+    Args:
+        rel_path (str):
+            Relative path to a data file.
+
+    Returns:
+        (list): Path split into text and integer components, e.g.,
+        ``'SN01_2021_1_9.csv'`` is split into
+        ``['sn', 1, '_', 2021, '_', 1, '_', 9, '.csv']``.
+
+    """
+    return [int(text) if text.isdigit() else text.lower()
+            for text in re.split(r'(\d+)', rel_path)]
@@ -63,9 +63,12 @@ Last Updated:
 """
 import os
 import sys
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from sensortoolkit.datetime_utils import sensor_averaging
-from sensortoolkit.ingest import standard_ingest, processed_data_search
+from sensortoolkit.ingest import (standard_ingest, processed_data_search,
+                                  raw_data_manifest, IngestCache, LazyFrames)
 from sensortoolkit.calculate import dewpoint, convert_temp
 
 
@@ -84,6 +87,12 @@ def sensor_import(sensor_name=None, sensor_serials=None,
     and sensor make and model must also be adopted. Files must be type '.csv'
     or '.txt'.
 
+    Files are located with a single pass over the raw data directory by
+    ``raw_data_manifest()``, which assigns each file to the longest serial
+    identifier contained in the file name. The resulting manifest is saved to
+    ``..//data//sensor_data//Sensor_Name//raw_data_manifest.json`` and reused
+    on subsequent runs until folders within the raw data directory change.
+
     Here are two example cases that follow the expected naming scheme:
 
     - **Example 1**:
@@ -207,6 +216,51 @@ def sensor_import(sensor_name=None, sensor_serials=None,
         If not None, ``ingest_wrapper()`` will attempt to import sensor
         data using a passed custom written ingestion module instead of the
         ``standard_ingest()`` method.
+    :param int n_workers:
+        If greater than 1, recorded sensor data files are parsed in parallel
+        across a pool of ``n_workers`` processes, and datasets for each sensor
+        unit are subsequently averaged in parallel by ``sensor_averaging()``.
+        Datasets are returned in the same order and with the same attributes
+        as when files are parsed one at a time. Defaults to None (files are
+        parsed and averaged sequentially). Custom
+        ingestion methods passed via ``ingest_method`` must be defined at the
+        top level of a module so that they can be sent to worker processes,
+        and scripts using this option on Windows or macOS should call
+        ``load_data()`` from within an ``if __name__ == '__main__':`` block.
+    :param int chunksize:
+        If not None, recorded .csv and .txt files are read by
+        ``standard_ingest()`` in chunks of ``chunksize`` rows, and each chunk
+        is converted to SDFS format before the next chunk is read. Use for very
+        large recorded data files so that memory used while parsing is bounded
+        by the chunk size rather than the file size (e.g., ``500000``).
+        Defaults to None (files are read all at once).
+    :param bool ingest_cache:
+        If True, the SDFS formatted dataset for each recorded data file is
+        saved to the ``..//data//sensor_data//Sensor_Name//ingest_cache``
+        directory and reused on subsequent runs. Only files that are new or
+        have changed since the previous run are ingested. Defaults to False.
+    :param str cache_validation:
+        How the ingest cache detects changes to recorded data files, either
+        ``'mtime'`` (file size and modification time) or ``'hash'`` (file
+        size and hash of the file contents). Defaults to ``'mtime'``.
+    :param bool lazy_full_data:
+        If True and loading processed datasets, datasets at the originally
+        recorded sampling frequency are returned in a
+        ``sensortoolkit.ingest.LazyFrames`` container and are only read from
+        file when first accessed. Defaults to False.
+    :param bool keep_full_data:
+        If True, lazily loaded datasets at the originally recorded sampling
+        frequency are kept in memory after they are first accessed. If False,
+        datasets are read from file each time they are accessed. Defaults to
+        True.
+    :param bool compact:
+        If True, the dataset ingested from each recorded data file (or each
+        processed dataset loaded from file) is converted to a memory-compact
+        representation by ``sensortoolkit.lib_utils.compact_dataset()``, which
+        stores text metadata columns as categoricals. Defaults to False.
+    :param bool float32_values:
+        If True and ``compact`` is True, parameter value columns are stored as
+        32-bit floats. Defaults to False.
 
     Returns:
         (tuple): Three-element tuple containing:
@@ -233,42 +287,92 @@ def sensor_import(sensor_name=None, sensor_serials=None,
     ingest_method = kwargs.get('ingest_method', None)
     start = kwargs.get('bdate', None)
     end = kwargs.get('edate', None)
+    n_workers = kwargs.get('n_workers', None)
+    chunksize = kwargs.get('chunksize', None)
+    use_cache = kwargs.get('ingest_cache', False)
+    compact = kwargs.get('compact', False)
+    float32 = kwargs.get('float32_values', False)
+
+    if compact is True:
+        from sensortoolkit.lib_utils import compact_dataset
 
     if load_raw_data is True:
         full_df_list = []
         print('Importing Recorded Sensor Data:')
 
+        # Locate recorded data files for each sensor unit
+        serial_files, file_list = raw_data_manifest(data_path, sensor_serials,
+                                                    valid_extensions)
+
         for serial in sensor_serials.values():
-            sensor_df = pd.DataFrame()
+            # Check if serial ID not found in any file names.
+            if not any(serial in file for file in file_list):
+                console_out = ('Serial ID ' + serial + ' not found in data '
+                               'files:\n' + '\n'.join(file_list))
+                print(console_out)
+
+        # Load datasets for files that are unchanged since the previous run
+        # from the ingest cache
+        file_data = {serial: {} for serial in serial_files}
+        if use_cache:
+            setup_path = os.path.abspath(os.path.join(
+                                data_path, '..', f'{sensor_name}_setup.json'))
+            cache = IngestCache(data_path, setup_path, ingest_method,
+                                validate_by=kwargs.get('cache_validation',
+                                                       'mtime'))
+            for serial, file_paths in serial_files.items():
+                for cwd in file_paths:
+                    df = cache.load(cwd)
+                    if df is not None:
+                        file_data[serial][cwd] = df
+
+        cached_files = {serial: set(file_data[serial]) for serial in file_data}
+        pending_files = {serial: [cwd for cwd in file_paths
+                                  if cwd not in cached_files[serial]]
+                         for serial, file_paths in serial_files.items()}
+
+        # Parse files across a pool of worker processes if requested,
+        # otherwise files are ingested one at a time in the loop below
+        if n_workers is not None and n_workers > 1:
+            pool_data = pooled_ingest(pending_files, sensor_name, data_path,
+                                      ingest_method, n_workers, chunksize)
+            for serial in pending_files:
+                file_data[serial].update(zip(pending_files[serial],
+                                             pool_data[serial]))
+
+        for serial, file_paths in serial_files.items():
+            serial_df_list = []
+            attrs = {}
             print('..' + serial)
 
-            file_list = []
-            for path, folders, files in os.walk(data_path):
-                for filename in files:
-                    filename_l = filename.lower()
-                    # check the file has one of the listed valid extensions
-                    valid_file = any(filename_l.endswith(extension) for
-                                     extension in valid_extensions)
-                    if serial in filename and valid_file:
-                        # Load sensor data and append file datasets
-                        cwd = os.path.join(path, filename)
-                        print('....' + filename)
-                        df = ingest_wrapper(cwd, sensor_name, serial,
-                                            data_path, ingest_method)
+            for cwd in file_paths:
+                # Load sensor data and append file datasets
+                if cwd in cached_files[serial]:
+                    print('....' + os.path.basename(cwd) + ' (cached)')
+                else:
+                    print('....' + os.path.basename(cwd))
 
-                        if df is not None:
-                            sensor_df = sensor_df.append(df)
+                if cwd in file_data[serial]:
+                    df = file_data[serial].pop(cwd)
+                else:
+                    df = ingest_wrapper(cwd, sensor_name, serial,
+                                        data_path, ingest_method, chunksize)
 
-                            if df.attrs != {} and sensor_df.attrs == {}:
-                                sensor_df.attrs = df.attrs
+                if use_cache and cwd not in cached_files[serial]:
+                    cache.store(cwd, df)
 
-                file_list.extend(files)
+                if df is not None:
+                    if compact is True:
+                        df = compact_dataset(df, float32)
+                    serial_df_list.append(df)
 
-            # Check if serial ID not found in any file names.
-            if not any(serial in file for file in file_list):
-                console_out = ('Serial ID ' + serial + ' not found in data '
-                               'files:\n' + '\n'.join(file_list))
-                print(console_out)
+                    if df.attrs != {} and attrs == {}:
+                        attrs = df.attrs
+
+            # Combine file datasets in one pass rather than appending each file
+            # to a growing dataset (which copies the dataset for every file)
+            sensor_df = combine_datasets(serial_df_list)
+            sensor_df.attrs = attrs
 
             if sensor_df.empty:
                 console_out = ('No sensor data files found with the expected'
@@ -277,11 +381,13 @@ def sensor_import(sensor_name=None, sensor_serials=None,
                                ' serial ID. Files must be either .csv or .txt')
                 raise AttributeError(console_out)
 
-            sensor_df = sensor_df.sort_index()
             sensor_df = concat_dataset(data=sensor_df, bdate=start, edate=end)
 
             full_df_list.append(sensor_df)
 
+        if use_cache:
+            cache.save()
+
         data_dict = sensor_averaging(full_df_list,
                                      sensor_serials,
                                      sensor_name,
@@ -294,7 +400,21 @@ def sensor_import(sensor_name=None, sensor_serials=None,
                                           sensor_serials,
                                           **kwargs)
 
+        if compact is True:
+            for interval in data_dict:
+                if isinstance(data_dict[interval], LazyFrames):
+                    data_dict[interval].pipe(compact_dataset, float32)
+                    continue
+                for serial in data_dict[interval]:
+                    data_dict[interval][serial] = compact_dataset(
+                                                   data_dict[interval][serial],
+                                                   float32)
+
     for interval in data_dict:
+        # Datasets that have not been loaded yet are concatenated when loaded
+        if isinstance(data_dict[interval], LazyFrames):
+            data_dict[interval].clip(start, end)
+            continue
         for serial in data_dict[interval]:
             if not data_dict[interval][serial].empty:
                data_dict[interval][serial] =  concat_dataset(
@@ -304,6 +424,51 @@ def sensor_import(sensor_name=None, sensor_serials=None,
     return data_dict
 
 
+def combine_datasets(df_list):
+    """Combine datasets ingested from each recorded data file for a sensor.
+
+    Datasets are concatenated in a single operation and sorted by timestamp.
+    Rows that are exact duplicates of a preceding row (same timestamp and
+    values, e.g., records present in two overlapping data files) are removed.
+    Duplicate timestamps with differing values are retained and subsequently
+    handled by ``sensortoolkit.qc.remove_duplicates()``. Categorical columns
+    (in compact datasets) remain categorical in the combined dataset.
+
+    Args:
+        df_list (list):
+            List of pandas DataFrames ingested from each recorded data file.
+
+    Returns:
+        df (pandas DataFrame):
+            The combined dataset.
+
+    """
+    df_list = [df for df in df_list if not df.empty]
+    if df_list == []:
+        return pd.DataFrame()
+
+    from sensortoolkit.lib_utils import unify_categories
+    df_list = unify_categories(df_list)
+
+    df = pd.concat(df_list)
+    del df_list
+
+    # Stable sort so that entries with the same timestamp retain file order
+    df = df.sort_index(kind='mergesort')
+
+    dup_idx = df.index.duplicated(keep=False)
+    if dup_idx.any():
+        dup_data = df[dup_idx]
+        dup_rows = dup_data.reset_index().duplicated().values
+        if dup_rows.any():
+            drop = np.zeros(df.shape[0], dtype=bool)
+            drop[np.flatnonzero(dup_idx)[dup_rows]] = True
+            df = df[~drop]
+            print(f'....{dup_rows.sum()} duplicate records removed')
+
+    return df
+
+
 def concat_dataset(data, bdate, edate):
     """Concatenate pandas DataFrame with DateTimeIndex to the specified time
     period (bdate, edate).
@@ -324,7 +489,8 @@ def concat_dataset(data, bdate, edate):
     return data
 
 
-def ingest_wrapper(cwd, sensor_name, serial, data_path, ingest_method):
+def ingest_wrapper(cwd, sensor_name, serial, data_path, ingest_method,
+                   chunksize=None):
     """Wrapper for ingestion modules. Selects the ingestion module to convert
     sensor-specific data formatting to SDFS format for analysis.
 
@@ -342,6 +508,9 @@ def ingest_wrapper(cwd, sensor_name, serial, data_path, ingest_method):
             If not None, ``ingest_wrapper()`` will attempt to import sensor
             data using a passed custom written ingestion module instead of the
             ``standard_ingest()`` method.
+        chunksize (int, optional):
+            If not None, recorded data files are read by ``standard_ingest()``
+            in chunks of ``chunksize`` rows. Defaults to None.
 
     Returns:
         pandas DataFrame object:
@@ -354,6 +523,64 @@ def ingest_wrapper(cwd, sensor_name, serial, data_path, ingest_method):
 
     if os.path.exists(setup_path) and ingest_method is None:
         return standard_ingest(cwd, name=sensor_name,
-                               setup_file_path=setup_path)
+                               setup_file_path=setup_path,
+                               chunksize=chunksize)
     else:
         return ingest_method(cwd, serial)
+
+
+def pooled_ingest(serial_files, sensor_name, data_path, ingest_method,
+                  n_workers, chunksize=None):
+    """Ingest recorded sensor data files in parallel across a process pool.
+
+    Each file is parsed independently by ``ingest_wrapper()`` in a worker
+    process. Results are collected in the order that files were submitted so
+    that datasets for each sensor unit are assembled in the same order as the
+    sequential ingestion loop in ``sensor_import()``.
+
+    Args:
+        serial_files (dict):
+            Dictionary with sensor serial identifiers as keys and lists of
+            full paths to the recorded data files for each unit as values.
+        sensor_name (str):
+            The make and model of the sensor.
+        data_path (str):
+            full path to sensor data top directory (contains subdirs for
+            processed and raw data, and the setup.json if configured)
+        ingest_method (function object):
+            If not None, ``ingest_wrapper()`` will attempt to import sensor
+            data using a passed custom written ingestion module instead of the
+            ``standard_ingest()`` method.
+        n_workers (int):
+            The number of worker processes.
+        chunksize (int, optional):
+            If not None, recorded data files are read by ``standard_ingest()``
+            in chunks of ``chunksize`` rows. Defaults to None.
+
+    Returns:
+        pool_data (dict):
+            Dictionary with sensor serial identifiers as keys and lists of
+            ingested datasets (ordered in the same fashion as the file paths in
+            ``serial_files``) as values.
+
+    """
+    tasks = [(serial, cwd) for serial, file_paths in serial_files.items()
+             for cwd in file_paths]
+
+    print(f'..parsing {len(tasks)} files across {n_workers} worker processes')
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        results = executor.map(ingest_wrapper,
+                               [cwd for serial, cwd in tasks],
+                               [sensor_name]*len(tasks),
+                               [serial for serial, cwd in tasks],
+                               [data_path]*len(tasks),
+                               [ingest_method]*len(tasks),
+                               [chunksize]*len(tasks))
+        results = list(results)
+
+    pool_data = {serial: [] for serial in serial_files}
+    for (serial, cwd), df in zip(tasks, results):
+        pool_data[serial].append(df)
+
+    return pool_data
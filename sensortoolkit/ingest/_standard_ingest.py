@@ -15,18 +15,26 @@ Created:
 Last Updated:
   Mon Jul 19 14:03:36 2021
 """
-import os
+import re
 import sys
-import json
 from datetime import datetime
 import pytz
+import numpy as np
 import pandas as pd
-from pandas.errors import EmptyDataError
+from pandas.errors import EmptyDataError, ParserError
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:
+    try:
+        from pandas._libs.tslibs.parsing import guess_datetime_format
+    except ImportError:
+        guess_datetime_format = None
 from sensortoolkit.param import Parameter
 from sensortoolkit.calculate import convert_temp
+from ._ingest_plan import IngestPlan, get_read_dtypes
 import charset_normalizer
 
-def standard_ingest(path, name=None, setup_file_path=None):
+def standard_ingest(path, name=None, setup_file_path=None, chunksize=None):
     """Ingestion module for sensor data using setup.json configuration file
     via the Setup class.
 
@@ -39,6 +47,12 @@ def standard_ingest(path, name=None, setup_file_path=None):
             The make and model of the sensor
         setup_file_path (str):
             The full path to the setup.json file
+        chunksize (int, optional):
+            If not None, .csv and .txt files are read in chunks of
+            ``chunksize`` rows and each chunk is converted to SDFS format
+            before the next chunk is read. Memory used while parsing is
+            bounded by the chunk size rather than the size of the file.
+            Defaults to None (the file is read all at once).
 
     Returns:
         df (pandas DataFrame):
@@ -46,33 +60,30 @@ def standard_ingest(path, name=None, setup_file_path=None):
             datetime index and header naming scheme.
 
     """
-    setup = parse_setup(setup_file_path, data_path=path)
-
-    time_fmt = setup['time_format_dict']
-    idx_list = list(setup['time_format_dict'].keys())
-    idx_format_dict = {col: time_fmt[col]['dt_format'] for col in idx_list}
-    idx_tzone = [time_fmt[col]['dt_timezone'] for col in time_fmt if
-                 time_fmt[col]['dt_timezone'] is not None]
+    plan = IngestPlan.load(setup_file_path)
+    setup = plan.file_setup(path)
     encoding_pred = setup['encoding_prediction']
+    time_zone = setup['time_zone']
+
+    if time_zone is None:
+        print('No time zone specified for datetime index. '
+              'Continuing with tz-naive datetime index.')
+    else:
+        dt = datetime.utcnow()
+        tz = pytz.timezone(time_zone)
+        offset = tz.utcoffset(dt) / pd.to_timedelta('1 hour')
+        print(f'....converting datetime index from {time_zone} (UTC {offset} '
+              'hours) to UTC.')
 
     if setup['file_extension'] in ('.csv', '.txt', '.xlsx'):
         try:
-            names = None
-            row_idx = None
-            if setup['header_iloc'] is None:
-                names = setup['all_col_headers']
-            if setup['data_row_idx'] is not None:
-                row_idx = setup['data_row_idx']
-
             if setup['file_extension'] in ('.csv', '.txt'):
                 try:
-                    df = pd.read_csv(path, header=setup['header_iloc'],
-                                     names=names, skiprows=row_idx,
-                                     encoding=encoding_pred,
-                                     on_bad_lines='warn')
+                    df = read_delimited(path, setup, encoding_pred, time_zone,
+                                        chunksize)
                 except UnicodeDecodeError:
-                    print('\n[WARNING]: Reading the following dataset with uft-8 '
-                          'encoding unsuccessful')
+                    print('\n[WARNING]: Reading the following dataset with '
+                          f'{encoding_pred} encoding unsuccessful')
                     print(path)
                     print('..Attempting to guess encoding')
 
@@ -84,10 +95,9 @@ def standard_ingest(path, name=None, setup_file_path=None):
                     print('')
 
                     try:
-                        df = pd.read_csv(path, header=setup['header_iloc'],
-                                         names=names, skiprows=row_idx,
-                                         encoding=prediction["encoding"],
-                                         on_bad_lines='warn')
+                        df = read_delimited(path, setup,
+                                            prediction["encoding"],
+                                            time_zone, chunksize)
                     except UnicodeError as e:
                         print('Error encountered in file:', path)
                         print(e)
@@ -101,10 +111,16 @@ def standard_ingest(path, name=None, setup_file_path=None):
                               f'unsuccessful for {path}\n')
                         return pd.DataFrame()
 
+                    # Subsequent files for the sensor are read with the
+                    # detected encoding first
+                    plan.detected_encoding = prediction["encoding"]
+
             if setup['file_extension'] == '.xlsx':
                 df = pd.read_excel(path, header=setup['header_iloc'],
-                                   names=names, skiprows=row_idx,
+                                   names=setup['read_names'],
+                                   skiprows=setup['read_skiprows'],
                                    encoding=encoding_pred, on_bad_lines='warn')
+                df = format_dataset(df, setup, time_zone)
 
         except FileNotFoundError as e:
             sys.exit(e)
@@ -116,79 +132,197 @@ def standard_ingest(path, name=None, setup_file_path=None):
         # Put other pandas read functions here
         sys.exit('Invalid data type. Must be either .csv, .txt, or .xlsx')
 
-    # If the header row loads on a row of data (may be intentional if
-    # formatting for first row is unusual and does not follow delimited format).
-    if df.columns.all() != setup['all_col_headers']:
-        df.columns = setup['all_col_headers']
+    return df
 
-    # Drop rows where nans in time stamp entries
-    df = df.loc[df[idx_list].dropna().index, :]
 
-    # Set Datetime Index
-    df['DateTime'] = df[idx_list].astype(str).apply(''.join, axis=1)
-    time_format = ''.join([val for key, val in idx_format_dict.items()])
-    time_zone_list = idx_tzone
-
-    if len(idx_list) > 1 and len(time_zone_list) > 1:
-        # Multiple time-like columns but the specified time zone for each does
-        # not match
-        if len(set(time_zone_list)) > 1:
-            raise ValueError(f'Too many time zones specified for datetime index:'
-                             f' {", ".join(time_zone_list)}. Only one time zone '
-                             'should be specified.')
-        else:
-            time_zone = time_zone_list[0]
+def read_delimited(path, setup, encoding, time_zone, chunksize=None):
+    """Read a comma-separated (.csv or .txt) dataset and convert to SDFS
+    format.
 
-    if len(time_zone_list) == 0:
-        print('No time zone specified for datetime index. '
-              'Continuing with tz-naive datetime index.')
-        time_zone = None
-    else:
-        time_zone = time_zone_list[0]
+    If ``chunksize`` is specified, the dataset is read and converted to SDFS
+    format in chunks of rows, so that only one chunk of recorded text data
+    (and the intermediate copies made during formatting) is held in memory at
+    a time. Formatted chunks are concatenated and sorted by timestamp.
 
-    # Since non-zero padded timestamp formatting depends on the platform, use
-    # the strptime module to parse timestamps into standard formatting
-    if '%-' in time_format or '%#' in time_format:
-        print('..Non-zero padded formatting encountered in timeseries, '
-              'attempting to conform')
-        time_format = time_format.replace('%-', '%').replace('%#', '%')
-        df['DateTime'] = df['DateTime'].apply(
-                                    lambda x: apply_strptime(x, time_format))
+    Args:
+        path (str):
+            The full path to the recorded sensor data file.
+        setup (dict):
+            File-specific formatting configuration returned by
+            ``parse_setup()``.
+        encoding (str):
+            The encoding used to read the file.
+        time_zone (str or None):
+            The time zone of recorded timestamps.
+        chunksize (int, optional):
+            The number of rows per chunk. Defaults to None (the file is read
+            all at once).
 
-        time_format = '%Y-%m-%d %H:%M:%S'
+    Returns:
+        df (pandas DataFrame):
+            Dataframe containing sensor data in standardized formatting for
+            datetime index and header naming scheme.
 
-    # Check whether the timestamp data are in Unix epoch
-    if time_format == 'epoch':
-        unit = 's'
-        time_format = None
-    else:
-        unit = None
+    """
+    columns = setup['read_columns']
 
-    # Convert the DateTime column to time-like data format and set as index
-    # If errors encountered (timestamps cant be parsed), 'raise' will invoke
-    # ValueError and prompt parsing with pandas inferring timestamp format
+    # Read parameter columns as floats. If entries that cannot be converted
+    # are encountered, read again and coerce invalid entries to null.
+    # Malformed or empty files (ParserError and EmptyDataError are subclasses
+    # of ValueError) are not read again.
+    if chunksize is None:
+        try:
+            df = read_csv_columns(path, setup, encoding)
+        except (UnicodeDecodeError, ParserError, EmptyDataError):
+            raise
+        except ValueError:
+            print('..non-numeric entries found in parameter columns, '
+                  'invalid entries will be set null')
+            df = read_csv_columns(path, setup, encoding, numeric=False)
+
+        return format_dataset(df, setup, time_zone, columns=columns)
+
+    # Chunks are read with float parameter columns until a chunk with entries
+    # that cannot be converted is encountered. The file is then read again
+    # with parameter columns read as text (chunks that were already formatted
+    # are skipped) and invalid entries are coerced to null. The epoch unit or
+    # inferred timestamp format determined for the first chunk is used for
+    # all subsequent chunks.
+    df_list = []
+    numeric = True
+    resolved = {}
+    reader = read_csv_columns(path, setup, encoding, chunksize=chunksize)
     try:
-        df['DateTime'] = pd.to_datetime(df['DateTime'],
-                                        format=time_format,
-                                        unit=unit,
-                                        errors='raise')
-    except ValueError:
-        print('\n..timestamp formatting inconsistent with specified format, \n'
-              'proceeding by inferring timestamp format\n')
-        df['DateTime'] = pd.to_datetime(df['DateTime'],
-                                        infer_datetime_format=True,
-                                        errors='coerce')
+        while True:
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                break
+            except (UnicodeDecodeError, ParserError, EmptyDataError):
+                raise
+            except ValueError:
+                if not numeric:
+                    raise
+                print('..non-numeric entries found in parameter columns, '
+                      'invalid entries will be set null')
+                numeric = False
+                reader.close()
+                reader = read_csv_columns(path, setup, encoding,
+                                          numeric=False, chunksize=chunksize)
+                for _ in df_list:
+                    next(reader)
+                continue
+
+            df_list.append(format_dataset(chunk, setup, time_zone,
+                                          columns=columns,
+                                          verbose=(df_list == []),
+                                          resolved=resolved))
+    finally:
+        reader.close()
+
+    if df_list == []:
+        return pd.DataFrame()
+
+    attrs = df_list[0].attrs
+    df = pd.concat(df_list)
+    del df_list
+    df = df.sort_index(ascending=True)
+    df.attrs = attrs
+
+    return df
+
+
+def read_csv_columns(path, setup, encoding, numeric=True, chunksize=None):
+    """Read the columns listed in the setup configuration from a
+    comma-separated (.csv or .txt) dataset.
+
+    Args:
+        path (str):
+            The full path to the recorded sensor data file.
+        setup (dict):
+            File-specific formatting configuration returned by
+            ``parse_setup()``.
+        encoding (str):
+            The encoding used to read the file.
+        numeric (bool, optional):
+            If True, parameter columns are read as floats (a ``ValueError``
+            is raised if entries cannot be converted). If False, parameter
+            columns are read as text. Defaults to True.
+        chunksize (int, optional):
+            The number of rows per chunk. Defaults to None (the file is read
+            all at once).
+
+    Returns:
+        df (pandas DataFrame or pandas TextFileReader):
+            The recorded dataset, or an iterator over chunks of the recorded
+            dataset if ``chunksize`` is specified.
+
+    """
+    if numeric:
+        dtype = setup['read_dtypes']
+    else:
+        dtype = get_read_dtypes(setup, numeric=False)
+
+    return pd.read_csv(path, header=setup['header_iloc'],
+                       names=setup['read_names'],
+                       skiprows=setup['read_skiprows'],
+                       encoding=encoding, on_bad_lines='warn',
+                       usecols=setup['read_usecols'], dtype=dtype,
+                       chunksize=chunksize)
+
+
+def format_dataset(df, setup, time_zone, columns=None, verbose=True,
+                   resolved=None):
+    """Convert a recorded dataset (or a chunk of rows from a recorded dataset)
+    to SDFS format.
+
+    Args:
+        df (pandas DataFrame):
+            Recorded dataset.
+        setup (dict):
+            File-specific formatting configuration returned by
+            ``parse_setup()``.
+        time_zone (str or None):
+            The time zone of recorded timestamps.
+        columns (list, optional):
+            The setup configuration header names for the columns in the
+            recorded dataset. Defaults to None (all columns listed in the
+            setup configuration).
+        verbose (bool, optional):
+            If True, print messages describing formatting steps. Defaults to
+            True (set False for subsequent chunks of a dataset read in
+            chunks).
+        resolved (dict, optional):
+            Timestamp parsing settings resolved for previous chunks of the
+            dataset, passed to ``parse_timestamps()``. Defaults to None.
+
+    Returns:
+        df (pandas DataFrame):
+            Dataframe containing sensor data in standardized formatting for
+            datetime index and header naming scheme.
+
+    """
+    idx_list = list(setup['time_format_dict'].keys())
+
+    if columns is None:
+        columns = setup['all_col_headers']
+
+    # If the header row loads on a row of data (may be intentional if
+    # formatting for first row is unusual and does not follow delimited format).
+    if df.columns.all() != columns:
+        df.columns = columns
 
+    # Drop rows where nans in time stamp entries
+    df = df.loc[df[idx_list].dropna().index, :]
+
+    # Set Datetime Index
+    df['DateTime'] = parse_timestamps(df, idx_list, setup['time_format'],
+                                      verbose, resolved)
 
     df = df.set_index(df['DateTime'])
     df = df.sort_index(ascending=True)
 
     if time_zone is not None:
-        dt = datetime.utcnow()
-        tz = pytz.timezone(time_zone)
-        offset = tz.utcoffset(dt) / pd.to_timedelta('1 hour')
-        print(f'....converting datetime index from {time_zone} (UTC {offset} '
-              'hours) to UTC.')
         # Check if the datetime index is already in UTC (can happen if format
         # was inferred and tzone set UTC)
         try:
@@ -213,9 +347,11 @@ def standard_ingest(path, name=None, setup_file_path=None):
     # Rename parameter header columns
     df = df.rename(columns=setup['col_rename_dict'])
 
-    # Set numeric column types for parameter value columns
+    # Set numeric column types for parameter value columns (if not already
+    # read as numeric)
     for col in setup['col_rename_dict'].values():
-        df[col] = pd.to_numeric(df[col], errors='coerce')
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
 
     # Unit scaling
     for header, conversion in setup['file_unit_scaling'].items():
@@ -244,7 +380,8 @@ def standard_ingest(path, name=None, setup_file_path=None):
 
             scale_factor = conversion
             sdfs_header = setup['col_rename_dict'][header]
-            print(f'....scaling {header} values by {scale_factor}')
+            if verbose:
+                print(f'....scaling {header} values by {scale_factor}')
             df[sdfs_header] = float(scale_factor) * df[sdfs_header]
 
     # Drop unused columns
@@ -295,29 +432,264 @@ def standard_ingest(path, name=None, setup_file_path=None):
 
     return df
 
-def apply_strptime(dt, time_format):
-    """Wrapper for adding exception catching to ``datetime.strptime``
+def parse_timestamps(df, idx_list, time_format, verbose=True, resolved=None):
+    """Convert the timestamp column(s) of a recorded dataset to datetime values.
+
+    Timestamp columns are concatenated with vectorized string operations and
+    parsed in bulk via ``pandas.to_datetime()``. Timestamps recorded with
+    non-zero padded formatting (e.g., ``'%-m/%-d/%Y %-H:%M'``) are zero padded
+    with a regular expression before parsing. If timestamps are inconsistent
+    with the specified format, the format is inferred once from a sample of
+    timestamp entries and applied to the full dataset.
+
+    Timestamps recorded as the number of seconds since the Unix epoch should
+    be indicated by the format ``'epoch'``. The resolution of epoch timestamps
+    (seconds, milliseconds, microseconds, or nanoseconds) is determined from
+    the magnitude of recorded values unless specified explicitly by one of
+    ``'epoch_s'``, ``'epoch_ms'``, ``'epoch_us'``, or ``'epoch_ns'``.
 
-    If ``datetime.strptime`` encounters a value it cannot encode into time-like
-    form, the value is ignored.
+    Datasets read in chunks pass the same ``resolved`` dictionary for each
+    chunk. The epoch unit or inferred timestamp format determined for the
+    first chunk is stored in the dictionary and reused for the remaining
+    chunks, so that all chunks of a file are parsed consistently (and the
+    format is only inferred once).
 
     Args:
-        dt (pandas Series): An array of timestamp entries.
-        time_format (str): The expected format for timestamps.
+        df (pandas DataFrame):
+            Recorded dataset.
+        idx_list (list):
+            The names of the column(s) containing timestamp information.
+        time_format (str):
+            The expected format for timestamps (the concatenation of the format
+            for each timestamp column).
+        verbose (bool, optional):
+            If True, print a message if timestamps are recorded with non-zero
+            padded formatting. Defaults to True.
+        resolved (dict, optional):
+            Timestamp parsing settings resolved for previous chunks of the
+            dataset (keys ``'epoch_unit'`` or ``'inferred_format'``). Updated
+            with the settings resolved for this chunk. Defaults to None.
 
     Returns:
-        dt (pandas Series): A time-casted timestamp value.
+        timestamps (pandas Series):
+            Datetime values for each row of the dataset. Timestamps that could
+            not be parsed are set null (NaT).
 
     """
+    timestamps = df[idx_list[0]].astype(str)
+    for col in idx_list[1:]:
+        timestamps = timestamps + df[col].astype(str)
+
+    # Check whether the timestamp data are in Unix epoch
+    if time_format.startswith('epoch'):
+        values = pd.to_numeric(timestamps, errors='coerce')
+        if values.notna().sum() == 0:
+            return pd.Series(pd.NaT, index=values.index,
+                             dtype='datetime64[ns]')
+        unit = time_format.replace('epoch', '').lstrip('_')
+        if unit == '' and resolved is not None:
+            unit = resolved.get('epoch_unit', '')
+        if unit == '':
+            magnitude = values.abs().max()
+            if magnitude < 1e11:
+                unit = 's'
+            elif magnitude < 1e14:
+                unit = 'ms'
+            elif magnitude < 1e17:
+                unit = 'us'
+            else:
+                unit = 'ns'
+            if resolved is not None:
+                resolved['epoch_unit'] = unit
+        return pd.to_datetime(values, unit=unit, errors='coerce')
+
+    # Since non-zero padded timestamp formatting depends on the platform,
+    # zero pad timestamp entries and parse with the zero padded format
+    if '%-' in time_format or '%#' in time_format:
+        if verbose:
+            print('..Non-zero padded formatting encountered in timeseries, '
+                  'attempting to conform')
+        timestamps, time_format = pad_timestamps(timestamps, time_format)
+
+    # Timestamps for a previous chunk of the dataset were inconsistent with the
+    # specified format, parse with the format inferred for that chunk
+    if resolved is not None and 'inferred_format' in resolved:
+        return to_datetime_inferred(timestamps, resolved['inferred_format'])
+
+    # Convert the DateTime column to time-like data format and set as index
+    # If errors encountered (timestamps cant be parsed), 'raise' will invoke
+    # ValueError and prompt parsing with an inferred timestamp format
     try:
-        dt = datetime.strptime(dt, time_format)
+        timestamps = pd.to_datetime(timestamps,
+                                    format=time_format,
+                                    errors='raise')
     except ValueError:
-        pass
-    return dt
+        print('\n..timestamp formatting inconsistent with specified format, \n'
+              'proceeding by inferring timestamp format\n')
+        inferred_format = infer_timestamp_format(timestamps)
+        if inferred_format is not None:
+            print(f'..inferred timestamp format: {inferred_format}')
+        if resolved is not None:
+            resolved['inferred_format'] = inferred_format
+        timestamps = to_datetime_inferred(timestamps, inferred_format)
+
+    return timestamps
+
+
+def to_datetime_inferred(timestamps, inferred_format):
+    """Parse timestamps with an inferred timestamp format.
+
+    Args:
+        timestamps (pandas Series):
+            Timestamp entries (type str).
+        inferred_format (str or None):
+            The format returned by ``infer_timestamp_format()``. If None, the
+            format is inferred by ``pandas.to_datetime()``.
+
+    Returns:
+        timestamps (pandas Series):
+            Datetime values. Timestamps that could not be parsed are set null
+            (NaT).
+
+    """
+    if inferred_format is not None:
+        return pd.to_datetime(timestamps, format=inferred_format,
+                              errors='coerce')
+
+    return pd.to_datetime(timestamps, infer_datetime_format=True,
+                          errors='coerce')
+
+
+def pad_timestamps(timestamps, time_format):
+    """Zero pad timestamps recorded with non-zero padded formatting.
+
+    A regular expression is constructed from the time format, where each
+    non-zero padded directive (``%-d``, ``%#d``, etc.) matches one or more
+    digits. Matched digits are zero padded via vectorized string operations.
+    Entries that do not match the expected format are left unmodified.
+
+    Args:
+        timestamps (pandas Series):
+            Timestamp entries (type str).
+        time_format (str):
+            The expected format for timestamps, including non-zero padded
+            directives.
+
+    Returns:
+        (tuple): Two-element tuple containing:
+
+            - **timestamps** (*pandas Series*): Zero padded timestamp entries.
+            - **time_format** (*str*): The time format with non-zero padded
+              directives replaced by their zero padded equivalents.
+
+    """
+    # Regular expressions for the digits corresponding to each directive
+    directive_width = {'d': 2, 'm': 2, 'y': 2, 'H': 2, 'I': 2, 'M': 2,
+                       'S': 2, 'j': 3, 'U': 2, 'W': 2}
+    directive_regex = {'Y': r'\d{4}', 'f': r'\d{1,6}', 'p': r'[AaPp][Mm]',
+                       'b': r'[A-Za-z]{3}', 'B': r'[A-Za-z]+',
+                       'a': r'[A-Za-z]{3}', 'A': r'[A-Za-z]+',
+                       'z': r'Z|[+-]\d{2}:?\d{2}', 'Z': r'[A-Za-z]+',
+                       'w': r'\d', '%': '%'}
+
+    tokens = re.findall(r'%[-#]?.|[^%]+', time_format)
+    regex = ''
+    groups = []
+    padded_format = ''
+    for token in tokens:
+        if not token.startswith('%'):
+            regex += re.escape(token)
+            padded_format += token
+            continue
+
+        directive = token[-1]
+        non_padded = len(token) == 3
+        if directive in directive_width:
+            width = directive_width[directive]
+            regex += (f'(\\d{{1,{width}}})' if non_padded
+                      else f'(\\d{{{width}}})')
+            groups.append(width if non_padded else None)
+        elif directive in directive_regex:
+            regex += f'({directive_regex[directive]})'
+            groups.append(None)
+        else:
+            # Unrecognized directive, fall back on inferring the format
+            return timestamps, time_format.replace('%-', '%').replace('%#', '%')
+
+        padded_format += '%' + directive
+
+    parts = timestamps.str.extract('^' + regex + '$')
+    matched = parts.notna().all(axis=1)
+
+    padded = pd.Series('', index=timestamps.index)
+    i = 0
+    for token in tokens:
+        if not token.startswith('%'):
+            padded = padded + token
+            continue
+        part = parts[i].fillna('')
+        if groups[i] is not None:
+            part = part.str.zfill(groups[i])
+        padded = padded + part
+        i += 1
+
+    timestamps = padded.where(matched, timestamps)
+
+    return timestamps, padded_format
+
+
+def infer_timestamp_format(timestamps, n_samples=5):
+    """Infer the format of timestamp entries from a sample of the dataset.
+
+    Formats are guessed from timestamp entries spaced evenly throughout the
+    dataset. The first guessed format that is able to parse all of the sampled
+    entries is returned.
+
+    Args:
+        timestamps (pandas Series):
+            Timestamp entries (type str).
+        n_samples (int, optional):
+            The number of timestamp entries to sample. Defaults to 5.
+
+    Returns:
+        time_format (str or None):
+            The inferred timestamp format, or None if a consistent format could
+            not be determined (or format guessing is not supported by the
+            installed version of pandas).
+
+    """
+    if guess_datetime_format is None:
+        return None
+
+    values = timestamps.dropna()
+    values = values[values.str.strip() != '']
+    if values.empty:
+        return None
+
+    sample_idx = np.unique(np.linspace(0, len(values) - 1, n_samples,
+                                       dtype=int))
+    sample = values.iloc[sample_idx]
+
+    for value in sample:
+        time_format = guess_datetime_format(value)
+        if time_format is None:
+            continue
+        try:
+            pd.to_datetime(sample, format=time_format, errors='raise')
+        except ValueError:
+            continue
+        return time_format
+
+    return None
+
 
 def parse_setup(setup_path, data_path):
     """Construct file-specific setup file from the setup.json.
 
+    The setup.json is compiled into an ``IngestPlan`` once and cached, so that
+    the settings for each data file are looked up rather than re-parsed. The
+    plan is recompiled if the setup.json file is modified.
+
     Args:
         setup_path (str):
             Path to the setup.json file for ingesting datasets into SDFS format.
@@ -336,107 +708,6 @@ def parse_setup(setup_path, data_path):
             corresponding to the file into SDFS format.
 
     """
-    # Ensure norm path
-    data_path = os.path.normpath(data_path)
-
-    with open(setup_path) as file:
-        setup = json.load(file)
-        file.close()
-
-    file_col_list = []
-    file_drop_cols = []
-    file_col_headers = {}
-    file_dt_headers = {}
-    file_col_renaming = {}
-    file_sdfs_headers = []
-    file_unit_scaling = {}
-
-    file_list = [os.path.normpath(file) for file in setup['file_list']]
-    file_idx = file_list.index(os.path.normpath(data_path))
-    # Either reference or sensor
-    # data_type = setup['data_type']
-
-    # Parse setup.json for data file specific header names
-    for col_idx in setup['col_headers']:
-        # config within the ith column index (i ranging from 0 to N-1 where
-        # N is the number of columns in the dataset)
-        col_idx_config = setup['col_headers'][col_idx]
-        col_idx_headers = list(col_idx_config.keys())
-
-        # Loop over header configs within the ith column index
-        for header in col_idx_headers:
-            # Create list of data files containing the current header
-            header_file_list = [file_list[i] for i in
-                                col_idx_config[header]['in_file_list_idx']]
-            header_file_list = [os.path.normpath(path) for path in
-                                header_file_list]
-
-            # Add file dataset info if passed filename contains the current
-            # header
-            if data_path in header_file_list:
-                file_col_list.append(header)
-
-                header_config = col_idx_config[header]
-                file_col_headers[header] = header_config
-
-                if header_config['drop'] is True:
-                    file_drop_cols.append(header)
-                else:
-                    # Add datetime index column info
-                    if header_config['header_class'] == 'datetime':
-                        file_dt_headers[header] = header_config
-                    # Add parameter column info
-                    if header_config['header_class'] == 'parameter':
-                        sdfs_param = header_config['sdfs_param']
-
-                        file_col_renaming[header] = header_config['sdfs_param'] + '_Value'
-
-                        file_sdfs_headers.append(sdfs_param)
-
-                        if ('unit_transform' in header_config and
-                        header_config['unit_transform'] is not None):
-                            file_unit_scaling[header] = header_config['unit_transform']
-
-    col_list = ['name', 'path', 'file_extension', 'header_iloc']
-    file_setup = {col: setup[col] for col in col_list if col in setup}
-    file_setup['all_col_headers'] = file_col_list
-    file_setup['col_rename_dict'] = file_col_renaming
-    file_setup['drop_cols'] = file_drop_cols
-    file_setup['time_format_dict'] = file_dt_headers
-    file_setup['sdfs_header_names'] = file_sdfs_headers
-    file_setup['file_unit_scaling'] = file_unit_scaling
-
-    # Reference only: add parameter metadata columns
-    for param in file_sdfs_headers:
-        param_cols = ['_Unit', '_Param_Code', '_Method_Code', '_Method',
-                      '_Method_POC']
-
-        for col in param_cols:
-            header = param + col
-            if header in setup:
-                file_setup[header] = setup[header]
-
-    # Reference only: add site metadata columns
-    site_cols = ['site_name', 'agency', 'site_aqs', 'site_lat', 'site_lon']
-    for col in site_cols:
-        if col in setup:
-            file_setup[col] = setup[col]
-
-    try:
-        file_setup['data_row_idx'] = setup['data_row_idx']
-    except KeyError:
-        file_setup['data_row_idx'] = None
+    plan = IngestPlan.load(setup_path)
 
-    try:
-        file_setup['data_source'] = setup['dataset_kwargs']['ref_data_source']
-    except KeyError:
-        pass
-
-    # default encoding prediction
-    file_setup['encoding_prediction'] = 'utf-8'
-    # pass on any predictions indicated by chardet in setup
-    if 'encoding_predictions' in setup:
-        if file_idx in list(int(key) for key in setup['encoding_predictions'].keys()):
-            file_setup['encoding_prediction'] = setup['encoding_predictions'][str(file_idx)]
-
-    return file_setup
+    return plan.file_setup(data_path)
@@ -23,5 +23,7 @@ from ._copy_datasets import copy_datasets, _prompt_directory
 from ._sensor_subfolders import create_sensor_directories
 from ._flatten_list import flatten_list
 from ._flatten_datasets import flatten_datasets
+from ._compact_datasets import (compact_dataset, unify_categories,
+                               memory_report)
 from ._setup import SensorSetup
 from ._setup import ReferenceSetup
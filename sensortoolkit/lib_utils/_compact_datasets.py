@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains methods for converting SDFS datasets to a memory-compact
+representation and for reporting the memory used by datasets.
+
+SDFS datasets repeat metadata text (e.g., ``PM25_Unit``, ``PM25_Method``,
+``Site_Name``, ``Agency``, ``Data_Source``, ``PM25_QAQC_Code``) on every row.
+Compact datasets store these columns as pandas categoricals, which hold each
+unique value once alongside a small integer code for each row. Parameter value
+columns (``*_Value``) may optionally be stored as 32-bit floats, halving the
+memory used by measurement data at the cost of precision beyond ~7
+significant digits.
+
+================================================================================
+
+Created:
+  Sun Oct 18 17:02:36 2026
+Last Updated:
+  Sun Oct 18 17:02:36 2026
+"""
+import numpy as np
+import pandas as pd
+
+
+def compact_dataset(df, float32=False):
+    """Convert an SDFS dataset to a memory-compact representation.
+
+    Text (object or string typed) columns with repeated values (the number of
+    unique values is at most half the number of rows) are converted to
+    categoricals.
+
+    Args:
+        df (pandas DataFrame):
+            SDFS formatted dataset.
+        float32 (bool, optional):
+            If True, parameter value columns (``*_Value``) are converted to
+            32-bit floats. Defaults to False.
+
+    Returns:
+        df (pandas DataFrame):
+            Compact dataset. The passed dataset is not modified.
+
+    """
+    if df is None or df.empty:
+        return df
+
+    n_rows = df.shape[0]
+    converted = {}
+    for col in dict.fromkeys(df.columns):
+        if not isinstance(df[col], pd.Series):
+            # Skip duplicated column names
+            continue
+        series = df[col]
+
+        # Text columns may be object or (pandas 2.0+) string typed, columns
+        # that are already categorical are left unchanged
+        is_text = (pd.api.types.is_object_dtype(series) or
+                   pd.api.types.is_string_dtype(series))
+        if is_text and not isinstance(series.dtype, pd.CategoricalDtype):
+            if series.nunique(dropna=True) <= max(1, n_rows // 2):
+                converted[col] = series.astype('category')
+
+        elif (float32 and str(col).endswith('_Value') and
+              pd.api.types.is_float_dtype(series) and
+              series.dtype != np.float32):
+            converted[col] = series.astype(np.float32)
+
+    if converted:
+        # Shallow copy so that the passed dataset is not modified
+        df = df.copy(deep=False)
+        for col, series in converted.items():
+            df[col] = series
+
+    return df
+
+
+def unify_categories(df_list):
+    """Assign the same categories to categorical columns in datasets that are
+    to be concatenated.
+
+    Categorical columns are only concatenated as categoricals by pandas if the
+    categories are identical in all datasets, otherwise columns are converted
+    to object type. Columns that are categorical in any of the passed datasets
+    are converted to categoricals with the union of categories across all
+    datasets.
+
+    Args:
+        df_list (list):
+            List of pandas DataFrames.
+
+    Returns:
+        df_list (list):
+            List of pandas DataFrames with matching categorical columns. The
+            passed datasets are not modified.
+
+    """
+    cat_cols = dict.fromkeys(col for df in df_list
+                             for col in df.select_dtypes('category').columns)
+
+    for col in cat_cols:
+        dtypes = [df[col].dtype for df in df_list if col in df]
+        if all(dtype == dtypes[0] for dtype in dtypes):
+            continue
+
+        categories = pd.api.types.union_categoricals(
+                            [pd.Categorical(df[col]) for df in df_list
+                             if col in df], ignore_order=True).categories
+        dtype = pd.CategoricalDtype(categories)
+
+        df_list = [df.assign(**{col: df[col].astype(dtype)})
+                   if col in df else df for df in df_list]
+
+    return df_list
+
+
+def memory_report(data_dict, name=None):
+    """Report the memory used by datasets in a data dictionary.
+
+    Args:
+        data_dict (dict):
+            Nested dictionary of datasets, e.g., ``AirSensor.data``
+            (``{interval: {serial: df}}``) or ``ReferenceMonitor.data``
+            (``{classifier: {interval: df}}``). Datasets that have not been
+            loaded from a ``sensortoolkit.ingest.LazyFrames`` container are
+            not included.
+        name (str, optional):
+            Name printed in the report heading (e.g., the sensor name).
+            Defaults to None.
+
+    Returns:
+        report (pandas DataFrame):
+            The number of rows and columns and the memory usage (MiB) of each
+            dataset, indexed by the dictionary keys.
+
+    """
+    from sensortoolkit.ingest import LazyFrames
+
+    records = []
+    for group, group_data in data_dict.items():
+        if isinstance(group_data, pd.DataFrame):
+            group_data = {'': group_data}
+        # Only report datasets that have been loaded
+        if isinstance(group_data, LazyFrames):
+            group_data = group_data.loaded()
+        for key, df in group_data.items():
+            if not isinstance(df, pd.DataFrame):
+                continue
+            records.append({'group': group,
+                            'key': key,
+                            'rows': df.shape[0],
+                            'columns': df.shape[1],
+                            'MiB': df.memory_usage(deep=True).sum() / 2**20})
+
+    report = pd.DataFrame(records, columns=['group', 'key', 'rows',
+                                            'columns', 'MiB'])
+    report = report.set_index(['group', 'key'])
+
+    heading = 'Memory usage'
+    if name is not None:
+        heading += f' for {name}'
+    print(f'{heading}: {report["MiB"].sum():.1f} MiB')
+    for group, group_report in report.groupby(level='group', sort=False):
+        print(f'..{group}: {group_report["MiB"].sum():.1f} MiB '
+              f'({group_report["rows"].sum()} rows)')
+
+    return report
@@ -80,8 +80,17 @@ def flatten_datasets(AirSensor, ReferenceMonitor, verbose=True, include_units=Tr
                                       in ref_df.columns if '_Value' in param]
 
                     source = site_info.Data_Source.dropna().unique()[0]
+                    # Datasets are joined column-wise (sensor and reference
+                    # columns have unique suffixes), so categorical columns in
+                    # compact datasets are retained without unifying
+                    # categories. Keep data source columns categorical as well.
+                    compact = isinstance(site_info.Data_Source.dtype,
+                                         pd.CategoricalDtype)
                     for param in param_ref_cols:
                         ref_df[f'{param}_Data_Source'] = source
+                        if compact:
+                            ref_df[f'{param}_Data_Source'] = ref_df[
+                                f'{param}_Data_Source'].astype('category')
 
 
                     if (interval != '1-minute'):
@@ -35,7 +35,7 @@ from pytz.exceptions import UnknownTimeZoneError
 from sensortoolkit.lib_utils import (flatten_list, validate_entry,
                                      enter_continue, copy_datasets)
 from sensortoolkit.param import Parameter
-from sensortoolkit.reference import preprocess_airnowtech
+from sensortoolkit.reference import preprocess_airnowtech, method_table
 from sensortoolkit.ingest import standard_ingest
 from sensortoolkit.datetime_utils import (interval_averaging,
                                           get_timestamp_interval)
@@ -1312,12 +1312,6 @@ class ReferenceSetup(_Setup):
             Defaults to None.
 
     """
-    # Method code lookup tables
-    criteria_methods_path = os.path.abspath(os.path.join(__file__, '..', '..',
-                                            'reference', 'method_codes',
-                                            'methods_criteria.csv'))
-    criteria_lookup = pd.read_csv(criteria_methods_path)
-
     critera_params = {'CO': 'Carbon monoxide',
                       'Pb_TSP': 'Lead (TSP) LC',
                       'Pb_PM10': 'Lead PM10 LC FRM/FEM',
@@ -1329,10 +1323,14 @@ class ReferenceSetup(_Setup):
 
     api_services = ['aqs', 'airnow']
 
-    met_methods_path = os.path.abspath(os.path.join(__file__, '..', '..',
-                                            'reference', 'method_codes',
-                                            'methods_met.csv'))
-    met_lookup = pd.read_csv(met_methods_path)
+    # Method code lookup tables (loaded when first used)
+    @property
+    def criteria_lookup(self):
+        return method_table('criteria')
+
+    @property
+    def met_lookup(self):
+        return method_table('met')
 
     def __init__(self, path):
 
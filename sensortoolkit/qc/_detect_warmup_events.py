@@ -18,36 +18,64 @@ import numpy as np
 
 def warmup_incidents(data, param, interval=None, warmup_duration=None,
                      invalidate=False):
-    """
+    """Flag data points recorded while sensors warm up after interruptions
+    in recording.
+
+    A warm-up event begins at the first timestamp following a gap in recorded
+    (non-null) parameter values, i.e., where the time between consecutive
+    values differs from the recording interval. Data points recorded within
+    ``warmup_duration`` of the start of each event are flagged 'WarmUp'.
 
+    Events are located for all rows at once: the position of the start of
+    the event for each row is found with a cumulative maximum over the
+    positions of event start rows, and rows are flagged by comparing the
+    offset from the event start with the warm-up duration.
 
     Args:
-        data (pandas DataFrame object): DESCRIPTION.
-        param (str): DESCRIPTION.
-        interval (str, optional): DESCRIPTION. Defaults to None.
-        warmup_duration (str, optional): DESCRIPTION. Defaults to None.
-        invalidate (bool, optional): DESCRIPTION. Defaults to False.
+        data (pandas DataFrame object, list, or dict):
+            Sensor dataset with a DatetimeIndex, or a list or dictionary of
+            sensor datasets (e.g., one for each sensor unit, such as
+            ``AirSensor.data['1-minute']``).
+        param (str):
+            The name of the parameter to check for warm-up periods.
+        interval (str, optional):
+            The recording interval of the dataset(s), e.g., ``'1-minute'``.
+            Defaults to None.
+        warmup_duration (str, optional):
+            The duration of the warm-up period following each event, e.g.,
+            ``'10 minutes'``. Defaults to None.
+        invalidate (bool, optional):
+            If True, flagged values are set null (np.nan). Defaults to False.
 
     Raises:
-        KeyError: DESCRIPTION.
+        KeyError: If the passed dataset does not have a "DateTime" index.
 
     Returns:
-        TYPE: DESCRIPTION.
+        data (pandas DataFrame object, list, or dict):
+            Modified dataset(s) with the ``[param]_QAQC_Code`` column set to
+            'WarmUp' for flagged data points (and null for other data points).
 
     """
+    if isinstance(data, dict):
+        return {key: warmup_incidents(df, param, interval, warmup_duration,
+                                      invalidate)
+                for key, df in data.items()}
+    if isinstance(data, list):
+        return [warmup_incidents(df, param, interval, warmup_duration,
+                                 invalidate)
+                for df in data]
+
     passed_dataframe = data
-    data = data[f'{param}_Value'].dropna()
-    if data.dropna().empty:
+    values = data[f'{param}_Value']
+    valid = values.notna().to_numpy()
+    if not valid.any():
         return {}
 
-    if isinstance(data.index, pd.core.indexes.datetimes.DatetimeIndex):
-        idx_name = data.index.name
-        data = data.reset_index()
-        if idx_name != 'DateTime':
-            data = data.rename(columns={idx_name: 'DateTime'})
-
-    if 'DateTime' not in data:
-        raise KeyError('"DateTime" timestamp column not found in index')
+    timestamps = data.index
+    if not isinstance(timestamps, pd.core.indexes.datetimes.DatetimeIndex):
+        if 'DateTime' not in data:
+            raise KeyError('"DateTime" timestamp column not found in index')
+        timestamps = pd.DatetimeIndex(data['DateTime'])
 
     # Hyphens (like the hyphen in "1-minute") can cause pandas' to_timedelta()
     # function to interpret input as negative timedelta value. Remove hyphens
@@ -55,39 +83,35 @@ def warmup_incidents(data, param, interval=None, warmup_duration=None,
     interval = interval.replace('-', ' ')
     interval = pd.to_timedelta(interval)
 
-    data['value_grp'] = (data.DateTime.diff(1)!= interval
-                              ).astype('int').cumsum()
+    # Compare timestamps as nanosecond integers (the unit of pandas
+    # Timedelta values), regardless of the resolution of the index
+    times = timestamps[valid].values.astype('datetime64[ns]').view('i8')
+    n_values = len(times)
 
-    data = data.set_index(data.DateTime)
+    # Events begin at the first value and where the time since the previous
+    # value differs from the recording interval
+    event_start = np.ones(n_values, dtype=bool)
+    event_start[1:] = np.diff(times) != interval.value
 
-
-    n_warmups = len(data.value_grp.dropna().unique())
+    n_warmups = int(event_start.sum())
     print(f'{n_warmups} warmup events detected')
 
+    # Position of the start of the event for each value
+    start_pos = np.maximum.accumulate(np.where(event_start,
+                                               np.arange(n_values), 0))
+    offset = times - times[start_pos]
+
     invalidate_duration = pd.to_timedelta(warmup_duration)
-    data = data.groupby('value_grp').apply(lambda x:
-                                            write_warmup_code(x, param,
-                                                              invalidate_duration))
+    warmup = (offset >= 0) & (offset <= invalidate_duration.value)
 
-    data = data.drop(columns=['DateTime', 'value_grp'])
+    flag = np.zeros(len(valid), dtype=bool)
+    flag[np.flatnonzero(valid)[warmup]] = True
 
-    if invalidate:
-        invalid_idx = data[data[f'{param}_QAQC_Code']=='WarmUp'].index
-        data.loc[invalid_idx, f'{param}_Value'] = np.nan
+    qaqc_codes = np.full(len(valid), np.nan, dtype=object)
+    qaqc_codes[flag] = 'WarmUp'
+    passed_dataframe[f'{param}_QAQC_Code'] = qaqc_codes
 
-    passed_dataframe[[f'{param}_Value', f'{param}_QAQC_Code']] = data
+    if invalidate:
+        passed_dataframe.loc[flag, f'{param}_Value'] = np.nan
 
     return passed_dataframe
-
-
-def write_warmup_code(series, param, invalidate_duration):
-    i = series.value_grp.unique()[0]
-
-    if i % 1000 == 0:
-        print(f'..{i}')
-
-    idx_min = series.index.min()
-    idx_max = idx_min + invalidate_duration
-    series.loc[idx_min:idx_max, f'{param}_QAQC_Code'] = 'WarmUp'
-
-    return series
@@ -45,8 +45,10 @@ def remove_duplicates(full_df, agg_numeric_by='mean', agg_object_by='first',
         col_order = list(full_df.columns)
         original_df_len = full_df.shape[0]
 
-        obj_df = full_df.select_dtypes(include=['object', 'datetime'])
-        num_df = full_df.select_dtypes(exclude=['object', 'datetime'])
+        obj_df = full_df.select_dtypes(include=['object', 'category',
+                                                'datetime'])
+        num_df = full_df.select_dtypes(exclude=['object', 'category',
+                                                'datetime'])
 
         num_df = num_df.groupby(num_df.index).agg(agg_numeric_by)
         obj_df = obj_df.groupby(obj_df.index).agg(agg_object_by)
@@ -15,7 +15,6 @@ Created:
 Last Updated:
   Tue Aug 17 15:29:14 2021
 """
-import statsmodels.api as sm
 import pandas as pd
 import numpy as np
 
@@ -39,6 +38,10 @@ def cooks_outlier_detection(hourly_df_list, hourly_ref_df, param, serials,
     are identified by Cook’s distance as potential outliers and exceed the
     AD and PD thresholds are set to null.
 
+    Cook's distance is computed for all sensors at once from the closed-form
+    expressions for simple (one variable) ordinary least squares regression
+    of sensor vs. reference measurements (see ``cooks_distance()``).
+
     Args:
         hourly_df_list (list):
             List of sensor datasets at 1-hour averaged intervals.
@@ -59,61 +62,142 @@ def cooks_outlier_detection(hourly_df_list, hourly_ref_df, param, serials,
             A list of modified sensor datasets.
 
     """
+    if hourly_df_list == []:
+        return hourly_df_list
+
+    ref_values = hourly_ref_df[param + '_Value']
+
+    # Sensor data paired with reference data (timestamps without reference
+    # data do not form data pairs and are not evaluated)
+    xdata = ref_values.to_numpy(dtype=float)
+    ydata = np.column_stack([sensor_df[param + '_Value'].reindex(
+                                ref_values.index).to_numpy(dtype=float)
+                             for sensor_df in hourly_df_list])
+    if ydata.size == 0:
+        ydata = np.empty((len(xdata), len(hourly_df_list)))
+
+    cooks = cooks_distance(xdata, ydata)
+
+    # Thresholds for flagging data points (computed for data pairs)
+    abs_diff = np.abs(ydata - xdata[:, np.newaxis])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p_diff = 2*abs_diff / (ydata + xdata[:, np.newaxis])
+    pairs = ~np.isnan(abs_diff)
+
+    n_obs = pairs.sum(axis=0)
+    with np.errstate(divide='ignore'):
+        thres = 4 / n_obs
 
     for i, (serial, sensor_df) in enumerate(zip(serials.values(),
                                                 hourly_df_list)):
         print('Flagged timestamps for', serial)
-        xdata = hourly_ref_df[param + '_Value']
-        ydata = sensor_df[param + '_Value']
-        df = pd.DataFrame({'x': xdata, 'y': ydata}).dropna()
-
-        n_obs = df.shape[0]
-        thres = (4 / n_obs)
-
-        # Compute OLS regression for sensor vs. reference
-        x = df['x']
-        y = df['y']
-        x = sm.add_constant(x)
-        model = sm.OLS(y, x).fit()
-
-        # Compute cooks distance for ref vs. average sensor conc.
-        infl = model.get_influence()
-        cooks = infl.cooks_distance
-        cooks_df = pd.DataFrame({'distance': cooks[0],
-                                 'p_val': cooks[1]})
-        outliers = cooks_df[cooks_df.distance > thres]
-
-        # Outlier timestamps
-        outlier_times = df.index[outliers.index]
-
-        # Thresholds for flagging data points
-        abs_diff = abs(sensor_df[param + '_Value'] -
-                       hourly_ref_df[param + '_Value'])
-        abs_diff_thres = abs_diff.median() + 2*abs_diff.std()
-
-        p_diff = 2*abs_diff / (sensor_df[param + '_Value'] +
-                               hourly_ref_df[param + '_Value'])
-        p_diff_thres = p_diff.median() + 2*p_diff.std()
 
-        # Create a column for flagging data points
-        if param + '_QAQC_Code' not in sensor_df:
-            sensor_df.loc[:, param + '_QAQC_Code'] = np.nan
+        abs_diff_thres = median_plus_two_sd(abs_diff[pairs[:, i], i])
+        p_diff_thres = median_plus_two_sd(p_diff[pairs[:, i], i])
+
         # Ensure that outlier times exceeding cooks thres. justify flagging
         # by exceeding thresholds for abs diff and percent diff
-        flag_count = 0
-        for time in outlier_times:
-            if (abs_diff[time] > abs_diff_thres and
-               p_diff[time] > p_diff_thres):
-                # TODO: Temporary flag assignment. Need to consult QC flag
-                # template
-                sensor_df.loc[time, param + '_QAQC_Code'] = 3
-                if invalidate:
-                    sensor_df.loc[time, param + '_Value'] = np.nan
-                print('..' + str(time))
-                flag_count += 1
-        if flag_count == 0:
+        with np.errstate(invalid='ignore'):
+            flag = ((cooks[:, i] > thres[i]) &
+                    (abs_diff[:, i] > abs_diff_thres) &
+                    (p_diff[:, i] > p_diff_thres))
+        flag_times = ref_values.index[flag]
+
+        # Create a column for flagging data points
+        flag_col = param + '_QAQC_Code'
+        if flag_col not in sensor_df:
+            sensor_df.loc[:, flag_col] = np.nan
+
+        if flag_times.empty:
             print('..No data points flagged')
+        else:
+            if isinstance(sensor_df[flag_col].dtype, pd.CategoricalDtype):
+                if 3 not in sensor_df[flag_col].cat.categories:
+                    sensor_df[flag_col] = sensor_df[flag_col].cat.add_categories(3)
+            # TODO: Temporary flag assignment. Need to consult QC flag
+            # template
+            sensor_df.loc[flag_times, flag_col] = 3
+            if invalidate:
+                sensor_df.loc[flag_times, param + '_Value'] = np.nan
+            for time in flag_times:
+                print('..' + str(time))
 
         hourly_df_list[i] = sensor_df
 
     return hourly_df_list
+
+
+def cooks_distance(x, y):
+    """Compute Cook's distance for the simple linear regression of each
+    column of ``y`` against ``x``.
+
+    For the ordinary least squares fit :math:`y = b_0 + b_1 x` with
+    :math:`n` data pairs, the leverage of each data pair is
+
+    .. math::
+
+        h_i = \\frac{1}{n} + \\frac{(x_i - \\bar{x})^2}{\\sum_j (x_j -
+        \\bar{x})^2}
+
+    and Cook's distance is
+
+    .. math::
+
+        D_i = \\frac{e_i^2}{p\\,s^2}\\frac{h_i}{(1 - h_i)^2}
+
+    where :math:`e_i` is the residual, :math:`p = 2` is the number of model
+    parameters, and :math:`s^2` is the residual mean square error. Only data
+    pairs where both values are non-null are included in each regression.
+
+    Args:
+        x (numpy array):
+            Independent variable (reference measurements), shape (n,).
+        y (numpy array):
+            Dependent variable (sensor measurements) for each regression,
+            shape (n, m).
+
+    Returns:
+        cooks (numpy array):
+            Cook's distance for each data pair, shape (n, m). Null for
+            entries that are not data pairs.
+
+    """
+    x = np.asarray(x, dtype=float)[:, np.newaxis]
+    y = np.asarray(y, dtype=float)
+
+    pairs = np.isfinite(x) & np.isfinite(y)
+    x = np.where(pairs, x, 0.0)
+    y = np.where(pairs, y, 0.0)
+    n_obs = pairs.sum(axis=0)
+    n_params = 2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = x.sum(axis=0) / n_obs
+        y_mean = y.sum(axis=0) / n_obs
+        x_dev = np.where(pairs, x - x_mean, 0.0)
+        y_dev = np.where(pairs, y - y_mean, 0.0)
+
+        sxx = (x_dev**2).sum(axis=0)
+        slope = (x_dev*y_dev).sum(axis=0) / sxx
+        resid = np.where(pairs, y_dev - slope*x_dev, 0.0)
+        mse = (resid**2).sum(axis=0) / (n_obs - n_params)
+
+        leverage = 1 / n_obs + x_dev**2 / sxx
+        cooks = (resid**2 / (n_params*mse)) * leverage / (1 - leverage)**2
+
+    return np.where(pairs, cooks, np.nan)
+
+
+def median_plus_two_sd(values):
+    """Compute the median plus twice the (sample) standard deviation.
+
+    Args:
+        values (numpy array):
+            Values (null values excluded).
+
+    Returns:
+        float: The median plus twice the standard deviation.
+
+    """
+    values = pd.Series(values)
+    return values.median() + 2*values.std()
@@ -25,11 +25,19 @@ def persistent_values(df, param, tolerance=3, freq='H', invalidate=False):
     (N is the integer value set for the tolerance).
     If invalidate is true, corresponding values will be set null (np.nan).
 
+    Repeated values are located by run-length encoding each parameter column
+    in a single pass: consecutive entries with the same value are assigned the
+    same run identifier, and all entries in runs with a length of at least N
+    are flagged. Null values are not flagged and interrupt runs of repeated
+    values.
+
     Args:
-        df (pandas DataFrame):
-            Dataset containing parameter data to check for repeating values.
-        param (str):
-            The name of the parameter to check for repeating values.
+        df (pandas DataFrame or list of pandas DataFrames):
+            Dataset (or list of datasets, e.g., one for each sensor unit)
+            containing parameter data to check for repeating values.
+        param (str or list):
+            The name of the parameter (or list of parameters) to check for
+            repeating values.
         tolerance (int, optional):
             The number of consecutive entries for repeated/persistent values
             required to flag a data point. Defaults to 3.
@@ -43,37 +51,69 @@ def persistent_values(df, param, tolerance=3, freq='H', invalidate=False):
             False.
 
     Returns:
-        df (pandas DataFrame):
-            Modified dataset with flagged entries for repeated data entries.
+        df (pandas DataFrame or list of pandas DataFrames):
+            Modified dataset (or list of datasets) with flagged entries for
+            repeated data entries.
 
     """
-    if param + '_QAQC_Code' not in df:
-        df.loc[:, param + '_QAQC_Code'] = np.nan
+    if isinstance(df, list):
+        return [persistent_values(data, param, tolerance, freq, invalidate)
+                for data in df]
 
-    if df[df[param + '_Value'].diff() == 0].empty:
-        print('..no persistent values found for ' + param)
-        return df
+    param_list = [param] if isinstance(param, str) else list(param)
 
-    print('..flagging persistent values for ' + param)
-    data = df[param + '_Value'].copy().to_frame()
+    for param in param_list:
+        flag = persistent_runs(df[param + '_Value'].to_numpy(), tolerance)
 
-    # take the difference between consecutive data points and shift n times
-    # where n is the tolerance
-    window_df = pd.DataFrame()
-    for i in np.arange(1, tolerance + 1, 1, dtype=int):
-        window_df[param + '_diff_' + str(i)] = data[param + '_Value'].diff()
+        if param + '_QAQC_Code' not in df:
+            df.loc[:, param + '_QAQC_Code'] = np.nan
 
-    window_df['z_count'] = (window_df == 0).astype(int).sum(axis=1)
+        if not flag.any():
+            print('..no persistent values found for ' + param)
+            continue
 
-    flag_idx = window_df[window_df.z_count == tolerance].index
+        print('..flagging persistent values for ' + param)
 
-    flag_idx = df.index.intersection(flag_idx)
+        flag_col = param + '_QAQC_Code'
+        if isinstance(df[flag_col].dtype, pd.CategoricalDtype):
+            if 'persist' not in df[flag_col].cat.categories:
+                df[flag_col] = df[flag_col].cat.add_categories('persist')
 
-    df.loc[flag_idx, param + '_QAQC_Code'] = 'persist'  # temporary flag
+        df.loc[flag, flag_col] = 'persist'  # temporary flag
 
-    if invalidate is True:
-        df.loc[flag_idx, param + '_Value'] = np.nan
+        if invalidate is True:
+            df.loc[flag, param + '_Value'] = np.nan
 
     return df
 
 
+def persistent_runs(values, tolerance=3):
+    """Locate entries in runs of consecutive repeated values.
+
+    Args:
+        values (numpy array):
+            Parameter values.
+        tolerance (int, optional):
+            The minimum length of runs of repeated values that are flagged.
+            Defaults to 3.
+
+    Returns:
+        flag (numpy array):
+            Boolean array, True for entries in runs of repeated (non-null)
+            values with a length of at least ``tolerance``.
+
+    """
+    values = np.asarray(values, dtype=float)
+    n_values = len(values)
+    if n_values == 0:
+        return np.zeros(0, dtype=bool)
+
+    # A new run starts wherever the value differs from the previous value
+    # (null values never equal the previous value and form runs of length 1)
+    run_start = np.ones(n_values, dtype=bool)
+    run_start[1:] = values[1:] != values[:-1]
+
+    run_id = np.cumsum(run_start) - 1
+    run_length = np.bincount(run_id)
+
+    return (run_length[run_id] >= tolerance) & ~np.isnan(values)
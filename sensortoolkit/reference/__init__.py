@@ -16,9 +16,11 @@ Created:
 Last Updated:
   Wed Sep  8 12:33:10 2021
 """
-from ._method_lookup import get_reference_method
+from ._method_lookup import get_reference_method, method_table, method_index
 from ._airnowtech_to_long import airnowtech_wide_to_long
 from ._import_airnowtech import preprocess_airnowtech
 from ._load_ref_data import load_ref_dataframes
 from ._ref_api_query import (ref_api_query, query_airnow, query_aqs)
 from ._ref_flags import reference_flags
+from ._api_scheduler import RequestScheduler
+from ._api_cache import APICacheMissError
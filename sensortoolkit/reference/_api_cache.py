@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains methods for caching responses returned by reference data
+API services (AQS and AirNow) to file.
+
+Responses are stored at the ``/data/reference_data/[api service]/cache``
+subdirectory within the project path. Each response is saved under a key
+computed from the API service, the query endpoint, and the query parameters
+(e.g., the parameter codes, the site ID or bounding box, and the query
+period). User credentials are not included in the key and are not written to
+file.
+
+Responses for periods that had already ended at the time of the query (e.g.,
+previous months) do not expire. Responses for periods that had not ended at the
+time of the query (e.g., the current month) expire after a configurable time
+to live (``cache_ttl``), after which the API is queried again. In offline mode,
+responses are only returned from the cache (expired responses are returned and
+the API service is not queried), and ``APICacheMissError`` is raised for
+queries without a cached response.
+
+================================================================================
+
+Created:
+  Sun Oct 18 15:02:37 2026
+Last Updated:
+  Sun Oct 18 15:02:37 2026
+"""
+import datetime
+import hashlib
+import json
+import os
+import threading
+import pandas as pd
+from ._api_scheduler import request_scheduler
+
+# Query parameters with user credentials, excluded from cache keys and files
+CREDENTIAL_PARAMS = ['email', 'key', 'api_key']
+
+
+class APICacheMissError(LookupError):
+    """Raised in offline mode if the response to an API query is not cached.
+    """
+
+
+def api_cache_path(path, query_type):
+    """Return the path to the directory where API responses are cached.
+
+    Args:
+        path (str):
+            The project path where the ``/data/reference_data`` subdirectory
+            is housed.
+        query_type (str):
+            The name of the API service (either 'AQS' or 'AirNow').
+
+    Returns:
+        cache_path (str):
+            Path to the cache directory for the API service.
+
+    """
+    return os.path.join(path, 'data', 'reference_data', query_type.lower(),
+                        'cache')
+
+
+def api_cache_key(service, endpoint, params):
+    """Compute the key for an API query.
+
+    Args:
+        service (str):
+            The name of the API service (either 'AQS' or 'AirNow').
+        endpoint (str):
+            The query endpoint (e.g., ``'sampleData'`` for AQS queries).
+        params (dict):
+            The query parameters. Credentials are excluded from the key.
+
+    Returns:
+        key (str):
+            SHA-256 hex digest for the query.
+
+    """
+    query = {'service': service,
+             'endpoint': endpoint,
+             'params': {param: str(value) for param, value in params.items()
+                        if param not in CREDENTIAL_PARAMS}}
+    query = json.dumps(query, sort_keys=True)
+
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+
+def read_api_cache(cache_path, key, cache_ttl=3600, offline=False):
+    """Read a cached API response.
+
+    Args:
+        cache_path (str):
+            Path to the cache directory.
+        key (str):
+            The key for the query.
+        cache_ttl (int or float, optional):
+            The time to live (in seconds) for responses to queries for periods
+            that had not ended at the time of the query. Responses to queries
+            for ended periods do not expire. If None, responses do not expire.
+            Defaults to 3600.
+        offline (bool, optional):
+            If True, expired responses are returned. Defaults to False.
+
+    Returns:
+        text (str or None):
+            The cached response. None if the response is not cached or has
+            expired.
+
+    """
+    folder = os.path.join(cache_path, key[:2])
+    meta_file = os.path.join(folder, key + '.json')
+    text_file = os.path.join(folder, key + '.txt')
+
+    try:
+        with open(meta_file, 'r') as file:
+            meta = json.load(file)
+        with open(text_file, 'r', encoding='utf-8') as file:
+            text = file.read()
+    except (OSError, ValueError):
+        return None
+
+    if not (offline or meta['closed'] or cache_ttl is None):
+        cached_at = datetime.datetime.fromisoformat(meta['cached_at'])
+        if cached_at.tzinfo is None:
+            # Entries cached before timestamps included the UTC offset
+            cached_at = cached_at.replace(tzinfo=datetime.timezone.utc)
+        age = (datetime.datetime.now(datetime.timezone.utc)
+               - cached_at).total_seconds()
+        if age > cache_ttl:
+            return None
+
+    return text
+
+
+def write_api_cache(cache_path, key, text, service, endpoint, params,
+                    period_end):
+    """Write an API response to the cache.
+
+    Args:
+        cache_path (str):
+            Path to the cache directory.
+        key (str):
+            The key for the query.
+        text (str):
+            The response returned by the API service.
+        service (str):
+            The name of the API service.
+        endpoint (str):
+            The query endpoint.
+        params (dict):
+            The query parameters. Credentials are not written to file.
+        period_end (pandas Timestamp):
+            The end of the query period. Responses for periods that ended
+            before the current date do not expire.
+
+    Returns:
+        None.
+
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    meta = {'service': service,
+            'endpoint': endpoint,
+            'params': {param: str(value) for param, value in params.items()
+                       if param not in CREDENTIAL_PARAMS},
+            'period_end': str(period_end),
+            'cached_at': now.isoformat(timespec='seconds'),
+            'closed': bool(pd.Timestamp(period_end).date() < now.date())}
+
+    folder = os.path.join(cache_path, key[:2])
+    if not os.path.exists(folder):
+        os.makedirs(folder, exist_ok=True)
+
+    # Files are written to a temporary file and then renamed so that
+    # concurrent queries never read partially written responses
+    for ext, content in [('.txt', text), ('.json', json.dumps(meta))]:
+        filename = os.path.join(folder, key + ext)
+        temp_filename = (f'{filename}.{os.getpid()}.'
+                         f'{threading.get_ident()}.tmp')
+        with open(temp_filename, 'w', encoding='utf-8') as file:
+            file.write(content)
+        os.replace(temp_filename, filename)
+
+
+def cached_api_request(url, params, service, endpoint, period_end, **kwargs):
+    """Send an API query request, returning the cached response if available.
+
+    Args:
+        url (str):
+            The query URL.
+        params (dict):
+            The query parameters included in the URL.
+        service (str):
+            The name of the API service (either 'AQS' or 'AirNow').
+        endpoint (str):
+            The query endpoint (e.g., ``'sampleData'`` for AQS queries).
+        period_end (pandas Timestamp):
+            The end of the query period.
+
+    **Keyword Arguments:**
+
+    :param str cache_path:
+        Path to the cache directory. If None, responses are not cached.
+        Defaults to None.
+    :param int cache_ttl:
+        The time to live (in seconds) for cached responses to queries for
+        periods that had not ended at the time of the query. Defaults to 3600.
+    :param bool offline:
+        If True, responses are only returned from the cache and the API
+        service is not queried. Defaults to False.
+    :param function object validate:
+        Function returning True if a response may be cached. Defaults to None
+        (responses with successful HTTP status codes are cached).
+    :param requests.Session session:
+        HTTP session used for sending API requests. Defaults to None.
+    :param RequestScheduler scheduler:
+        Scheduler used for sending API requests (rate limiting and retrying
+        failed requests). Defaults to ``request_scheduler``.
+    :param list request_log:
+        List to which the scheduler adds an entry for each request attempt.
+        Defaults to None.
+    :param function object print_func:
+        Function called with messages describing the query. Defaults to
+        ``print``.
+
+    Raises:
+        APICacheMissError: If ``offline`` is True and the response is not
+            cached.
+
+    Returns:
+        text (str):
+            The response returned by the API service.
+
+    """
+    cache_path = kwargs.get('cache_path', None)
+    cache_ttl = kwargs.get('cache_ttl', 3600)
+    offline = kwargs.get('offline', False)
+    validate = kwargs.get('validate', None)
+    session = kwargs.get('session', None)
+    scheduler = kwargs.get('scheduler', None) or request_scheduler
+    echo = kwargs.get('print_func', print)
+
+    if cache_path is not None:
+        key = api_cache_key(service, endpoint, params)
+        text = read_api_cache(cache_path, key, cache_ttl, offline)
+        if text is not None:
+            echo('..Response loaded from cache')
+            return text
+
+    label = endpoint + '?' + '&'.join(f'{param}={value}'
+                                      for param, value in params.items()
+                                      if param not in CREDENTIAL_PARAMS)
+
+    if offline:
+        raise APICacheMissError(f'{service} response for {label} not found '
+                                'in cache (offline mode)')
+
+    response = scheduler.request(url, service, session=session, label=label,
+                                 print_func=echo,
+                                 log=kwargs.get('request_log', None))
+    text = response.text
+
+    if (cache_path is not None and response.ok
+            and (validate is None or validate(text))):
+        write_api_cache(cache_path, key, text, service, endpoint, params,
+                        period_end)
+
+    return text
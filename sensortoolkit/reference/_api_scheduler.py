@@ -0,0 +1,383 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains classes for scheduling requests sent to reference data
+API services (AQS and AirNow) and for checkpointing the progress of queries
+spanning multiple months.
+
+Requests are sent via the ``RequestScheduler`` class, which
+
+- limits the rate at which requests are sent to each API service via a token
+  bucket (requests are delayed until a token is available),
+- retries requests that time out, fail to connect, or receive a response
+  with HTTP status code 429 (too many requests) or 5xx (server error) with
+  exponentially increasing delays with random jitter, and
+- records the latency and size of each response (the scheduler keeps a
+  log of the most recent requests, and requests may additionally be
+  recorded to a separate log for each query).
+
+Requests sent by the query methods in ``sensortoolkit.reference`` share the
+``request_scheduler`` instance defined in this module, so the rate limit for
+each API service applies to all queries sent by the process.
+
+The ``QueryCheckpoint`` class records the monthly intervals completed by an API
+query at the ``/data/reference_data/[api service]/cache/checkpoints``
+subdirectory within the project path. If a query is interrupted, monthly
+intervals completed before the interruption are loaded from cached responses
+when the query is repeated.
+
+================================================================================
+
+Created:
+  Sun Oct 18 15:31:52 2026
+Last Updated:
+  Sun Oct 18 15:31:52 2026
+"""
+from collections import deque
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import requests
+import pandas as pd
+
+# Default rate limits for API services, expressed as the number of requests
+# permitted per second and the number of requests that may be sent in a burst.
+# AQS asks users to limit requests to 10 per minute, AirNow limits API keys to
+# 500 requests per hour.
+RATE_LIMITS = {'AQS': (10 / 60, 4),
+               'AirNow': (500 / 3600, 10)}
+
+
+class TokenBucket:
+    """Token bucket rate limiter.
+
+    Tokens are added to the bucket at a constant rate up to the capacity of
+    the bucket. Each request removes one token, and requests wait until a
+    token is available.
+
+    Args:
+        rate (float):
+            The number of tokens added per second.
+        capacity (int):
+            The maximum number of tokens held by the bucket (i.e., the number
+            of requests that may be sent without waiting).
+
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Remove a token from the bucket, waiting until one is available.
+
+        Returns:
+            wait (float): The time (in seconds) spent waiting for a token.
+
+        """
+        wait = 0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens +
+                                   (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return wait
+                delay = (1 - self._tokens) / self.rate
+
+            time.sleep(delay)
+            wait += delay
+
+
+class RequestScheduler:
+    """Send API requests with per-service rate limits and retries.
+
+    Args:
+        rate_limits (dict, optional):
+            Rate limits for API services, with API service names as keys and
+            two-element tuples (requests per second, burst capacity) as values.
+            Passed values update the defaults in ``RATE_LIMITS``. Defaults to
+            None.
+        max_retries (int, optional):
+            The maximum number of times a failed request is retried. Defaults
+            to 5.
+        backoff (float, optional):
+            The base delay (in seconds) before retrying a request. The delay
+            doubles with each retry and a random delay between zero and the
+            backoff delay is used (full jitter). Defaults to 1.
+        max_backoff (float, optional):
+            The maximum backoff delay (in seconds). Defaults to 60.
+        timeout (float, optional):
+            Timeout (in seconds) for connecting to the API service and for
+            receiving the response. Defaults to 120.
+        log_size (int, optional):
+            The maximum number of entries kept in the request log (older
+            entries are discarded). Defaults to 1000.
+
+    """
+
+    def __init__(self, rate_limits=None, max_retries=5, backoff=1,
+                 max_backoff=60, timeout=120, log_size=1000):
+        self.rate_limits = {**RATE_LIMITS, **(rate_limits or {})}
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.log = deque(maxlen=log_size)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, service):
+        """Return the token bucket for an API service.
+
+        Args:
+            service (str):
+                The name of the API service.
+
+        Returns:
+            bucket (TokenBucket): The token bucket for the API service.
+
+        """
+        with self._lock:
+            if service not in self._buckets:
+                rate, capacity = self.rate_limits[service]
+                self._buckets[service] = TokenBucket(rate, capacity)
+
+            return self._buckets[service]
+
+    def retry_delay(self, attempt, response=None):
+        """Compute the delay before retrying a request.
+
+        Args:
+            attempt (int):
+                The number of the failed attempt (starting at zero).
+            response (requests.Response, optional):
+                The response to the failed attempt. If the response includes a
+                ``Retry-After`` header with a delay in seconds, the delay is
+                at least as long as the indicated delay. Defaults to None.
+
+        Returns:
+            delay (float): The delay in seconds.
+
+        """
+        delay = random.uniform(0, min(self.max_backoff,
+                                      self.backoff * 2**attempt))
+
+        if response is not None:
+            try:
+                delay = max(delay, float(response.headers['Retry-After']))
+            except (KeyError, ValueError):
+                pass
+
+        return delay
+
+    def request(self, url, service, session=None, label=None,
+                print_func=print, log=None):
+        """Send a GET request, retrying failed requests.
+
+        Args:
+            url (str):
+                The request URL.
+            service (str):
+                The name of the API service (used to select the rate limit).
+            session (requests.Session, optional):
+                HTTP session used for sending the request. Defaults to None.
+            label (str, optional):
+                Description of the request recorded in the request log (URLs
+                are not recorded as URLs include credentials). Defaults to
+                None.
+            print_func (function object, optional):
+                Function called with messages about retried requests. Defaults
+                to ``print``.
+            log (list, optional):
+                List to which entries for each request attempt are added in
+                addition to the scheduler's request log (e.g., to summarize
+                the requests sent by a query). Defaults to None.
+
+        Raises:
+            requests.HTTPError: If the response status code indicates a
+                failed request after the maximum number of retries.
+            requests.RequestException: If the request times out or fails to
+                connect after the maximum number of retries.
+
+        Returns:
+            response (requests.Response): The response to the request.
+
+        """
+        http = requests if session is None else session
+        bucket = self.bucket(service)
+
+        for attempt in range(self.max_retries + 1):
+            wait = bucket.acquire()
+            start = time.monotonic()
+            entry = {'service': service,
+                     'request': label,
+                     'attempt': attempt,
+                     'rate_limit_wait': wait}
+            try:
+                response = http.get(url, timeout=self.timeout)
+            except (requests.Timeout, requests.ConnectionError) as error:
+                entry.update({'status_code': None,
+                              'latency': time.monotonic() - start,
+                              'bytes': 0,
+                              'error': type(error).__name__})
+                self.record(entry, log)
+                if attempt == self.max_retries:
+                    raise
+                reason = type(error).__name__
+                delay = self.retry_delay(attempt)
+            else:
+                entry.update({'status_code': response.status_code,
+                              'latency': time.monotonic() - start,
+                              'bytes': len(response.content),
+                              'error': None})
+                self.record(entry, log)
+                if not (response.status_code == 429
+                        or response.status_code >= 500):
+                    return response
+                if attempt == self.max_retries:
+                    # URLs are not included in the error as URLs include
+                    # credentials
+                    raise requests.HTTPError(
+                            f'{service} API request failed with HTTP status '
+                            f'code {response.status_code} after '
+                            f'{self.max_retries} retries', response=response)
+                reason = f'HTTP {response.status_code}'
+                delay = self.retry_delay(attempt, response)
+
+            print_func(f'..Request failed ({reason}), retrying in '
+                       f'{delay:.1f} seconds')
+            time.sleep(delay)
+
+    def record(self, entry, log=None):
+        """Add an entry to the request log.
+
+        Args:
+            entry (dict):
+                Attributes of the request, including the latency (in seconds)
+                and the size of the response (in bytes).
+            log (list, optional):
+                Additional list to which the entry is added. Defaults to None.
+
+        Returns:
+            None.
+
+        """
+        entry['time'] = pd.Timestamp.now()
+        with self._lock:
+            self.log.append(entry)
+            if log is not None:
+                log.append(entry)
+
+    def summary(self, log=None):
+        """Return the request log as a DataFrame.
+
+        Args:
+            log (list, optional):
+                Entries to summarize (e.g., the log passed to ``request()``
+                for the requests sent by a query). Defaults to None (the
+                scheduler's request log is summarized).
+
+        Returns:
+            log (pandas DataFrame):
+                The service, request description, attempt number, status
+                code, latency (seconds), response size (bytes), and error for
+                each request.
+
+        """
+        with self._lock:
+            entries = list(self.log if log is None else log)
+
+        return pd.DataFrame(entries,
+                            columns=['time', 'service', 'request', 'attempt',
+                                     'status_code', 'latency', 'bytes',
+                                     'rate_limit_wait', 'error'])
+
+
+class QueryCheckpoint:
+    """Record the monthly intervals completed by an API query.
+
+    Args:
+        cache_path (str):
+            Path to the directory where API responses are cached. Checkpoints
+            are saved to the ``checkpoints`` subdirectory.
+        query (dict):
+            Description of the query (API service, parameters, site ID or
+            bounding box, and query period) used to name the checkpoint file.
+            Credentials should not be included.
+
+    """
+
+    def __init__(self, cache_path, query):
+        key = hashlib.sha256(json.dumps(query, sort_keys=True,
+                                        default=str).encode('utf-8'))
+        self.path = os.path.join(cache_path, 'checkpoints',
+                                 key.hexdigest() + '.json')
+        self._lock = threading.Lock()
+
+        try:
+            with open(self.path, 'r') as file:
+                self.completed = json.load(file)['completed']
+        except (OSError, ValueError, KeyError):
+            self.completed = []
+
+    def is_complete(self, data_period):
+        """Whether a monthly interval was completed.
+
+        Args:
+            data_period (list):
+                The start and end date of the monthly interval.
+
+        Returns:
+            bool: True if the monthly interval was completed.
+
+        """
+        return list(data_period) in self.completed
+
+    def add(self, data_period):
+        """Record a completed monthly interval.
+
+        Args:
+            data_period (list):
+                The start and end date of the monthly interval.
+
+        Returns:
+            None.
+
+        """
+        with self._lock:
+            if self.is_complete(data_period):
+                return
+            self.completed.append(list(data_period))
+
+            folder = os.path.dirname(self.path)
+            if not os.path.exists(folder):
+                os.makedirs(folder, exist_ok=True)
+
+            temp_path = f'{self.path}.{os.getpid()}.tmp'
+            with open(temp_path, 'w') as file:
+                json.dump({'completed': self.completed}, file)
+            os.replace(temp_path, self.path)
+
+    def clear(self):
+        """Remove the checkpoint after the query is completed.
+
+        Returns:
+            None.
+
+        """
+        with self._lock:
+            self.completed = []
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+# Scheduler shared by API queries
+request_scheduler = RequestScheduler()
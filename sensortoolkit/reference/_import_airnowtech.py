@@ -94,15 +94,6 @@ def sort_airnowtech(df, **kwargs):
         path.
 
     """
-    crtieria_lookup_path = os.path.abspath(os.path.join(__file__, '..',
-                                    'method_codes', 'methods_criteria.csv'))
-    met_lookup_path = os.path.abspath(os.path.join(__file__, '..',
-                                    'method_codes', 'methods_met.csv'))
-
-    # Method code lookup dataframe
-    criteria_lookup_table = pd.read_csv(crtieria_lookup_path)
-    met_lookup_table = pd.read_csv(met_lookup_path)
-
     # Dataframes to be populated
     idx = df.index.drop_duplicates()
     gas_df = pd.DataFrame(index=idx)
@@ -183,10 +174,11 @@ def sort_airnowtech(df, **kwargs):
         except IndexError:
             aqs_method_code = np.nan
 
+        # Method code lookup table
         if param in met_list:
-            lookup_table = met_lookup_table
+            lookup_table = 'met'
         if (param in pm_list or param in gas_list):
-            lookup_table = criteria_lookup_table
+            lookup_table = 'criteria'
 
         if np.isnan(aqs_param_code) or np.isnan(aqs_method_code):
             param_df[param + '_Method'] = 'Unspecified Reference'
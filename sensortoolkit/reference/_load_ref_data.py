@@ -16,10 +16,11 @@ Last Updated:
   Wed Jul 14 12:44:57 2021
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from sensortoolkit.datetime_utils import interval_averaging
 
-def load_ref_dataframes(bdate, edate, path, classes):
+def load_ref_dataframes(bdate, edate, path, classes, **kwargs):
     """Load reference data for the parameters measured by the sensors in the
     passed sensor dataframe list and for the timeframe indicated by sensor
     dataset timestamps.
@@ -33,6 +34,20 @@ def load_ref_dataframes(bdate, edate, path, classes):
             A unique listing of parameters measured by the
             sensor make and model being evaluated.
 
+    **Keyword Arguments:**
+
+    :param bool compact:
+        If True, reference datasets are converted to a memory-compact
+        representation by ``sensortoolkit.lib_utils.compact_dataset()``
+        (text metadata columns such as units, methods, and site information
+        are stored as categoricals). Defaults to False.
+    :param bool float32_values:
+        If True and ``compact`` is True, parameter value columns are stored as
+        32-bit floats. Defaults to False.
+    :param int max_workers:
+        The maximum number of monthly reference data files read concurrently.
+        Defaults to 4.
+
     Returns:
         ref_dict (dict):
             Dictionary containing reference datasets organized by parameter
@@ -58,27 +73,45 @@ def load_ref_dataframes(bdate, edate, path, classes):
                                                  pd.DataFrame(),
                                                  pd.DataFrame())
 
-    for date in pd.date_range(start=bdate, end=edate).to_period('M').unique():
-        month = str(date.month).zfill(2)
-        year = str(date.year)
-
-        print('..{0:s}-{1:s}'.format(year, month))
-
-        if pm_ref_data is True:
-            # Import 1-hr averaged data
-            pm_h_ref_df = import_ref_dataframe(pm_h_ref_df, path,
-                                               year, month,
-                                               suffix='_PM')
-        if met_ref_data is True:
-            # Import 1-hr averaged data
-            met_h_ref_df = import_ref_dataframe(met_h_ref_df, path,
-                                                year, month,
-                                                suffix='_Met')
-        if gas_ref_data is True:
-            # Import 1-hr averaged data
-            gas_h_ref_df = import_ref_dataframe(gas_h_ref_df, path,
-                                                year, month,
-                                                suffix='_Gases')
+    suffixes = []
+    if pm_ref_data is True:
+        suffixes.append('_PM')
+    if met_ref_data is True:
+        suffixes.append('_Met')
+    if gas_ref_data is True:
+        suffixes.append('_Gases')
+
+    # Read 1-hr averaged data for each month and parameter classification
+    # concurrently
+    files = [(str(date.year), str(date.month).zfill(2), suffix)
+             for date in pd.date_range(start=bdate,
+                                       end=edate).to_period('M').unique()
+             for suffix in suffixes]
+
+    with ThreadPoolExecutor(max_workers=kwargs.get('max_workers', 4)
+                            ) as executor:
+        loaded = list(executor.map(lambda file: read_ref_dataframe(path,
+                                                                   *file),
+                                   files))
+
+    ref_h_dfs = {suffix: [] for suffix in suffixes}
+    for (year, month, suffix), load_df in zip(files, loaded):
+        if suffix == suffixes[0]:
+            print('..{0:s}-{1:s}'.format(year, month))
+
+        filename = f'H_{year}{month}{suffix}.csv'
+        if load_df is None:
+            print("Warning, file not found:", filename)
+            continue
+        print('....' + filename)
+        ref_h_dfs[suffix].append(load_df)
+
+    if pm_ref_data is True:
+        pm_h_ref_df = concat_ref_dataframes(ref_h_dfs['_PM'])
+    if met_ref_data is True:
+        met_h_ref_df = concat_ref_dataframes(ref_h_dfs['_Met'])
+    if gas_ref_data is True:
+        gas_h_ref_df = concat_ref_dataframes(ref_h_dfs['_Gases'])
 
     # Compute 24-hr averaged data
     print('Computing 24-hour averaged reference datasets')
@@ -122,9 +155,74 @@ def load_ref_dataframes(bdate, edate, path, classes):
                         '24-hour':  met_d_ref_df}
                 }
 
+    if kwargs.get('compact', False) is True:
+        from sensortoolkit.lib_utils import compact_dataset
+        float32 = kwargs.get('float32_values', False)
+        for classifier in ref_dict:
+            for interval in ref_dict[classifier]:
+                ref_dict[classifier][interval] = compact_dataset(
+                                            ref_dict[classifier][interval],
+                                            float32)
+
     return ref_dict
 
 
+def read_ref_dataframe(path, year, month, suffix=None):
+    """Read reference data for the specified monthly period and parameter
+    classification.
+
+    Args:
+        path (str):
+            Full path to reference data directory where files are located.
+        year (str):
+            The year (YYYY) for which data will be loaded.
+        month (str):
+            The month (MM) for which data will be loaded.
+        suffix (str):
+            The parameter classification ('PM', 'Gases', or 'Met') indicating
+            the type of reference data to be imported.
+
+    Returns:
+        load_df (pandas dataframe or None):
+            Reference data (FRM/FEM) at 1-hour averaged intervals. None if
+            the file for the monthly period was not found.
+
+    """
+    filename = f'H_{year}{month}{suffix}.csv'
+    try:
+        load_df = pd.read_csv(os.path.join(path, filename),
+                              parse_dates=['DateTime'], index_col='DateTime')
+    except FileNotFoundError:
+        return None
+
+    return load_df
+
+
+def concat_ref_dataframes(df_list):
+    """Combine monthly reference datasets into one dataset.
+
+    Datasets are concatenated and, for timestamps present in more than one
+    dataset, the first instance of the timestamp is kept (i.e., datasets
+    earlier in the list take precedence).
+
+    Args:
+        df_list (list):
+            List of reference datasets.
+
+    Returns:
+        df (pandas dataframe):
+            The combined dataset, sorted by timestamp.
+
+    """
+    if not df_list:
+        return pd.DataFrame()
+
+    df = pd.concat(df_list)
+    df = df[~df.index.duplicated(keep='first')]
+
+    return df.sort_index()
+
+
 def import_ref_dataframe(df, path, year, month, suffix=None):
     """Import reference data for the specified monthly period and parameter
     classification.
@@ -151,20 +249,18 @@ def import_ref_dataframe(df, path, year, month, suffix=None):
             intervals.
 
     """
-    try:
-        filename = f'H_{year}{month}{suffix}.csv'
-        load_df = pd.read_csv(os.path.join(path, filename),
-                              parse_dates=['DateTime'], index_col='DateTime')
+    filename = f'H_{year}{month}{suffix}.csv'
+    load_df = read_ref_dataframe(path, year, month, suffix)
 
-        # Append loaded dataframe based on the first instance of a timestamp
-        # index value (i.e., avoid duplicate index values by combining only
-        # new timestamp indicies with the primary dataframe 'df')
-        df = df.combine_first(load_df)
+    if load_df is None:
+        print("Warning, file not found:", filename)
+        return df
 
-        print('....' + filename)
+    # Append loaded dataframe based on the first instance of a timestamp
+    # index value (i.e., avoid duplicate index values by combining only
+    # new timestamp indicies with the primary dataframe 'df')
+    df = df.combine_first(load_df)
 
-    except FileNotFoundError:
-        print("Warning, file not found:", filename)
-        pass
+    print('....' + filename)
 
     return df
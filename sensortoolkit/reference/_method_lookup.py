@@ -17,20 +17,136 @@ Last Updated:
 # modified current line 59 to change 'record' to 'records' due to deprecated warning when running
 # sensortoolkit that "Using short name for 'orient' is deprecated"
 
+import os
+import pickle
+import threading
 import numpy as np
 import pandas as pd
 from textwrap import wrap
 
+# FRM/FEM method lookup tables included with sensortoolkit
+METHOD_TABLE_FILES = {'criteria': 'methods_criteria.csv',
+                      'met': 'methods_met.csv'}
+
+# Lookup tables and indexes are loaded once per process when first used
+_method_tables = {}
+_method_indexes = {}
+_method_lock = threading.Lock()
+
+
+def _method_table_signature():
+    """Return the size and modification time of the lookup table files."""
+    signature = {}
+    for table, filename in METHOD_TABLE_FILES.items():
+        stat = os.stat(os.path.join(os.path.dirname(__file__), 'method_codes',
+                                    filename))
+        signature[table] = (stat.st_size, stat.st_mtime)
+    signature['pandas'] = pd.__version__
+
+    return signature
+
+
+def _load_method_tables():
+    """Load the method lookup tables into ``_method_tables``.
+
+    Tables are loaded from a pickled copy saved to the sensortoolkit
+    application data directory. If the pickled copy is missing or the lookup
+    table files have changed (e.g., the package was updated), the tables are
+    read from the .csv files and the pickled copy is saved again.
+    """
+    from sensortoolkit import _app_data_dir
+    pickle_path = os.path.join(_app_data_dir, 'method_codes.pkl')
+    signature = _method_table_signature()
+
+    try:
+        with open(pickle_path, 'rb') as file:
+            saved = pickle.load(file)
+        if saved['signature'] == signature:
+            _method_tables.update(saved['tables'])
+            return
+    except Exception:
+        pass
+
+    for table, filename in METHOD_TABLE_FILES.items():
+        _method_tables[table] = pd.read_csv(
+                                    os.path.join(os.path.dirname(__file__),
+                                                 'method_codes', filename))
+    try:
+        with open(pickle_path, 'wb') as file:
+            pickle.dump({'signature': signature, 'tables': _method_tables},
+                        file, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+
+
+def method_table(table):
+    """Return an FRM/FEM method lookup table.
+
+    Tables are loaded once per process and shared by all callers. Callers
+    should copy the table before modifying it.
+
+    Args:
+        table (str):
+            The name of the lookup table, either ``'criteria'`` (methods for
+            criteria pollutants) or ``'met'`` (methods for meteorological
+            parameters).
+
+    Returns:
+        lookup_table (pandas DataFrame):
+            A table containing a list of parameter codes, method codes, and
+            corresponding instrument names.
+
+    """
+    if table not in METHOD_TABLE_FILES:
+        raise ValueError(f'Invalid method lookup table: {table}. Accepted '
+                         'values include "criteria" and "met"')
+
+    with _method_lock:
+        if not _method_tables:
+            _load_method_tables()
+
+    return _method_tables[table]
+
+
+def method_index(table):
+    """Return the entries of a method lookup table indexed by parameter code
+    and method code.
+
+    Args:
+        table (str):
+            The name of the lookup table, either ``'criteria'`` or ``'met'``.
+
+    Returns:
+        index (dict):
+            Dictionary with (parameter code, method code) tuples as keys and
+            the lookup table entries for each combination of codes as values.
+
+    """
+    lookup_table = method_table(table)
+
+    with _method_lock:
+        if table not in _method_indexes:
+            _method_indexes[table] = {
+                    (int(param_code), int(method_code)): entries
+                    for (param_code, method_code), entries in
+                    lookup_table.groupby(['Parameter Code', 'Method Code'],
+                                         sort=False)}
+
+    return _method_indexes[table]
+
+
 def get_reference_method(lookup_table, aqs_param_code, aqs_method_code):
     """
 
 
     Args:
-        lookup_table (pandas DataFrame): A table containing a list of parameter
-            codes, method codes, and corresponding instrument names. Lookup
-            tables for instruments measuring criteria pollutants or those
-            measuring meteorological parameters are located at
-            `sensortoolkit/reference/method_codes`.
+        lookup_table (str or pandas DataFrame): The name of the lookup table
+            for instruments measuring criteria pollutants (``'criteria'``) or
+            meteorological parameters (``'met'``) located at
+            `sensortoolkit/reference/method_codes`, or a table containing a
+            list of parameter codes, method codes, and corresponding
+            instrument names. Named lookup tables are searched via an index
+            that is built once per process.
         aqs_param_code (str): Parameter code used by the AQS API that is
              associated with an environmental parameter, such as a criteria
              pollutant or meteorological parameter (e.g., "88101" is the AQS
@@ -50,10 +166,15 @@ def get_reference_method(lookup_table, aqs_param_code, aqs_method_code):
 
     """
 
-    mask= ((lookup_table['Parameter Code'] == int(aqs_param_code)) &
-            (lookup_table['Method Code'] == int(aqs_method_code)))
+    if isinstance(lookup_table, str):
+        selections = method_index(lookup_table).get(
+                            (int(aqs_param_code), int(aqs_method_code)),
+                            method_table(lookup_table).iloc[0:0])
+    else:
+        mask= ((lookup_table['Parameter Code'] == int(aqs_param_code)) &
+                (lookup_table['Method Code'] == int(aqs_method_code)))
 
-    selections = lookup_table.where(mask).dropna(how='all', axis=0)
+        selections = lookup_table.where(mask).dropna(how='all', axis=0)
 
     instrument_dict = {}
     for entry in selections.to_dict('records'): # modified by KM 02/08/2023
@@ -36,6 +36,9 @@ Last Updated:
   Wed Jul 14 14:27:21 2021
 """
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import json
 import pandas as pd
 from pandas.tseries.offsets import MonthBegin
@@ -50,11 +53,21 @@ from sensortoolkit.lib_utils import flatten_list
 from sensortoolkit.param import Parameter
 from sensortoolkit.calculate import convert_temp
 from sensortoolkit.reference import get_reference_method
+from ._api_cache import api_cache_path, cached_api_request, APICacheMissError
+from ._api_scheduler import QueryCheckpoint, request_scheduler
+
+# Base URLs for API services
+AQS_API_URL = 'https://aqs.epa.gov/data/api/'
+AIRNOW_API_URL = 'http://www.airnowapi.org/aq/data/'
+
+# Keyword arguments passed to cached_api_request() by query methods
+CACHE_KWARGS = ['cache_path', 'cache_ttl', 'offline', 'scheduler',
+                'request_log']
 
 
 def ref_api_query(query_type=None, param=None, bdate='', edate='',
                   aqs_id=None, airnow_bbox=None, username=None, key=None,
-                  path=None, select_method_on_each_query=False):
+                  path=None, select_method_on_each_query=False, **kwargs):
     """Wrapper function for sending an API data query to either the AQS or
     AirNow API for a specified parameter (``param``).
 
@@ -135,6 +148,37 @@ def ref_api_query(query_type=None, param=None, bdate='', edate='',
             reference monitor name selection configured on the first monthly
             query is used for subsequent monthly queries. Defaults to False.
 
+    **Keyword Arguments:**
+
+    :param int max_workers:
+        The maximum number of monthly intervals queried concurrently. Defaults
+        to 4.
+    :param requests.Session session:
+        HTTP session used for sending API requests. Connections are reused
+        across monthly queries. Sessions passed by the caller are not closed.
+        Defaults to None (a session is created for the query via
+        ``api_session()`` and closed once requests are complete).
+    :param bool use_cache:
+        If True, API responses are cached at the
+        ``/data/reference_data/[query_type]/cache`` subdirectory within the
+        project path and cached responses are used instead of querying the
+        API. Responses for months that had ended at the time of the query do
+        not expire. Defaults to True.
+    :param int cache_ttl:
+        The time to live (in seconds) for cached responses to queries for
+        the current month. Defaults to 3600.
+    :param bool offline:
+        If True, data are only loaded from cached responses and the API is not
+        queried (``APICacheMissError`` is raised if the response for a monthly
+        interval is not cached). Defaults to False.
+    :param RequestScheduler scheduler:
+        Scheduler used for sending API requests. Requests are rate limited
+        for each API service and failed requests are retried with exponential
+        backoff. The latency and size of responses are recorded in the
+        scheduler's request log (``scheduler.summary()``), and the requests
+        sent by the query are summarized once the query is complete. Defaults
+        to ``request_scheduler``, the scheduler shared by all API queries.
+
     Returns:
         (tuple): two-element tuple containing:
 
@@ -170,37 +214,99 @@ def ref_api_query(query_type=None, param=None, bdate='', edate='',
     api_param_list = [param_dict[param]['api_name']
                           for param in param_dict]
 
-    # Method code lookup tables
-    criteria_methods_path = os.path.abspath(os.path.join(__file__,
-                                  '..', 'method_codes', 'methods_criteria.csv'))
-    criteria_lookup_table = pd.read_csv(criteria_methods_path)
-
-    met_methods_path = os.path.abspath(os.path.join(__file__,
-                                  '..', 'method_codes', 'methods_met.csv'))
-    met_lookup_table = pd.read_csv(met_methods_path)
-
     # Monthly intervals to query
     month_starts, month_ends = date_range_selector(bdate, edate)
     query_months = query_periods(query_type, month_starts, month_ends)
+    month_periods = [list(query_months[month].values())
+                     for month in query_months]
+
+    max_workers = kwargs.get('max_workers', 4)
+    session = kwargs.get('session', None)
+    # Sessions created for the query are closed once requests are complete,
+    # sessions passed by the caller are left open
+    close_session = session is None
+    if close_session:
+        session = api_session(max_workers)
 
-    # Loop over monthly intervals, query API, process datasets, save .csv files
+    try:
+        print(f'Querying {query_type} API')
+        print('..Parameter(s): {0}'.format(', '.join(param_list)))
+
+        scheduler = kwargs.get('scheduler', None) or request_scheduler
+        # Requests sent by this query (the scheduler's request log is shared
+        # by all queries and only keeps the most recent requests)
+        request_log = []
+
+        query_kwargs = {'session': session,
+                        'scheduler': scheduler,
+                        'request_log': request_log,
+                        'offline': kwargs.get('offline', False),
+                        'cache_ttl': kwargs.get('cache_ttl', 3600)}
+        if kwargs.get('use_cache', True) and path is not None:
+            query_kwargs['cache_path'] = api_cache_path(path, query_type)
+        if query_type == 'AQS':
+            # Site and monitor metadata are retrieved once for the overall
+            # query period instead of for each monthly query
+            print('..Retrieving monitor information')
+            try:
+                query_kwargs['monitor_info'] = query_aqs(
+                                            api_param_list,
+                                            [month_periods[0][0],
+                                             month_periods[-1][1]],
+                                            aqs_id, username=username, key=key,
+                                            query_type='monitors',
+                                            **query_kwargs)
+            except APICacheMissError as e:
+                # Site coordinates reported with sample data are used instead
+                print(f'..{e}')
+                query_kwargs['monitor_info'] = pd.DataFrame()
+
+        # Record monthly intervals completed by the query so that an
+        # interrupted query can be resumed (completed months are loaded from
+        # the cache)
+        checkpoint = None
+        if 'cache_path' in query_kwargs and not query_kwargs['offline']:
+            checkpoint = QueryCheckpoint(
+                            query_kwargs['cache_path'],
+                            {'service': query_type,
+                             'param': api_param_list,
+                             'site': (aqs_id if query_type == 'AQS'
+                                      else airnow_bbox),
+                             'period': [month_periods[0][0],
+                                        month_periods[-1][1]]})
+            if checkpoint.completed:
+                print(f'..Resuming query, {len(checkpoint.completed)} of '
+                      f'{len(month_periods)} monthly intervals previously '
+                      'completed')
+
+        # Query monthly intervals concurrently, results are returned in the
+        # order of monthly intervals
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            month_queries = list(executor.map(
+                                    partial(query_month, query_type,
+                                            api_param_list, aqs_id=aqs_id,
+                                            airnow_bbox=airnow_bbox,
+                                            username=username, key=key,
+                                            checkpoint=checkpoint,
+                                            **query_kwargs),
+                                    month_periods))
+    finally:
+        if close_session:
+            session.close()
+
+    # Loop over monthly intervals, process datasets, save .csv files
     full_query, raw_full_query = pd.DataFrame(), pd.DataFrame()
 
     for param in param_dict:
         param_dict[param]['ref_name'] = None
 
-    for month in query_months:
+    for data_period, month_query in zip(month_periods, month_queries):
+        query_data, time_of_query, messages = month_query
         month_param_list = param_list.copy()
-        data_period = list(query_months[month].values())
-        time_of_query = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        print('\n'.join(messages))
 
         # AQS Specific query data tasks ---------------------------------------
         if query_type == 'AQS':
-            print('Querying AQS API')
-            print('..Parameter(s): {0}'.format(', '.join(month_param_list)))
-
-            query_data = query_aqs(api_param_list, data_period, aqs_id,
-                                   username=username, key=key)
             raw_query = query_data.copy()
 
             # If query did not return data, continue with next month query
@@ -221,10 +327,11 @@ def ref_api_query(query_type=None, param=None, bdate='', edate='',
                     month_param_list.remove(param)
                     continue
 
+                # Method code lookup table
                 if param_class == 'Met':
-                    lookup_table = met_lookup_table
+                    lookup_table = 'met'
                 else:
-                    lookup_table = criteria_lookup_table
+                    lookup_table = 'criteria'
 
                 # Determine reference method on each monthly query or use
                 # reference name from past months (if reference is known to
@@ -249,11 +356,6 @@ def ref_api_query(query_type=None, param=None, bdate='', edate='',
 
         # AirNow Specific query data tasks ------------------------------------
         if query_type == 'AirNow':
-            print('Querying AirNow API')
-            print('..Parameter(s): {0}'.format(', '.join(month_param_list)))
-
-            query_data = query_airnow(api_param_list, data_period,
-                                      airnow_bbox, key=key)
             raw_query = query_data.copy()
 
             # If query did not return data, continue with next month query
@@ -324,6 +426,18 @@ def ref_api_query(query_type=None, param=None, bdate='', edate='',
 
     full_query.index.name = 'DateTime'
 
+    if checkpoint is not None:
+        checkpoint.clear()
+
+    requests_log = scheduler.summary(request_log)
+    if not requests_log.empty:
+        print('..API requests: {0} ({1} retried), {2:.2f} MB received, '
+              'mean latency {3:.2f} seconds'.format(
+                  requests_log.shape[0],
+                  (requests_log.attempt > 0).sum(),
+                  requests_log.bytes.sum() / 1024**2,
+                  requests_log.latency.mean()))
+
     bdate = pd.to_datetime(bdate).strftime('%Y-%m-%d')
     edate = pd.to_datetime(edate).strftime('%Y-%m-%d')
     return full_query.loc[bdate:edate, :]
@@ -659,6 +773,101 @@ def query_periods(query_type=None, month_starts=[], month_ends=[]):
     return monthly_periods
 
 
+def api_session(max_workers=4):
+    """Create an HTTP session for sending API query requests.
+
+    Connections are kept alive and reused by subsequent requests to the same
+    API service. The size of the connection pool is set so that each
+    concurrent monthly query can hold a connection.
+
+    Args:
+        max_workers (int, optional):
+            The maximum number of requests sent concurrently. Defaults to 4.
+
+    Returns:
+        session (requests.Session):
+            HTTP session for API requests.
+
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max_workers)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    return session
+
+
+def query_month(query_type, param, data_period, aqs_id=None,
+                airnow_bbox=None, username=None, key=None, **kwargs):
+    """Send an API query request for a monthly interval.
+
+    Args:
+        query_type (str):
+            The API service to query (either ``'AQS'`` or ``'AirNow'``).
+        param (str or list of str values):
+            The API name(s) of the parameter(s) for which to query data.
+        data_period (list):
+            List with two elements, the start date and end date for the
+            monthly interval in the format expected by the API service.
+        aqs_id (dict, optional):
+            AQS only: AQS site ID separated into state, county, and
+            site ID components. Defaults to None.
+        airnow_bbox (dict, optional):
+            AirNow only: Bounding box of latitude and longitude values.
+            Defaults to None.
+        username (str, optional):
+            AQS only: email associated with API account. Defaults to None.
+        key (str, optional):
+            API authentication key code. Defaults to None.
+
+    **Keyword Arguments:**
+
+    :param requests.Session session:
+        HTTP session used for sending the request.
+    :param pandas DataFrame monitor_info:
+        AQS only: Site and monitor metadata returned by an AQS ``'monitors'``
+        query for the site.
+    :param QueryCheckpoint checkpoint:
+        Checkpoint recording the monthly intervals completed by the query.
+        Cached responses for completed months do not expire. Defaults to None.
+
+    Returns:
+        (tuple): three-element tuple containing:
+
+            - **query_data** (*pandas DataFrame*): Data returned by the API for
+              the monthly interval.
+            - **time_of_query** (*str*): The time of the API query, expressed
+              as a string with datetime format '%Y-%m-%d %H:%M:%S'.
+            - **messages** (*list*): Messages describing the query. Messages
+              are returned instead of printed so that the messages for
+              concurrent monthly queries can be printed in order.
+
+    """
+    checkpoint = kwargs.pop('checkpoint', None)
+    if checkpoint is not None and checkpoint.is_complete(data_period):
+        kwargs['cache_ttl'] = None
+
+    messages = []
+
+    def log_message(*args):
+        messages.append(' '.join(str(arg) for arg in args))
+
+    time_of_query = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    if query_type == 'AQS':
+        query_data = query_aqs(param, data_period, aqs_id,
+                               username=username, key=key,
+                               print_func=log_message, **kwargs)
+    if query_type == 'AirNow':
+        query_data = query_airnow(param, data_period, airnow_bbox, key=key,
+                                  print_func=log_message, **kwargs)
+
+    if checkpoint is not None:
+        checkpoint.add(data_period)
+
+    return query_data, time_of_query, messages
+
+
 def query_aqs(param, data_period, aqs_id, username=None, key=None,
               query_type='sampleData', **kwargs):
     """Construct an AQS API query request and parse response.
@@ -708,6 +917,33 @@ def query_aqs(param, data_period, aqs_id, username=None, key=None,
         this method.
     :param str sample_duration:
         The duration of recorded reference data the user wishes to retrieve.
+    :param pandas DataFrame monitor_info:
+        Site and monitor metadata previously returned by a ``'monitors'``
+        query for the site. If passed, the secondary AQS query for monitor
+        metadata is not submitted. Defaults to None.
+    :param requests.Session session:
+        HTTP session used for sending API requests. Defaults to None (requests
+        are sent without a session).
+    :param function object print_func:
+        Function called with the messages describing the query. Defaults to
+        ``print``.
+    :param str cache_path:
+        Path to the directory where API responses are cached. Defaults to
+        None (responses are not cached).
+    :param int cache_ttl:
+        The time to live (in seconds) for cached responses to queries for
+        periods that had not ended at the time of the query (e.g., the current
+        month). Defaults to 3600.
+    :param bool offline:
+        If True, responses are only loaded from the cache and the API is not
+        queried (``APICacheMissError`` is raised if the response is not
+        cached). Defaults to False.
+    :param RequestScheduler scheduler:
+        Scheduler used for sending API requests (rate limiting and retrying
+        failed requests). Defaults to ``request_scheduler``.
+    :param list request_log:
+        List to which the scheduler adds an entry for each request attempt
+        (used to summarize the requests sent by a query). Defaults to None.
 
     Returns:
         data (pandas DataFrame):
@@ -717,6 +953,11 @@ def query_aqs(param, data_period, aqs_id, username=None, key=None,
     """
     get_monitor_info = kwargs.get('get_monitor_info', True)
     sample_duration = kwargs.get('sample_duration', '1 HOUR')
+    monitor_info = kwargs.get('monitor_info', None)
+    session = kwargs.get('session', None)
+    echo = kwargs.get('print_func', print)
+    cache_kwargs = {name: kwargs[name] for name in CACHE_KWARGS
+                    if name in kwargs}
 
     query_types = ['sampleData', 'monitors', 'qaBlanks',
                    'qaCollocatedAssessments', 'qaFlowRateVerifications',
@@ -739,27 +980,34 @@ def query_aqs(param, data_period, aqs_id, username=None, key=None,
 
     begin = f'{data_period[0][:4]}-{data_period[0][4:6]}-{data_period[0][6:]}'
     end = f'{data_period[1][:4]}-{data_period[1][4:6]}-{data_period[1][6:]}'
-    print('..Query start:', begin)
-    print('..Query end:', end)
+    echo('..Query start:', begin)
+    echo('..Query end:', end)
 
-    urlbase = f'https://aqs.epa.gov/data/api/{query_type}/bySite?'
+    urlbase = f'{AQS_API_URL}{query_type}/bySite?'
 
     # Construct query URL
-    url = urlbase + 'email=' + str(username)
-    url += '&key=' + str(key)
-    url += '&param=' + ','.join(param_list)
-    url += '&bdate=' + str(data_period[0])
-    url += '&edate=' + str(data_period[1])
-    url += '&state=' + str(aqs_id["state"])
-    url += '&county=' + str(aqs_id["county"])
-    url += '&site=' + str(aqs_id["site"])
-
-    # Query API for specified query type and load to json
-    data = requests.get(url)
-    json_data = json.loads(data.text)
+    url_params = {'email': str(username),
+                  'key': str(key),
+                  'param': ','.join(param_list),
+                  'bdate': str(data_period[0]),
+                  'edate': str(data_period[1]),
+                  'state': str(aqs_id["state"]),
+                  'county': str(aqs_id["county"]),
+                  'site': str(aqs_id["site"])}
+    url = urlbase + '&'.join(f'{name}={value}'
+                             for name, value in url_params.items())
+
+    # Query API (or load cached response) for specified query type and load
+    # to json
+    text = cached_api_request(url, url_params, 'AQS', query_type,
+                              period_end=pd.to_datetime(data_period[1]),
+                              validate=aqs_response_complete,
+                              session=session, print_func=echo,
+                              **cache_kwargs)
+    json_data = json.loads(text)
 
     status = json_data['Header'][0]['status']
-    print('..Response status: {0}'.format(status))
+    echo('..Response status: {0}'.format(status))
     if status == 'Success':
         # Convert data to pandas DataFrame
         data = pd.DataFrame(json_data['Data'])
@@ -769,7 +1017,10 @@ def query_aqs(param, data_period, aqs_id, username=None, key=None,
                                      param_list=param_list,
                                      data_period=data_period,
                                      aqs_id=aqs_id, username=username, key=key,
-                                     sample_duration=sample_duration)
+                                     sample_duration=sample_duration,
+                                     monitor_info=monitor_info,
+                                     session=session, print_func=echo,
+                                     **cache_kwargs)
 
         return data
 
@@ -779,6 +1030,28 @@ def query_aqs(param, data_period, aqs_id, username=None, key=None,
         raise ValueError(json_data['Header'][0]['error'][0])
 
 
+def aqs_response_complete(text):
+    """Check whether an AQS API response can be cached.
+
+    Responses indicating that the query failed (e.g., invalid credentials or
+    server errors) are not cached.
+
+    Args:
+        text (str):
+            The response returned by the AQS API.
+
+    Returns:
+        bool: True if the query was successful or no data matched the query.
+
+    """
+    try:
+        status = json.loads(text)['Header'][0]['status']
+    except (ValueError, KeyError, IndexError, TypeError):
+        return False
+
+    return status in ['Success', 'No data matched your selection']
+
+
 def parse_sample_data(sample_data, get_monitor_info, param_list, **kwargs):
     """Helper function for ingesting AQS ``'sampleData'`` queries.
 
@@ -814,15 +1087,41 @@ def parse_sample_data(sample_data, get_monitor_info, param_list, **kwargs):
         User key for API authentication.
     :param str sample_duration:
         The duration of recorded reference data the user wishes to retrieve.
+    :param pandas DataFrame monitor_info:
+        Site and monitor metadata previously returned by a ``'monitors'``
+        query for the site. If passed, the secondary AQS query is not
+        submitted. Defaults to None.
+    :param requests.Session session:
+        HTTP session used for sending API requests. Defaults to None.
+    :param function object print_func:
+        Function called with the messages describing the query. Defaults to
+        ``print``.
 
     Returns:
         sample_data (pandas DataFrame):
             Modified API query dataset.
 
     """
+    monitorinfo = kwargs.pop('monitor_info', None)
+    echo = kwargs.get('print_func', print)
     if get_monitor_info:
-        kwargs['param'] = param_list
-        monitorinfo = query_aqs(query_type='monitors', **kwargs)
+        if monitorinfo is None:
+            kwargs['param'] = param_list
+            try:
+                monitorinfo = query_aqs(query_type='monitors', **kwargs)
+            except APICacheMissError as e:
+                echo(f'..{e}')
+                monitorinfo = pd.DataFrame()
+
+        # Monitor information may be unavailable (e.g., not cached in offline
+        # mode), use the site coordinates reported with sample data
+        if monitorinfo.empty:
+            echo('..Warning: Site and monitor information unavailable')
+            monitorinfo = pd.DataFrame(
+                                {'local_site_name': 'Unspecified Site Name',
+                                 'monitoring_agency': 'Unspecified Agency',
+                                 'latitude': sample_data.latitude,
+                                 'longitude': sample_data.longitude})
 
         site_name = list(i for i in monitorinfo.local_site_name.unique())
         agency = list(i for i in monitorinfo.monitoring_agency.unique())
@@ -840,14 +1139,14 @@ def parse_sample_data(sample_data, get_monitor_info, param_list, **kwargs):
 
     site_aqs = list(i for i in sample_data.Site_AQS.astype(str).unique())
 
-    print('..Query site(s):')
+    echo('..Query site(s):')
     # Since AQS queries are site specific, should only include one site
     for name, aqs, lat, lon in zip(site_name, site_aqs,
                                    site_lat, site_lon):
-        print('....Site name:', name)
-        print('......AQS ID:', aqs)
-        print('......Latitude:', "{0:7.4f}".format(float(lat)))
-        print('......Longitude:', "{0:7.4f}".format(float(lon)))
+        echo('....Site name:', name)
+        echo('......AQS ID:', aqs)
+        echo('......Latitude:', "{0:7.4f}".format(float(lat)))
+        echo('......Longitude:', "{0:7.4f}".format(float(lon)))
 
     query_df = pd.DataFrame()
     for code in param_list:
@@ -884,9 +1183,10 @@ def ingest_aqs(data, param, api_param, param_classifier,
         time_of_query (str):
             The time of the API query, expressed as a string with datetime
             format '%Y-%m-%d %H:%M:%S'.
-        lookup_table (pandas DataFrame):
-            A lookup table of FRM/FEM methods associated with the queried
-            parameter, including the method code for determining the name of
+        lookup_table (str or pandas DataFrame):
+            A lookup table (or the name of the lookup table, either
+            ``'criteria'`` or ``'met'``) of FRM/FEM methods associated with
+            the queried parameter, including the method code for determining the name of
             the reference instrument if none given. For criteria pollutants,
             the following lookup table is used
             ('<https://aqs.epa.gov/aqsweb/documents/codetables/methods_criteria.html>'_).
@@ -1019,7 +1319,7 @@ def ingest_aqs(data, param, api_param, param_classifier,
     return data, idx
 
 
-def query_airnow(param, data_period, bbox, key=None):
+def query_airnow(param, data_period, bbox, key=None, **kwargs):
     """Construct an AirNow API query request and parse response.
 
     Args:
@@ -1037,11 +1337,42 @@ def query_airnow(param, data_period, bbox, key=None):
         key (str):
             User key for API authentication.
 
+    **Keyword Arguments:**
+
+    :param requests.Session session:
+        HTTP session used for sending API requests. Defaults to None (requests
+        are sent without a session).
+    :param function object print_func:
+        Function called with the messages describing the query. Defaults to
+        ``print``.
+    :param str cache_path:
+        Path to the directory where API responses are cached. Defaults to
+        None (responses are not cached).
+    :param int cache_ttl:
+        The time to live (in seconds) for cached responses to queries for
+        periods that had not ended at the time of the query (e.g., the current
+        month). Defaults to 3600.
+    :param bool offline:
+        If True, responses are only loaded from the cache and the API is not
+        queried (``APICacheMissError`` is raised if the response is not
+        cached). Defaults to False.
+    :param RequestScheduler scheduler:
+        Scheduler used for sending API requests (rate limiting and retrying
+        failed requests). Defaults to ``request_scheduler``.
+    :param list request_log:
+        List to which the scheduler adds an entry for each request attempt
+        (used to summarize the requests sent by a query). Defaults to None.
+
     Returns:
         data (pandas DataFrame):
             Data returned by the API for the specified query parameter and
             time period.
     """
+    session = kwargs.get('session', None)
+    echo = kwargs.get('print_func', print)
+    cache_kwargs = {name: kwargs[name] for name in CACHE_KWARGS
+                    if name in kwargs}
+
     if type(param) is str:
         param_list = [param]
     elif type(param) is list:
@@ -1052,11 +1383,11 @@ def query_airnow(param, data_period, bbox, key=None):
 
     begin = data_period[0][:-3]
     end = data_period[1][:-3]
-    print('..Query start:', begin)
-    print('..Query end:', end)
+    echo('..Query start:', begin)
+    echo('..Query end:', end)
 
     # API Items
-    urlbase = "http://www.airnowapi.org/aq/data/?"
+    urlbase = AIRNOW_API_URL + '?'
     dataType = "C"
     dataformat = "text/csv"
     verbose = "1"                    # bool
@@ -1064,23 +1395,28 @@ def query_airnow(param, data_period, bbox, key=None):
     rawconc = "1"                    # bool
 
     # Construct query URL
-    url = urlbase + 'startdate=' + str(data_period[0])
-    url += '&enddate=' + str(data_period[1])
-    url += '&parameters=' + ','.join(param_list)
-    url += '&bbox=' + str(bbox["minLong"]) + ','
-    url += str(bbox["minLat"]) + ','
-    url += str(bbox["maxLong"]) + ','
-    url += str(bbox["maxLat"])
-    url += '&datatype=' + str(dataType)
-    url += '&format=' + str(dataformat)
-    url += '&verbose=' + str(verbose)
-    url += '&nowcastonly=' + str(nowcastonly)
-    url += '&includerawconcentrations=' + str(rawconc)
-    url += '&api_key=' + str(key)
-
-    # Get query response
-    data = requests.get(url)
-    fmt_query_data = StringIO(data.text)
+    url_params = {'startdate': str(data_period[0]),
+                  'enddate': str(data_period[1]),
+                  'parameters': ','.join(param_list),
+                  'bbox': (str(bbox["minLong"]) + ',' +
+                           str(bbox["minLat"]) + ',' +
+                           str(bbox["maxLong"]) + ',' +
+                           str(bbox["maxLat"])),
+                  'datatype': str(dataType),
+                  'format': str(dataformat),
+                  'verbose': str(verbose),
+                  'nowcastonly': str(nowcastonly),
+                  'includerawconcentrations': str(rawconc),
+                  'api_key': str(key)}
+    url = urlbase + '&'.join(f'{name}={value}'
+                             for name, value in url_params.items())
+
+    # Get query response (or load cached response)
+    text = cached_api_request(url, url_params, 'AirNow', 'data',
+                              period_end=pd.to_datetime(data_period[1]),
+                              session=session, print_func=echo,
+                              **cache_kwargs)
+    fmt_query_data = StringIO(text)
 
 
     data = pd.read_csv(fmt_query_data, sep=',',
@@ -1106,22 +1442,22 @@ def query_airnow(param, data_period, bbox, key=None):
         site_lat = list(i for i in data.Site_Lat.astype(str).unique())
         site_lon = list(i for i in data.Site_Lon.astype(str).unique())
 
-        print('..Query site(s):')
+        echo('..Query site(s):')
         for name, aqs, lat, lon in zip(site_name, site_aqs,
                                        site_lat, site_lon):
-            print('....Site name:', name)
-            print('......AQS ID:', aqs)
-            print('......Latitude:', "{0:7.4f}".format(float(lat)))
-            print('......Longitude:', "{0:7.4f}".format(float(lon)))
+            echo('....Site name:', name)
+            echo('......AQS ID:', aqs)
+            echo('......Latitude:', "{0:7.4f}".format(float(lat)))
+            echo('......Longitude:', "{0:7.4f}".format(float(lon)))
 
         # Print warning if data from multiple sites are returned
         if any(len(lst) > 1 for lst in [site_name, site_aqs,
                                         site_lat, site_lon]):
-            print('..Warning: Query returned data from multiple sites.',
+            echo('..Warning: Query returned data from multiple sites.',
                   '\n..Site selection can be narrowed by reducing the '
                   'bounding box size.')
 
-    print('..Query Status:', status)
+    echo('..Query Status:', status)
 
     return data
 
@@ -286,6 +286,44 @@ class AirSensor:
                 averages will be computed. If false, processed data will be
                 loaded.
             **kwargs (dict):
+                Keyword arguments passed to ``sensortoolkit.ingest.sensor_import()``
+                and ``sensortoolkit.datetime_utils.sensor_averaging()``,
+                including:
+
+                - ``n_workers`` (*int*): If greater than 1, recorded data
+                  files are parsed and datasets for each sensor unit are
+                  averaged in parallel across a pool of ``n_workers``
+                  processes. Scripts using this option on Windows or macOS
+                  should call ``load_data()`` from within an
+                  ``if __name__ == '__main__':`` block. Defaults to None
+                  (sequential processing).
+                - ``ingest_cache`` (*bool*): If True, datasets ingested from
+                  each recorded data file are cached and reused on subsequent
+                  runs. Defaults to False.
+                - ``processed_format`` (*str*): The file format for processed
+                  datasets, either ``'csv'``, ``'parquet'``, or
+                  ``'feather'``. Defaults to ``'csv'``.
+                - ``partition_processed`` (*bool*): If True, processed
+                  datasets are written as monthly partitions. Defaults to
+                  False.
+                - ``threshold`` (*float*): The completeness threshold for
+                  1-hour and 24-hour averages. Defaults to ``0.75``.
+                - ``lazy_full_data`` (*bool*): If True and loading processed
+                  datasets, datasets at the recorded sampling frequency are
+                  only read from file when first accessed (see
+                  ``sensortoolkit.ingest.LazyFrames``). If True and writing
+                  processed datasets, the deployment period of these datasets
+                  is saved for subsequent lazy loading. Defaults to False.
+                - ``keep_full_data`` (*bool*): If False, lazily loaded
+                  datasets at the recorded sampling frequency are not kept in
+                  memory after they are accessed. Defaults to True.
+                - ``compact`` (*bool*): If True, datasets are stored in a
+                  memory-compact representation (text metadata columns are
+                  stored as categoricals) and the memory used by datasets is
+                  printed. Defaults to False.
+                - ``float32_values`` (*bool*): If True and ``compact`` is
+                  True, parameter value columns are stored as 32-bit floats.
+                  Defaults to False.
 
         Returns:
             None.
@@ -320,6 +358,10 @@ class AirSensor:
         # Compute dewpoint
         if 'Temp' in self.param_headers and 'RH' in self.param_headers:
             for interval in self.data:
+                # Datasets that are loaded when accessed are modified on load
+                if isinstance(self.data[interval], ingest.LazyFrames):
+                    self.data[interval].pipe(calculate.dewpoint)
+                    continue
 
                 for serial in self.data[interval]:
                     if not self.data[interval][serial].empty:
@@ -328,11 +370,15 @@ class AirSensor:
 
         self._set_data()
 
+        if kwargs.get('compact', False) is True:
+            lib_utils.memory_report(self.data, name=self.name)
+
     def _set_data(self):
 
         for interval in self.data.copy():
             t_intervals = [datetime_utils.get_timestamp_interval(df)
-                           for df in self.data[interval].values() if df is not None]
+                           for df in self.index_frames(interval).values()
+                           if df is not None]
             t_interval_series = pd.Series(t_intervals)
             t_interval_mode = t_interval_series.mode()
             if t_interval_mode.shape != (1,):
@@ -352,13 +398,81 @@ class AirSensor:
         self.bdate = pd.to_datetime(eval_bdate)
         self.edate = pd.to_datetime(eval_edate)
 
+    def index_frames(self, interval, dropna=False):
+        """Return the datasets for an averaging interval without retaining
+        datasets that are loaded when accessed (the timestamps of these
+        datasets are returned instead).
+
+        Used to compute summaries that only depend on the timestamps of
+        datasets (e.g., the recording interval of each sensor unit) without
+        loading datasets at the recorded sampling frequency when these are
+        loaded lazily (see ``sensortoolkit.ingest.LazyFrames``).
+
+        Args:
+            interval (str):
+                The averaging interval (key in ``AirSensor.data``).
+            dropna (bool, optional):
+                If True, rows where all values are null are dropped (for
+                datasets that are loaded when accessed, the dataset values are
+                read from file to determine these rows). Defaults to False.
+
+        Returns:
+            frames (dict):
+                Dictionary of datasets (or dataset timestamps) for each
+                sensor unit.
+
+        """
+        data = self.data[interval]
+        if isinstance(data, ingest.LazyFrames):
+            return {serial: data.index_frame(serial, dropna=dropna)
+                    for serial in data}
+        if dropna:
+            return {serial: df.dropna(how='all', axis=0)
+                    for serial, df in data.items()}
+        return dict(data)
+
+    def period_frames(self, interval):
+        """Return datasets for determining the deployment period of each
+        sensor unit.
+
+        For datasets that are loaded when accessed, a dataset indexed by the
+        first and last timestamps of rows with at least one non-null value is
+        returned instead (see ``LazyFrames.valid_period()``), so that datasets
+        are not read from file if the period was saved when the datasets were
+        written.
+
+        Args:
+            interval (str):
+                The averaging interval (key in ``AirSensor.data``).
+
+        Returns:
+            frames (dict):
+                Dictionary of datasets (or deployment period timestamps) for
+                each sensor unit.
+
+        """
+        data = self.data[interval]
+        if not isinstance(data, ingest.LazyFrames):
+            return dict(data)
+
+        frames = {}
+        for serial in data:
+            period = data.valid_period(serial)
+            index = pd.DatetimeIndex([] if period is None else list(period),
+                                     name='DateTime')
+            frames[serial] = pd.DataFrame({'DateTime': index}, index=index)
+
+        return frames
+
     def _check_empty_datasets(self):
 
         empty_datasets = {}
+        index_frames = {interval: self.index_frames(interval)
+                        for interval in self.data.keys()}
         for key, serial in self.serials.items():
             empty_datasets[serial] = {}
             for interval in self.data.keys():
-                dataset = self.data[interval][serial]
+                dataset = index_frames[interval][serial]
                 empty_datasets[serial][interval] = dataset.empty
 
         for sensor_to_drop in empty_datasets.keys():
@@ -380,4 +494,4 @@ class AirSensor:
                 for interval in self.data.copy():
                     for serial_id in self.data[interval].copy():
                         if serial_id == sensor_to_drop:
-                            self.data[interval].pop(serial_id)
+                            del self.data[interval][serial_id]
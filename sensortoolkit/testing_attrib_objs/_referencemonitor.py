@@ -17,7 +17,8 @@ import os
 import json
 import pandas as pd
 from sensortoolkit import lib_utils
-from sensortoolkit.reference import ref_api_query, load_ref_dataframes
+from sensortoolkit.reference import (ref_api_query, load_ref_dataframes,
+                                     method_table)
 from sensortoolkit.param import Parameter
 from sensortoolkit.datetime_utils import interval_averaging
 from sensortoolkit import presets as _presets
@@ -400,15 +401,10 @@ class ReferenceMonitor:
         classifier = param_obj.classifier
 
         if classifier == 'Met':
-
-            met_methods_path = os.path.abspath(os.path.join(__file__,
-                                '..', '..', 'reference', 'method_codes', 'methods_met.csv'))
-            lookup_table = pd.read_csv(met_methods_path)
+            lookup_table = method_table('met').copy()
 
         elif param_obj.criteria_pollutant:
-            criteria_methods_path = os.path.abspath(os.path.join(__file__,
-                                '..', '..', 'reference', 'method_codes', 'methods_criteria.csv'))
-            lookup_table = pd.read_csv(criteria_methods_path)
+            lookup_table = method_table('criteria').copy()
         else:
             print('Reference instrument not found')
             return
@@ -483,7 +479,7 @@ class ReferenceMonitor:
 
 
     def query_aqs(self, username, key, param_list, bdate, edate,
-                  site_id=None, query_met_data=True):
+                  site_id=None, query_met_data=True, **kwargs):
         """Send a data query to the AQS API.
 
         Args:
@@ -529,6 +525,24 @@ class ReferenceMonitor:
                 meteorological conditions for sensor performance evaluations
                 and reports).
 
+        **Keyword Arguments:**
+
+        :param int max_workers:
+            The maximum number of monthly intervals queried concurrently.
+            Defaults to 4.
+        :param bool use_cache:
+            If True, API responses are cached within the
+            ``/data/reference_data/aqs/cache`` subdirectory of the project
+            path and cached responses are used instead of querying the API.
+            Defaults to True.
+        :param int cache_ttl:
+            The time to live (in seconds) for cached responses to queries for
+            the current month. Defaults to 3600.
+        :param bool offline:
+            If True, data are only loaded from cached responses and the API is
+            not queried (``sensortoolkit.reference.APICacheMissError`` is
+            raised if a response is not cached). Defaults to False.
+
         Returns:
             None.
 
@@ -552,7 +566,8 @@ class ReferenceMonitor:
                                      aqs_id=site_id,
                                      username=username,
                                      key=key,
-                                     path=self._project_path)
+                                     path=self._project_path,
+                                     **kwargs)
 
         if not aqs_param_df.empty:
             aqs_d_param_df = interval_averaging(aqs_param_df,
@@ -568,7 +583,8 @@ class ReferenceMonitor:
                                        aqs_id=site_id,
                                        username=username,
                                        key=key,
-                                       path=self._project_path)
+                                       path=self._project_path,
+                                       **kwargs)
             if not aqs_met_df.empty:
                 aqs_d_met_df = interval_averaging(aqs_met_df,
                                                   freq='D',
@@ -585,7 +601,7 @@ class ReferenceMonitor:
             self.data['Met']['24-hour'] = aqs_d_met_df
 
     def query_airnow(self, key, param_list, bdate, edate, bbox=None,
-                     bbox_size=0.01):
+                     bbox_size=0.01, **kwargs):
         """Send a data query to the AirNow API.
 
         Args:
@@ -619,6 +635,24 @@ class ReferenceMonitor:
             bbox_size (float, optional):
                 DESCRIPTION. Defaults to 0.01.
 
+        **Keyword Arguments:**
+
+        :param int max_workers:
+            The maximum number of monthly intervals queried concurrently.
+            Defaults to 4.
+        :param bool use_cache:
+            If True, API responses are cached within the
+            ``/data/reference_data/airnow/cache`` subdirectory of the project
+            path and cached responses are used instead of querying the API.
+            Defaults to True.
+        :param int cache_ttl:
+            The time to live (in seconds) for cached responses to queries for
+            the current month. Defaults to 3600.
+        :param bool offline:
+            If True, data are only loaded from cached responses and the API is
+            not queried (``sensortoolkit.reference.APICacheMissError`` is
+            raised if a response is not cached). Defaults to False.
+
         Returns:
             None.
 
@@ -646,7 +680,8 @@ class ReferenceMonitor:
                                   edate=edate,
                                   airnow_bbox=bbox,
                                   key=key,
-                                  path=self._project_path)
+                                  path=self._project_path,
+                                  **kwargs)
 
         if not airnow_df.empty:
             airnow_d_df = interval_averaging(airnow_df,
@@ -661,7 +696,8 @@ class ReferenceMonitor:
             self.data[classifier]['24-hour'] = airnow_d_df
 
 
-    def load_data(self, bdate, edate, param_list, path=None, met_data=True):
+    def load_data(self, bdate, edate, param_list, path=None, met_data=True,
+                  **kwargs):
         """Load reference data from locally acquired files.
 
         Args:
@@ -699,6 +735,17 @@ class ReferenceMonitor:
                 performance testing protocols, metrics, and target values
                 encourage users to report meteorological conditions for sensor
                 performance evaluations and reports).
+            **kwargs (dict):
+                Keyword arguments passed to
+                ``sensortoolkit.reference.load_ref_dataframes()``, including:
+
+                - ``compact`` (*bool*): If True, datasets are stored in a
+                  memory-compact representation (text metadata columns are
+                  stored as categoricals) and the memory used by datasets is
+                  printed. Defaults to False.
+                - ``float32_values`` (*bool*): If True and ``compact`` is
+                  True, parameter value columns are stored as 32-bit floats.
+                  Defaults to False.
 
         Returns:
             None.
@@ -739,10 +786,13 @@ class ReferenceMonitor:
         bdate = pd.to_datetime(bdate)
         edate = pd.to_datetime(edate)
 
-        data_dict = load_ref_dataframes(bdate, edate, path, classes)
+        data_dict = load_ref_dataframes(bdate, edate, path, classes, **kwargs)
 
         for classifier in data_dict:
             for interval in data_dict[classifier]:
                 df = data_dict[classifier][interval]
                 if not df.empty:
                     self.data[classifier][interval] = df
+
+        if kwargs.get('compact', False) is True:
+            lib_utils.memory_report(self.data, name='reference data')
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the reference API response cache (``sensortoolkit.reference``
+``_api_cache`` module), run against a local stub HTTP server so that no
+requests are sent to the AQS or AirNow API services and no credentials are
+required.
+
+The following cases are checked:
+
+- cache miss (the stub server is queried and the response is cached)
+- cache hit (the response is loaded from the cache without a request)
+- expiry of cached responses for periods that had not ended at the time of the
+  query (e.g., the current month) after the time to live (``cache_ttl``)
+- cached responses for periods that had ended (e.g., previous months) do not
+  expire
+- offline mode (cached responses are returned regardless of age, and
+  ``APICacheMissError`` is raised on a cache miss without a request)
+- cache keys and cache files exclude user credentials
+- ``query_airnow()`` loads repeated queries from the cache
+
+Run with:
+
+    python sensortoolkit_api_cache_testing.py
+
+================================================================================
+
+Created:
+  Sun Oct 18 17:20:44 2026
+Last Updated:
+  Sun Oct 18 17:20:44 2026
+"""
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+import pandas as pd
+from sensortoolkit.reference import RequestScheduler, APICacheMissError
+from sensortoolkit.reference import _ref_api_query
+from sensortoolkit.reference._api_cache import (api_cache_key,
+                                                cached_api_request)
+
+# Response returned by the stub server for AirNow data queries
+AIRNOW_RESPONSE = ('35.8890,-78.8745,"2021-01-01T00:00",PM2.5,10.0,UG/M3,9.5,'
+                   '"Burdens Creek",EPA,370630099,840370630099\n')
+
+
+class StubAPIHandler(BaseHTTPRequestHandler):
+    """Request handler returning a fixed response and recording the path of
+    each request."""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        body = AIRNOW_RESPONSE.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class APICacheTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubAPIHandler)
+        cls.server.requests = []
+        cls.url = f'http://127.0.0.1:{cls.server.server_port}/'
+        cls.thread = threading.Thread(target=cls.server.serve_forever,
+                                      daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests.clear()
+        self.cache_path = tempfile.mkdtemp()
+        self.scheduler = RequestScheduler(rate_limits={'AirNow': (1000, 1000)},
+                                          max_retries=0)
+        self.params = {'startdate': '2021-01-01T00',
+                       'enddate': '2021-01-31T23',
+                       'parameters': 'PM25',
+                       'bbox': '-79,35,-78,36',
+                       'api_key': 'SECRET-API-KEY'}
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_path, ignore_errors=True)
+
+    def request(self, period_end, **kwargs):
+        url = self.url + '?' + '&'.join(f'{name}={value}' for name, value
+                                        in self.params.items())
+        kwargs.setdefault('cache_path', self.cache_path)
+        return cached_api_request(url, self.params, 'AirNow', 'data',
+                                  period_end=pd.Timestamp(period_end),
+                                  scheduler=self.scheduler,
+                                  print_func=lambda *args: None, **kwargs)
+
+    def set_cache_age(self, hours):
+        """Set the time at which cached responses were written."""
+        key = api_cache_key('AirNow', 'data', self.params)
+        meta_file = os.path.join(self.cache_path, key[:2], key + '.json')
+        with open(meta_file) as file:
+            meta = json.load(file)
+        cached_at = (datetime.datetime.now(datetime.timezone.utc)
+                     - datetime.timedelta(hours=hours))
+        meta['cached_at'] = cached_at.isoformat(timespec='seconds')
+        with open(meta_file, 'w') as file:
+            json.dump(meta, file)
+
+    def test_miss_then_hit(self):
+        text = self.request('2021-01-31')
+        self.assertEqual(text, AIRNOW_RESPONSE)
+        self.assertEqual(len(self.server.requests), 1)
+
+        text = self.request('2021-01-31')
+        self.assertEqual(text, AIRNOW_RESPONSE)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_open_period_expires_after_ttl(self):
+        current_period_end = pd.Timestamp.now(tz='UTC').tz_localize(None)
+        current_period_end += pd.Timedelta(days=1)
+
+        self.request(current_period_end, cache_ttl=3600)
+        self.request(current_period_end, cache_ttl=3600)
+        self.assertEqual(len(self.server.requests), 1)
+
+        self.set_cache_age(hours=2)
+        self.request(current_period_end, cache_ttl=3600)
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_closed_period_does_not_expire(self):
+        self.request('2021-01-31', cache_ttl=60)
+        self.set_cache_age(hours=24*365)
+        self.request('2021-01-31', cache_ttl=60)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_offline(self):
+        with self.assertRaises(APICacheMissError):
+            self.request('2021-01-31', offline=True)
+        self.assertEqual(len(self.server.requests), 0)
+
+        # Cached responses are returned in offline mode, even if expired
+        current_period_end = pd.Timestamp.now(tz='UTC').tz_localize(None)
+        current_period_end += pd.Timedelta(days=1)
+        self.request(current_period_end)
+        self.set_cache_age(hours=2)
+        text = self.request(current_period_end, cache_ttl=3600, offline=True)
+        self.assertEqual(text, AIRNOW_RESPONSE)
+        self.assertEqual(len(self.server.requests), 1)
+
+        # Responses are not cached if no cache directory is specified
+        with self.assertRaises(APICacheMissError):
+            self.request('2021-01-31', cache_path=None, offline=True)
+
+    def test_keys_exclude_credentials(self):
+        other_key = dict(self.params, api_key='OTHER-API-KEY')
+        other_period = dict(self.params, enddate='2021-02-28T23')
+        self.assertEqual(api_cache_key('AirNow', 'data', self.params),
+                         api_cache_key('AirNow', 'data', other_key))
+        self.assertNotEqual(api_cache_key('AirNow', 'data', self.params),
+                            api_cache_key('AirNow', 'data', other_period))
+
+        self.request('2021-01-31')
+        # Credentials are sent to the API but are not written to the cache
+        self.assertIn('SECRET-API-KEY', self.server.requests[0])
+        for root, dirs, files in os.walk(self.cache_path):
+            for filename in files:
+                with open(os.path.join(root, filename)) as file:
+                    self.assertNotIn('SECRET-API-KEY', file.read())
+
+        # Requests with other credentials are loaded from the cache
+        self.params = other_key
+        self.request('2021-01-31')
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_query_airnow(self):
+        bbox = {'minLat': 35, 'maxLat': 36, 'minLong': -79, 'maxLong': -78}
+        kwargs = {'key': 'SECRET-API-KEY', 'cache_path': self.cache_path,
+                  'scheduler': self.scheduler,
+                  'print_func': lambda *args: None}
+
+        with mock.patch.object(_ref_api_query, 'AIRNOW_API_URL', self.url):
+            data = _ref_api_query.query_airnow(
+                        'PM25', ['2021-01-01T00', '2021-01-31T23'], bbox,
+                        **kwargs)
+            cached = _ref_api_query.query_airnow(
+                        'PM25', ['2021-01-01T00', '2021-01-31T23'], bbox,
+                        **kwargs)
+            with self.assertRaises(APICacheMissError):
+                _ref_api_query.query_airnow(
+                        'PM25', ['2021-02-01T00', '2021-02-28T23'], bbox,
+                        offline=True, **kwargs)
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(data.shape[0], 1)
+        pd.testing.assert_frame_equal(data, cached)
+
+
+if __name__ == '__main__':
+    unittest.main()
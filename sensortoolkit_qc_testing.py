@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for sensor data quality control routines (``sensortoolkit.qc``).
+
+The following cases are checked:
+
+- warm-up events are detected at the start of the dataset and after gaps in
+  recorded values, independent of the resolution of the timestamp index
+  (e.g., nanosecond or microsecond timestamps, which may be returned by
+  pandas 2.0+ or read from parquet and feather files)
+
+Run with:
+
+    python sensortoolkit_qc_testing.py
+
+================================================================================
+
+Created:
+  Sun Oct 18 19:02:13 2026
+Last Updated:
+  Sun Oct 18 19:02:13 2026
+"""
+import unittest
+import numpy as np
+import pandas as pd
+from sensortoolkit.qc._detect_warmup_events import warmup_incidents
+
+
+class WarmupIncidentsTest(unittest.TestCase):
+
+    def dataset(self, unit):
+        index = pd.date_range('2021-01-01', periods=60, freq='min')
+        index = pd.DatetimeIndex(index.values.astype(f'datetime64[{unit}]'),
+                                 name='DateTime').tz_localize('UTC')
+        df = pd.DataFrame({'NO2_Value': np.arange(60, dtype=float)},
+                          index=index)
+        # 20-minute gap in recording, warm-up event begins at minute 40
+        df.loc[df.index[20:40], 'NO2_Value'] = np.nan
+        return df
+
+    def check_flags(self, unit):
+        df = warmup_incidents(self.dataset(unit), 'NO2', interval='1-minute',
+                              warmup_duration='5 minutes', invalidate=True)
+        flagged = df.index[df['NO2_QAQC_Code'] == 'WarmUp'].minute
+        self.assertEqual(list(flagged), list(range(0, 6)) + list(range(40, 46)))
+        self.assertEqual(int(df['NO2_Value'].notna().sum()), 40 - 12)
+
+    def test_nanosecond_index(self):
+        self.check_flags('ns')
+
+    def test_microsecond_index(self):
+        self.check_flags('us')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -76,5 +76,6 @@ setup(name='sensortoolkit',
                         'timezonefinder',
                         'appdirs',
                         'charset_normalizer<=2.0.3'
-                        ]
+                        ],
+      extras_require={'parquet': ['pyarrow']}
       )